@@ -20,6 +20,21 @@ def create_build_directory():
     files_to_copy = [
         "myra_installer.py",
         "myra_hybrid.py",
+        "myra_audio_buffer.py",
+        "myra_vosk_service.py",
+        "myra_vad.py",
+        "myra_connectivity.py",
+        "myra_recognition_race.py",
+        "myra_microphone.py",
+        "myra_tts.py",
+        "myra_llm_stream.py",
+        "myra_ollama_client.py",
+        "myra_model_registry.py",
+        "myra_response_cache.py",
+        "myra_intent_router.py",
+        "myra_shell_host.py",
+        "myra_wake_matcher.py",
+        "myra_wake_detector.py",
         "download_vosk_model.py"
     ]
     
@@ -53,6 +68,21 @@ a = Analysis(
     binaries=[],
     datas=[
         ('myra_hybrid.py', '.'),
+        ('myra_audio_buffer.py', '.'),
+        ('myra_vosk_service.py', '.'),
+        ('myra_vad.py', '.'),
+        ('myra_connectivity.py', '.'),
+        ('myra_recognition_race.py', '.'),
+        ('myra_microphone.py', '.'),
+        ('myra_tts.py', '.'),
+        ('myra_llm_stream.py', '.'),
+        ('myra_ollama_client.py', '.'),
+        ('myra_model_registry.py', '.'),
+        ('myra_response_cache.py', '.'),
+        ('myra_intent_router.py', '.'),
+        ('myra_shell_host.py', '.'),
+        ('myra_wake_matcher.py', '.'),
+        ('myra_wake_detector.py', '.'),
         ('download_vosk_model.py', '.'),
     ],
     hiddenimports=[
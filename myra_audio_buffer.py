@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+🔁 Myra Audio Buffer
+Preallocated ring buffer for handing audio frames between threads
+"""
+import threading
+import time
+import numpy as np
+
+class AudioRingBuffer:
+    """
+    Single-producer / single-consumer ring of fixed-size audio frames
+
+    The producer (usually the PyAudio callback) copies each frame into a
+    preallocated slot and bumps a counter; it never takes a lock and never
+    blocks. When the ring is full the new frame is dropped and counted as an
+    overrun instead of stalling the audio thread.
+
+    read() hands out a memoryview straight into the slot. The slot stays
+    reserved until the next read() or clear(), so the view is valid until then.
+    """
+
+    def __init__(self, capacity=64, frame_bytes=8192):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity: Number of frames the ring can hold
+            frame_bytes: Size of one slot in bytes (CHUNK * 2 for 16-bit mono)
+        """
+        self.capacity = capacity
+        self.frame_bytes = frame_bytes
+        self._slots = np.zeros((capacity, frame_bytes), dtype=np.uint8)
+        self._views = [memoryview(self._slots[i]) for i in range(capacity)]
+        self._lengths = [0] * capacity
+        self._write_count = 0
+        self._read_count = 0
+        self._holding = False
+        self._data_ready = threading.Event()
+
+        # Statistics
+        self.frames_written = 0
+        self.frames_read = 0
+        self.frames_discarded = 0
+        self.overruns = 0
+
+    def write(self, data):
+        """
+        Copy one frame into the ring (producer side)
+
+        Returns:
+            bool: False if the ring was full and the frame was dropped
+        """
+        if self._write_count - self._read_count >= self.capacity:
+            self.overruns += 1
+            return False
+
+        slot = self._write_count % self.capacity
+        length = min(len(data), self.frame_bytes)
+        self._views[slot][:length] = memoryview(data).cast("B")[:length]
+        self._lengths[slot] = length
+
+        # Publish the frame only after it has been copied
+        self._write_count += 1
+        self.frames_written += 1
+        self._data_ready.set()
+        return True
+
+    def read(self, timeout=None):
+        """
+        Take the oldest frame (consumer side)
+
+        Args:
+            timeout: Seconds to wait for a frame (None waits forever)
+
+        Returns:
+            memoryview of the frame (valid until the next read/clear), or None on timeout
+        """
+        self._release()
+        if not self._wait_for_data(timeout):
+            return None
+
+        slot = self._read_count % self.capacity
+        self._holding = True
+        self.frames_read += 1
+        return self._views[slot][:self._lengths[slot]]
+
+    def _release(self):
+        # Hand the previously read slot back to the producer
+        if self._holding:
+            self._holding = False
+            self._read_count += 1
+
+    def _wait_for_data(self, timeout):
+        if self._write_count > self._read_count:
+            return True
+        self._data_ready.clear()
+        if self._write_count > self._read_count:
+            return True
+        self._data_ready.wait(timeout)
+        return self._write_count > self._read_count
+
+    def clear(self):
+        """Discard everything currently buffered in O(1)"""
+        self._release()
+        write_count = self._write_count
+        self.frames_discarded += write_count - self._read_count
+        self._read_count = write_count
+
+    def available(self):
+        """Number of frames waiting to be read"""
+        return self._write_count - self._read_count - (1 if self._holding else 0)
+
+    def get_stats(self):
+        """Return frame counters, including frames dropped on overrun"""
+        return {
+            "frames_written": self.frames_written,
+            "frames_read": self.frames_read,
+            "frames_discarded": self.frames_discarded,
+            "overruns": self.overruns,
+            "buffered": self.available()
+        }
+
+    def print_stats(self, label="Audio buffer"):
+        """Print frame counters so dropped frames are visible"""
+        stats = self.get_stats()
+        print(f"🔁 {label}: {stats['frames_written']} written, {stats['frames_read']} read, "
+              f"{stats['frames_discarded']} discarded, {stats['overruns']} dropped (overrun)")
+
+class CallbackStats:
+    """Timing and overflow counters for a realtime audio callback"""
+
+    def __init__(self, overflow_flag=0x2):
+        """
+        Args:
+            overflow_flag: PortAudio status bit for input overflow (paInputOverflow)
+        """
+        self.overflow_flag = overflow_flag
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.input_overflows = 0
+
+    def record(self, started, status=0):
+        """Record one callback that started at time.perf_counter() value `started`"""
+        elapsed = time.perf_counter() - started
+        self.calls += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        if status & self.overflow_flag:
+            self.input_overflows += 1
+
+    def print_stats(self, label="Audio callback"):
+        """Print average/max callback latency and overflow count"""
+        average_ms = self.total_seconds / self.calls * 1000 if self.calls else 0.0
+        print(f"⏱️ {label}: {self.calls} calls, avg {average_ms:.3f} ms, "
+              f"max {self.max_seconds * 1000:.3f} ms, input overflows {self.input_overflows}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+🌐 Myra Connectivity Monitor
+Background internet check so the listening loop only reads a cached flag
+"""
+import socket
+import threading
+import time
+import urllib.request
+
+PROBE_HOSTS = [("8.8.8.8", 53), ("1.1.1.1", 53)]
+FALLBACK_URL = "http://www.google.com"
+
+class ConnectivityMonitor:
+    """
+    Keeps an up-to-date online/offline flag on a background thread
+
+    is_online() never touches the network. While online the thread re-probes
+    every online_interval seconds; while offline it retries with exponential
+    back-off (min_retry, doubling up to max_retry) so a dead network costs
+    almost nothing. Callbacks registered with add_listener() get the first
+    status and every online/offline transition. Callers that notice a network failure first
+    (e.g. a RequestError from Google) can report_failure() to flip the flag
+    immediately and trigger a quick re-probe.
+    """
+
+    def __init__(self, probe_hosts=None, fallback_url=FALLBACK_URL, timeout=2.0,
+                 online_interval=30.0, min_retry=2.0, max_retry=60.0):
+        """
+        Initialize the monitor
+
+        Args:
+            probe_hosts: (host, port) pairs tried with a TCP connect
+            fallback_url: URL tried over HTTP when every TCP probe fails (None to skip)
+            timeout: Seconds per probe attempt
+            online_interval: Seconds between probes while online
+            min_retry: First retry delay while offline
+            max_retry: Longest retry delay while offline
+        """
+        self.probe_hosts = list(probe_hosts or PROBE_HOSTS)
+        self.fallback_url = fallback_url
+        self.timeout = timeout
+        self.online_interval = online_interval
+        self.min_retry = min_retry
+        self.max_retry = max_retry
+
+        self.online = None  # Unknown until the first probe finishes
+        self.last_change = None
+        self.retry_delay = min_retry
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._first_probe = threading.Event()
+        self._thread = None
+        self._running = False
+
+        # Statistics
+        self.probes = 0
+        self.probe_seconds = 0.0
+        self.transitions = 0
+        self.reported_failures = 0
+
+    def start(self):
+        """Start the background probe thread (no-op if already running)"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background thread"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1.0)
+
+    def add_listener(self, callback):
+        """Call callback(online) for the first status and every transition (on the monitor thread)"""
+        self._listeners.append(callback)
+
+    def is_online(self):
+        """Cached status - never blocks (False until the first probe finishes)"""
+        return bool(self.online)
+
+    def wait_for_status(self, timeout=None):
+        """Block until the first probe has finished, then return the status"""
+        if timeout is None:
+            timeout = self.timeout * (len(self.probe_hosts) + 1)
+        self._first_probe.wait(timeout)
+        return self.is_online()
+
+    def report_failure(self):
+        """Mark the network down now (e.g. after a RequestError) and re-probe soon"""
+        self.reported_failures += 1
+        self._set_status(False)
+        self.retry_delay = self.min_retry
+        self._wake.set()
+
+    def check_now(self):
+        """Probe synchronously and return the fresh status"""
+        online = self._probe()
+        self._set_status(online)
+        return online
+
+    def _probe(self):
+        start = time.perf_counter()
+        try:
+            for host, port in self.probe_hosts:
+                try:
+                    with socket.create_connection((host, port), timeout=self.timeout):
+                        return True
+                except OSError:
+                    continue
+            if self.fallback_url:
+                try:
+                    with urllib.request.urlopen(self.fallback_url, timeout=self.timeout):
+                        return True
+                except Exception:
+                    pass
+            return False
+        finally:
+            self.probes += 1
+            self.probe_seconds += time.perf_counter() - start
+
+    def _set_status(self, online):
+        with self._lock:
+            previous = self.online
+            self.online = online
+            if previous == online:
+                return
+            self.last_change = time.time()
+            if previous is not None:
+                self.transitions += 1
+
+        if previous is not None:
+            print("🌐 Internet connection restored" if online else "📴 Internet connection lost")
+        for callback in list(self._listeners):
+            try:
+                callback(online)
+            except Exception as e:
+                print(f"⚠️ Connectivity listener error: {e}")
+
+    def _run(self):
+        while self._running:
+            online = self._probe()
+            self._set_status(online)
+            self._first_probe.set()
+
+            if online:
+                self.retry_delay = self.min_retry
+                delay = self.online_interval
+            else:
+                delay = self.retry_delay
+                self.retry_delay = min(self.retry_delay * 2, self.max_retry)
+
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def get_stats(self):
+        """Return probe counts and timings"""
+        return {
+            "online": self.is_online(),
+            "probes": self.probes,
+            "avg_probe_ms": self.probe_seconds / self.probes * 1000 if self.probes else 0.0,
+            "transitions": self.transitions,
+            "reported_failures": self.reported_failures,
+            "retry_delay": self.retry_delay
+        }
+
+    def print_stats(self, label="Connectivity monitor"):
+        """Print how often the network was probed"""
+        stats = self.get_stats()
+        status = "🌐 Online" if stats["online"] else "📴 Offline"
+        print(f"🌐 {label}: {status}, {stats['probes']} probes (avg {stats['avg_probe_ms']:.0f} ms), "
+              f"{stats['transitions']} transitions, {stats['reported_failures']} reported failures")
+
+_monitor = None
+
+def get_monitor():
+    """Shared, already started monitor for the whole process"""
+    global _monitor
+    if _monitor is None:
+        _monitor = ConnectivityMonitor().start()
+    return _monitor
+
+if __name__ == "__main__":
+    monitor = get_monitor()
+    monitor.add_listener(lambda online: print(f"🔔 Transition: {'online' if online else 'offline'}"))
+    print("Status:", "🌐 Online" if monitor.wait_for_status() else "📴 Offline")
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        monitor.is_online()
+    print(f"is_online(): {(time.perf_counter() - start) / 100000 * 1e6:.3f} µs per call")
+    monitor.print_stats()
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+💾 Myra Contact Cache
+Parsed contacts and their search indexes in one memory-mapped file, so a
+lookup after a restart does not re-read the VCF
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from myra_contact_index import ContactIndex
+from myra_contact_store import Contact, ContactStore
+
+CONTACT_CACHE_FILE = "myra_contacts.cache"
+CACHE_MAGIC = b"MYRACONT"
+CACHE_VERSION = 2
+
+# Separators inside an encoded contact record: name, number, types, number, types ...
+FIELD = "\x1f"
+
+def vcf_signature(vcf_path: str) -> Dict:
+    """What a cache is valid for: the VCF's absolute path, size and modification time"""
+    info = os.stat(vcf_path)
+    return {
+        "vcf": os.path.abspath(vcf_path),
+        "size": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "version": CACHE_VERSION,
+        "byteorder": sys.byteorder
+    }
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 8)
+
+def _uint32s(values) -> bytes:
+    return array("I", values).tobytes()
+
+def encode_strings(strings: Iterable[str]) -> bytes:
+    """Section holding a list of strings: count, offsets, UTF-8 blob"""
+    blobs = [text.encode("utf-8") for text in strings]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return _pad(struct.pack("I", len(blobs)) + _uint32s(offsets) + b"".join(blobs))
+
+def encode_numbers(numbers: Iterable[int]) -> bytes:
+    """Section holding a list of uint32: count, values"""
+    values = array("I", numbers)
+    return _pad(struct.pack("I", len(values)) + values.tobytes())
+
+def mapped_numbers(mapping: "CacheMapping", start: int) -> memoryview:
+    """The uint32 list of an encode_numbers() section, read in place"""
+    (count,) = struct.unpack_from("I", mapping.data, start)
+    return mapping.uint32s(start + 4, count)
+
+def encode_table(items: Iterable[Tuple[str, List[int]]]) -> bytes:
+    """
+    Section holding a str -> ids table
+
+    Layout: entry count, slot count, open-addressing hash slots (entry + 1,
+    0 = empty, crc32 of the key), key offsets, id offsets, the keys in
+    sorted order (for prefix ranges) and the id lists.
+    """
+    entries = sorted((key.encode("utf-8"), ids) for key, ids in items)
+    slot_count = 8
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+    slots = [0] * slot_count
+    key_offsets = [0]
+    id_offsets = [0]
+    for number, (key, ids) in enumerate(entries):
+        slot = zlib.crc32(key) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = number + 1
+        key_offsets.append(key_offsets[-1] + len(key))
+        id_offsets.append(id_offsets[-1] + len(ids))
+    keys = b"".join(key for key, _ in entries)
+    keys += b"\0" * (-len(keys) % 4)
+    ids = array("I")
+    for _, entry_ids in entries:
+        ids.extend(entry_ids)
+    return _pad(struct.pack("II", len(entries), slot_count) + _uint32s(slots) +
+                _uint32s(key_offsets) + _uint32s(id_offsets) + keys + ids.tobytes())
+
+def encode_contact(contact: Contact) -> str:
+    fields = [contact.name]
+    for number, types in contact.phones:
+        fields.append(number)
+        fields.append(",".join(types))
+    return FIELD.join(fields)
+
+def decode_contact(contact_id: int, record: str) -> Contact:
+    fields = record.split(FIELD)
+    phones = tuple((fields[i], tuple(fields[i + 1].split(",")) if fields[i + 1] else ())
+                   for i in range(1, len(fields) - 1, 2))
+    return Contact(contact_id, fields[0], phones)
+
+class CacheMapping:
+    """
+    An open cache file: the read-only mmap and every uint32 view handed out
+
+    Views are bounds-checked when they are made (ValueError for a damaged
+    file) and remembered, so release() can drop them all and really unmap.
+    """
+
+    def __init__(self, handle):
+        self.file = handle
+        self.data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+
+    def check(self, start: int, end: int):
+        if not 0 <= start <= end <= len(self.data):
+            raise ValueError("contact cache section out of bounds")
+
+    def uint32s(self, start: int, count: int) -> memoryview:
+        """count uint32 values at start, read in place"""
+        self.check(start, start + 4 * count)
+        view = memoryview(self.data)[start:start + 4 * count].cast("I")
+        self._views.append(view)
+        return view
+
+    def crc32(self, start: int, end: int) -> int:
+        """CRC-32 of the bytes from start to end, computed in place"""
+        self.check(start, end)
+        with memoryview(self.data) as view, view[start:end] as section:
+            return zlib.crc32(section)
+
+    def release(self) -> bool:
+        """Release every view and unmap; False if something outside still holds the buffer"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        try:
+            self.data.close()
+        except BufferError:
+            return False
+        self.file.close()
+        return True
+
+class MappedStrings:
+    """Read-only list of strings inside a mapped section, decoded on first access"""
+
+    def __init__(self, mapping: CacheMapping, start: int):
+        self._data = mapping.data
+        self._decoded = {}
+        (self._count,) = struct.unpack_from("I", self._data, start)
+        self._offsets = mapping.uint32s(start + 4, self._count + 1)
+        self._blob = start + 8 + 4 * self._count
+        mapping.check(self._blob, self._blob + self._offsets[self._count])
+
+    def __len__(self):
+        return self._count
+
+    def _decode(self, position):
+        return self._data[self._blob + self._offsets[position]:self._blob + self._offsets[position + 1]].decode("utf-8")
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._decode(i) for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        item = self._decoded.get(position)
+        if item is None:
+            item = self._decoded[position] = self._decode(position)
+        return item
+
+    def __iter__(self):
+        return (self._decode(i) for i in range(self._count))
+
+class MappedContacts(MappedStrings):
+    """Read-only list of Contact records inside a mapped section"""
+
+    def _decode(self, position):
+        return decode_contact(position, super()._decode(position))
+
+class MappedTable:
+    """Read-only str -> ids table inside a mapped section: hash lookups, sorted keys for prefixes"""
+
+    def __init__(self, mapping: CacheMapping, start: int):
+        self._data = mapping.data
+        self._count, self._slot_count = struct.unpack_from("II", self._data, start)
+        if self._slot_count & (self._slot_count - 1) or self._slot_count <= self._count:
+            raise ValueError("contact cache table is damaged")
+        position = start + 8
+        self._slots = mapping.uint32s(position, self._slot_count)
+        position += 4 * self._slot_count
+        self._key_offsets = mapping.uint32s(position, self._count + 1)
+        position += 4 * (self._count + 1)
+        self._id_offsets = mapping.uint32s(position, self._count + 1)
+        position += 4 * (self._count + 1)
+        self._keys = position
+        position += self._key_offsets[self._count]
+        mapping.check(self._keys, position)
+        position += -position % 4
+        self._ids = mapping.uint32s(position, self._id_offsets[self._count])
+
+    def __len__(self):
+        return self._count
+
+    def _key(self, entry: int) -> bytes:
+        return self._data[self._keys + self._key_offsets[entry]:self._keys + self._key_offsets[entry + 1]]
+
+    def _entry_ids(self, entry: int) -> List[int]:
+        return self._ids[self._id_offsets[entry]:self._id_offsets[entry + 1]].tolist()
+
+    def get(self, key: str, default=None):
+        """Ids stored under key, or default"""
+        encoded = key.encode("utf-8")
+        mask = self._slot_count - 1
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            entry = self._slots[slot]
+            if not entry:
+                return default
+            if self._key(entry - 1) == encoded:
+                return self._entry_ids(entry - 1)
+            slot = (slot + 1) & mask
+
+    def values(self):
+        return (self._entry_ids(entry) for entry in range(self._count))
+
+    def __getitem__(self, entry: int) -> bytes:
+        # Sorted keys as a sequence, for bisect
+        return self._key(entry)
+
+class MappedTokens(MappedTable):
+    """Token table with the PrefixTrie interface"""
+
+    @property
+    def tokens(self):
+        return self._count
+
+    def get(self, token: str, default=None) -> List[int]:
+        """Ids of contacts with exactly this token"""
+        return super().get(token, [] if default is None else default)
+
+    def starting_with(self, prefix: str, limit: int = 100) -> List[int]:
+        """Ids of contacts with a token starting with prefix (at most limit)"""
+        encoded = prefix.encode("utf-8")
+        found = set()
+        entry = bisect.bisect_left(self, encoded, 0, self._count)
+        while entry < self._count and len(found) < limit and self._key(entry).startswith(encoded):
+            found.update(self._entry_ids(entry))
+            entry += 1
+        return sorted(found)[:limit]
+
+class ContactCache:
+    """
+    On-disk cache of parsed contacts and their search indexes
+
+    One file holds a JSON header (the VCF signature it was built from and
+    section offsets) and binary sections: contact records, names, and the
+    index tables (name, token, trigram, bigram and sound-alike postings as
+    hash tables of uint32 id lists). Loading maps the file and checks the
+    header and a CRC-32 of the sections (one pass over the mapped bytes);
+    records, name lengths and postings are read straight from the mapping when a
+    lookup needs them, so startup never parses the phone book.
+    A cache built from a different path, size or mtime is ignored and
+    rewritten.
+    """
+
+    SECTIONS = ("records", "names", "lower_names", "name_lengths", "by_name", "tokens", "postings", "bigrams", "phonetic")
+
+    def __init__(self, cache_file: str = CONTACT_CACHE_FILE):
+        """
+        Initialize the cache (nothing is read until load())
+
+        Args:
+            cache_file: Path of the cache file
+        """
+        self.cache_file = cache_file
+        self._mapping = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.saves = 0
+        self.load_seconds = 0.0
+        self.save_seconds = 0.0
+
+    def load(self, vcf_path: str, signature: Optional[Dict] = None) -> Optional[Tuple[ContactStore, ContactIndex]]:
+        """
+        Map the cache for this VCF
+
+        Args:
+            vcf_path: VCF file the contacts come from
+            signature: vcf_signature() taken by the caller (computed if None)
+
+        Returns:
+            (store, index) reading from the mapping, or None when the cache
+            is missing, damaged or out of date
+        """
+        start = time.perf_counter()
+        signature = signature or vcf_signature(vcf_path)
+        self.close()
+        try:
+            handle = open(self.cache_file, "rb")
+        except OSError:
+            self.misses += 1
+            return None
+        mapping = None
+        try:
+            mapping = CacheMapping(handle)
+            data = mapping.data
+            if data[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+                raise ValueError("not a contact cache")
+            (header_length,) = struct.unpack_from("I", data, len(CACHE_MAGIC))
+            header_start = len(CACHE_MAGIC) + 4
+            header = json.loads(data[header_start:header_start + header_length].decode("utf-8"))
+            if header.get("signature") != signature:
+                raise ValueError("built from another version of the VCF")
+            if header.get("length") != len(data):
+                raise ValueError("contact cache is truncated")
+            sections = header["sections"]
+            if header.get("crc32") != mapping.crc32(sections[self.SECTIONS[0]], len(data)):
+                raise ValueError("contact cache is damaged")
+            by_name = MappedTable(mapping, sections["by_name"])
+            store = ContactStore.from_tables(MappedContacts(mapping, sections["records"]), by_name)
+            index = ContactIndex.from_tables(
+                MappedStrings(mapping, sections["names"]),
+                MappedStrings(mapping, sections["lower_names"]),
+                mapped_numbers(mapping, sections["name_lengths"]),
+                by_name,
+                MappedTokens(mapping, sections["tokens"]),
+                MappedTable(mapping, sections["postings"]),
+                MappedTable(mapping, sections["bigrams"]),
+                MappedTable(mapping, sections["phonetic"]))
+        except (OSError, ValueError, KeyError, TypeError, IndexError, struct.error):
+            if mapping is None:
+                handle.close()
+            else:
+                mapping.release()
+            self.misses += 1
+            return None
+
+        self._mapping = mapping
+        self.hits += 1
+        self.load_seconds += time.perf_counter() - start
+        return store, index
+
+    def save(self, vcf_path: str, store: ContactStore, index: ContactIndex, signature: Optional[Dict] = None) -> bool:
+        """
+        Write the contacts and indexes for this VCF (atomically, via a temporary file)
+
+        Args:
+            vcf_path: VCF file the contacts come from
+            store: Parsed contacts
+            index: ContactIndex built over the store's names
+            signature: vcf_signature() taken before the VCF was parsed (computed if None)
+        """
+        start = time.perf_counter()
+        signature = signature or vcf_signature(vcf_path)
+        sections = [
+            encode_strings(encode_contact(contact) for contact in store),
+            encode_strings(index.names),
+            encode_strings(index.lower_names),
+            encode_numbers(index.name_lengths),
+            encode_table(index.by_name.items()),
+            encode_table(index.tokens.items()),
+            encode_table(index.postings.items()),
+            encode_table(index.bigram_postings.items()),
+            encode_table(index.phonetic.items()),
+        ]
+
+        # Section offsets depend on the header length, which depends on the offsets: reserve room for them
+        header = {"signature": signature, "length": 0, "crc32": 0xFFFFFFFF,
+                  "sections": {name: 0 for name in self.SECTIONS}}
+        reserved = len(json.dumps(header)) + 16 * len(self.SECTIONS)
+        position = len(CACHE_MAGIC) + 4 + reserved
+        position += -position % 8
+        for name, section in zip(self.SECTIONS, sections):
+            header["sections"][name] = position
+            position += len(section)
+        header["length"] = position
+        checksum = 0
+        for section in sections:
+            checksum = zlib.crc32(section, checksum)
+        header["crc32"] = checksum
+        header_bytes = json.dumps(header).encode("utf-8")
+        header_bytes += b" " * (reserved - len(header_bytes))
+        prefix = CACHE_MAGIC + struct.pack("I", reserved) + header_bytes
+
+        if not self.close():  # A mapped file cannot be replaced on Windows
+            print("⚠️ Could not save contact cache: the previous cache is still mapped")
+            return False
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(_pad(prefix))
+                for section in sections:
+                    f.write(section)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ Could not save contact cache: {e}")
+            return False
+        self.saves += 1
+        self.save_seconds += time.perf_counter() - start
+        return True
+
+    def close(self) -> bool:
+        """
+        Unmap the cache file (the store and index from load() stop working)
+
+        Returns False if a buffer of the mapping is still held elsewhere and
+        the file stays mapped.
+        """
+        if self._mapping is None:
+            return True
+        if not self._mapping.release():
+            return False
+        self._mapping = None
+        return True
+
+    def get_stats(self):
+        """Return hits, misses and the cost of loading and saving"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "saves": self.saves,
+            "avg_load_ms": self.load_seconds / self.hits * 1000 if self.hits else 0.0,
+            "avg_save_ms": self.save_seconds / self.saves * 1000 if self.saves else 0.0,
+            "size_kb": os.path.getsize(self.cache_file) / 1024 if os.path.exists(self.cache_file) else 0.0
+        }
+
+    def print_stats(self, label="Contact cache"):
+        """Print how often the cache was used and what it cost"""
+        stats = self.get_stats()
+        print(f"💾 {label}: {stats['hits']} hits, {stats['misses']} misses, {stats['saves']} saves, "
+              f"{stats['avg_load_ms']:.1f}ms per load, {stats['avg_save_ms']:.0f}ms per save, {stats['size_kb']:.0f} KB")
+
+def synthetic_vcf(count: int) -> str:
+    """A vCard 2.1 export of count synthetic contacts"""
+    from myra_contact_index import synthetic_names
+
+    cards = []
+    for number, name in enumerate(synthetic_names(count)):
+        cards.append(f"BEGIN:VCARD\nVERSION:2.1\nFN:{name.title()}\n"
+                     f"TEL;CELL;PREF:+2332{number:08d}\nTEL;WORK:03{number:08d}\nEND:VCARD\n")
+    return "".join(cards)
+
+def benchmark_cache(sizes=(1000, 10000, 100000), queries=("kelvin", "calvin mensah", "grace")):
+    """Start-up before the first lookup after a restart: parse the VCF and build indexes vs map the cache"""
+    import tempfile
+    from myra_vcf_contacts import VCFContactManager
+
+    print("💾 Contact cache: start-up and lookups after a restart")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            vcf_path = os.path.join(folder, f"contacts_{size}.vcf")
+            cache_file = os.path.join(folder, f"contacts_{size}.cache")
+            with open(vcf_path, "w", encoding="utf-8") as f:
+                f.write(synthetic_vcf(size))
+
+            timings = []
+            for _ in range(2):  # Cold (parses and writes the cache), then warm (maps it)
+                start = time.perf_counter()
+                manager = VCFContactManager(vcf_path, cache_file=cache_file, verbose=False)
+                loaded = time.perf_counter()
+                for query in queries:
+                    manager.find_contacts(query)
+                timings.append(((loaded - start) * 1000, (time.perf_counter() - loaded) * 1000 / len(queries)))
+                manager.close()
+            (parse_ms, memory_ms), (map_ms, mapped_ms) = timings
+            print(f"{size:>7} contacts: parse + index {parse_ms:.0f}ms vs map cache {map_ms:.1f}ms; "
+                  f"lookup {memory_ms:.1f}ms in memory, {mapped_ms:.1f}ms mapped "
+                  f"({os.path.getsize(cache_file) / 1024:.0f} KB cache)")
+
+if __name__ == "__main__":
+    benchmark_cache()
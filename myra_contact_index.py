@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+🗂️ Myra Contact Index
+Search indexes over contact names so lookups do not scan the whole phone book
+"""
+
+import heapq
+import random
+import re
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+def word_score(query: str, name: str, search_words: Set[str]) -> Optional[float]:
+    """The cheap ranking rules: exact 1.0, substring either way 0.8, word overlap (Jaccard > 0.5)"""
+    if query == name:
+        return 1.0
+    if query in name or name in query:
+        return 0.8
+
+    contact_words = set(name.split())
+    common = search_words.intersection(contact_words)
+    if common:
+        similarity = len(common) / len(search_words.union(contact_words))
+        if similarity > 0.5:
+            return similarity
+    return None
+
+def match_score(query: str, name: str, sound_alikes: bool = True) -> Optional[float]:
+    """
+    Score one lowercase contact name against a lowercase query
+
+    The ranking rules of VCFContactManager.find_contact: exact match 1.0,
+    substring either way 0.8, word overlap (Jaccard > 0.5), then
+    SequenceMatcher ratio > 0.6, raised to at least PHONETIC_SCORE for
+    names that sound like the query. Returns None when the name does not match.
+
+    Args:
+        query: Lowercase query
+        name: Lowercase contact name
+        sound_alikes: False when the query is (part of) some contact's
+            name - sound-alikes are then left out
+    """
+    score = word_score(query, name, set(query.split()))
+    if score is not None:
+        return score
+
+    similarity = SequenceMatcher(None, query, name).ratio()
+    if sound_alikes and phonetic_match(query, name):
+        return max(PHONETIC_SCORE, similarity)
+    if similarity > 0.6:
+        return similarity
+    return None
+
+def ngrams(text: str, n: int) -> Set[str]:
+    """Distinct n-character substrings of text"""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct 3-character substrings of text"""
+    return ngrams(text, 3)
+
+# Score of a sound-alike name ("calvin" -> Kelvin): below a substring match, above most fuzzy ones
+PHONETIC_SCORE = 0.75
+# Sounds a key needs before it can make a match on its own: shorter keys collide ("pat" / "pete" -> "pt")
+PHONETIC_MIN_SOUNDS = 3
+
+_NON_LETTERS = re.compile(r"[^a-z]")
+_PHONETIC_RULES = [
+    (re.compile(r"^(?:kn|gn|pn|wr)"), lambda m: m.group()[1]),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ck|q"), "k"),
+    (re.compile(r"c(?=[eiy])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"dg"), "j"),
+    (re.compile(r"v"), "f"),
+    (re.compile(r"(?<=.)[aeiouyhw]"), ""),  # Vowels and soft letters after the first sound
+    (re.compile(r"^[aeiouy]"), "a"),        # Any leading vowel sounds alike ("ofori" / "a fori")
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+def phonetic_key(word: str) -> str:
+    """
+    Metaphone-style sound key of a word
+
+    Spelling variants that speech recognition mixes up share a key:
+    kelvin / calvin -> "klfn", ofori / "a fori" -> "afr".
+    """
+    return _letters_key(_NON_LETTERS.sub("", word.lower()))
+
+@lru_cache(maxsize=65536)
+def _letters_key(letters: str) -> str:
+    key = letters
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    return key
+
+def phonetic_keys(text: str) -> Tuple[Set[str], str]:
+    """Sound keys of the words of text and of the whole text run together"""
+    keys = {key for key in map(phonetic_key, text.split()) if key}
+    return keys, phonetic_key(text)
+
+def distinctive(keys: Iterable[str]) -> bool:
+    """True if one of the sound keys is long enough to tell names apart"""
+    return any(len(key) >= PHONETIC_MIN_SOUNDS for key in keys)
+
+def phonetic_match(query: str, name: str) -> bool:
+    """
+    True if the query sounds like the name
+
+    Either every query word sounds like a word of the name (short words
+    included, one with at least PHONETIC_MIN_SOUNDS sounds), or the query
+    run together sounds like a word of the name or the whole name.
+    """
+    query_keys, query_joined = phonetic_keys(query)
+    name_keys, name_joined = phonetic_keys(name)
+    name_keys.add(name_joined)
+    if distinctive([query_joined]) and query_joined in name_keys:
+        return True
+    return distinctive(query_keys) and query_keys <= name_keys
+
+class PrefixTrie:
+    """
+    Character trie over name tokens
+
+    Each node is a dict of child characters; the ids of the contacts that
+    contain the token ending at a node are stored under the None key.
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.tokens = 0
+
+    def add(self, token: str, contact_id: int):
+        node = self.root
+        for char in token:
+            node = node.setdefault(char, {})
+        ids = node.get(None)
+        if ids is None:
+            ids = node[None] = []
+            self.tokens += 1
+        if not ids or ids[-1] != contact_id:
+            ids.append(contact_id)
+
+    def _node(self, prefix: str):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def get(self, token: str) -> List[int]:
+        """Ids of contacts with exactly this token"""
+        node = self._node(token)
+        return node.get(None, []) if node else []
+
+    def starting_with(self, prefix: str, limit: int = 100) -> List[int]:
+        """Ids of contacts with a token starting with prefix (at most limit)"""
+        node = self._node(prefix)
+        found = []
+        stack = [node] if node else []
+        while stack and len(found) < limit:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is None:
+                    found.extend(child)
+                else:
+                    stack.append(child)
+        return sorted(set(found))[:limit]
+
+    def items(self):
+        """Every (token, ids) pair in the trie"""
+        stack = [("", self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, child in node.items():
+                if key is None:
+                    yield prefix, child
+                else:
+                    stack.append((prefix + key, child))
+
+class ContactIndex:
+    """
+    Candidate generation for contact name lookups
+
+    Built once when contacts are loaded. A query is only scored against
+    the contacts that can possibly match it:
+
+    - exact and "name inside query" matches: every substring of the short
+      query is looked up in a name -> ids map
+    - "query inside name" matches: intersection of the trigram posting
+      lists of the query
+    - word overlap: the token inverted index (a prefix trie, which also
+      serves prefix completion)
+    - sound-alikes: a phonetic key index over every name word and the whole
+      name run together, so "calvin" finds Kelvin and "a fori" Miss Ofori
+      with hash lookups (unless the query is part of some name)
+    - fuzzy matches: about fuzzy_limit names sharing the most padded bigrams
+      with the query (whole tie groups are kept), within the length window
+      where a SequenceMatcher ratio above 0.6 is possible at all
+
+    Candidates get the same scores as match_score() and ties still go to
+    the contact loaded first, so results equal the linear scan whenever the
+    fuzzy shortlist holds the fuzzy matches. SequenceMatcher.ratio() is
+    only computed when its cheap upper bounds (real_quick_ratio, quick_ratio)
+    could still reach the current top results. Queries shorter than three
+    characters fall back to scanning every name.
+    """
+
+    def __init__(self, names: Iterable[str], fuzzy_limit: int = 200):
+        """
+        Build the indexes
+
+        Args:
+            names: Contact names; their position is the contact id
+            fuzzy_limit: Names shortlisted for the fuzzy stage per query
+        """
+        self.names = list(names)
+        self.lower_names = [name.lower() for name in self.names]
+        self.name_lengths = [len(name) for name in self.lower_names]
+        self.fuzzy_limit = fuzzy_limit
+
+        self.by_name: Dict[str, List[int]] = {}
+        self.tokens = PrefixTrie()
+        self.postings: Dict[str, List[int]] = {}
+        self.bigram_postings: Dict[str, List[int]] = {}
+        self.phonetic: Dict[str, List[int]] = {}
+
+        start = time.perf_counter()
+        for contact_id, name in enumerate(self.lower_names):
+            self.by_name.setdefault(name, []).append(contact_id)
+            for token in name.split():
+                self.tokens.add(token, contact_id)
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, []).append(contact_id)
+            for gram in ngrams(f" {name} ", 2):
+                self.bigram_postings.setdefault(gram, []).append(contact_id)
+            keys, joined = phonetic_keys(name)
+            keys.add(joined)
+            for key in keys:
+                if key:
+                    self.phonetic.setdefault(key, []).append(contact_id)
+        self.build_seconds = time.perf_counter() - start
+        self._reset_stats()
+
+    @classmethod
+    def from_tables(cls, names, lower_names, name_lengths, by_name, tokens, postings, bigram_postings, phonetic,
+                    fuzzy_limit: int = 200) -> "ContactIndex":
+        """
+        An index over tables built earlier (e.g. memory-mapped from the contact cache)
+
+        The tables only need the lookups ContactIndex uses: names,
+        lower_names and name_lengths are sequences by contact id, the postings support
+        .get(key, default) and len(), and tokens supports get(),
+        starting_with() and .tokens like PrefixTrie.
+        """
+        index = cls.__new__(cls)
+        index.names = names
+        index.lower_names = lower_names
+        index.name_lengths = name_lengths
+        index.fuzzy_limit = fuzzy_limit
+        index.by_name = by_name
+        index.tokens = tokens
+        index.postings = postings
+        index.bigram_postings = bigram_postings
+        index.phonetic = phonetic
+        index.build_seconds = 0.0
+        index._reset_stats()
+        return index
+
+    def _reset_stats(self):
+        # Statistics
+        self.lookups = 0
+        self.candidates_scored = 0
+        self.fuzzy_scored = 0
+        self.lookup_seconds = 0.0
+
+    def __len__(self):
+        return len(self.names)
+
+    def sounds_like(self, query: str) -> Set[int]:
+        """Ids of contacts whose name sounds like the query - hash lookups in the phonetic index"""
+        query_keys, query_joined = phonetic_keys(query)
+        found = set(self.phonetic.get(query_joined, ())) if distinctive([query_joined]) else set()
+        if distinctive(query_keys):
+            lists = sorted((self.phonetic.get(key, []) for key in query_keys), key=len)
+            common = set(lists[0])
+            for ids in lists[1:]:
+                common.intersection_update(ids)
+            found.update(common)
+        return found
+
+    def candidates(self, query: str, sound_alikes: Optional[Set[int]] = None) -> List[int]:
+        """Ids of every contact the lowercase query could match, in load order"""
+        if len(query) < 3:
+            return list(range(len(self.names)))
+
+        found = set(self.sounds_like(query) if sound_alikes is None else sound_alikes)
+
+        # Exact match and contact name contained in the query
+        for start in range(len(query)):
+            for end in range(start + 1, len(query) + 1):
+                ids = self.by_name.get(query[start:end])
+                if ids:
+                    found.update(ids)
+
+        # Query contained in the contact name
+        lists = sorted((self.postings.get(gram, []) for gram in trigrams(query)), key=len)
+        if lists and lists[0]:
+            common = set(lists[0])
+            for ids in lists[1:]:
+                common.intersection_update(ids)
+                if not common:
+                    break
+            found.update(common)
+
+        # Shared words
+        for word in set(query.split()):
+            found.update(self.tokens.get(word))
+
+        # Fuzzy shortlist: most shared bigrams, lengths close enough for ratio > 0.6
+        shared = Counter()
+        for gram in ngrams(f" {query} ", 2):
+            shared.update(self.bigram_postings.get(gram, ()))
+        by_count = {}
+        for contact_id, count in shared.items():
+            by_count.setdefault(count, []).append(contact_id)
+        length = len(query)
+        shortlist = 0
+        for count in sorted(by_count, reverse=True):
+            for contact_id in sorted(by_count[count]):
+                other = self.name_lengths[contact_id]
+                if 2 * min(length, other) / (length + other) > 0.6:
+                    found.add(contact_id)
+                    shortlist += 1
+            if shortlist >= self.fuzzy_limit:
+                break
+
+        return sorted(found)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Top matches as (name, score), best first - same results as search_linear()"""
+        return [(self.names[contact_id], score) for contact_id, score in self.search_ids(query, limit)]
+
+    def search_ids(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """Top matches as (contact id, score), best first - contacts sharing a name stay separate"""
+        start = time.perf_counter()
+        query = query.lower().strip()
+        search_words = set(query.split())
+        sound_alikes = self.sounds_like(query)
+        candidate_ids = self.candidates(query, sound_alikes)
+
+        # Cheap rules first; the best `limit` results so far set the bar for SequenceMatcher
+        top = []  # min-heap of (score, -id): the worst kept result is top[0]
+        fuzzy_ids = []
+        for contact_id in candidate_ids:
+            name = self.lower_names[contact_id]
+            score = word_score(query, name, search_words)
+            if score is None:
+                fuzzy_ids.append(contact_id)
+                continue
+            self._keep(top, limit, score, contact_id)
+            if query in name:
+                # The user said a name (or part of one): don't offer sound-alikes as well
+                sound_alikes = set()
+
+        # Ratios are only computed when their upper bounds could still make the top results
+        matcher = SequenceMatcher(None, query, "")
+        query_counts = Counter(query)
+        fuzzy_scored = 0
+        for contact_id in fuzzy_ids:
+            bar = top[0][0] if len(top) >= limit else 0.0
+            floor = PHONETIC_SCORE if contact_id in sound_alikes else 0.0
+            name = self.lower_names[contact_id]
+            total = len(query) + len(name)
+            # Same values as SequenceMatcher.real_quick_ratio() and quick_ratio(), without indexing the name
+            bound = 2.0 * min(len(query), len(name)) / total
+            if bound > floor and self._may_beat(bound, bar):
+                available = dict(query_counts)
+                common = 0
+                for char in name:
+                    if available.get(char, 0) > 0:
+                        available[char] -= 1
+                        common += 1
+                bound = 2.0 * common / total
+            if bound <= floor or not self._may_beat(bound, bar):
+                if floor:
+                    self._keep(top, limit, floor, contact_id)
+                continue
+            matcher.set_seq2(name)
+            fuzzy_scored += 1
+            similarity = matcher.ratio()
+            if floor or similarity > 0.6:
+                self._keep(top, limit, max(floor, similarity), contact_id)
+
+        matches = sorted(top, key=lambda item: (-item[0], -item[1]))
+        self.lookups += 1
+        self.candidates_scored += len(candidate_ids)
+        self.fuzzy_scored += fuzzy_scored
+        self.lookup_seconds += time.perf_counter() - start
+        return [(-negative_id, score) for score, negative_id in matches]
+
+    @staticmethod
+    def _may_beat(bound, bar):
+        """A ratio of at most bound can still be a match (> 0.6) and reach the top results (ties may win on id)"""
+        return bound > 0.6 and bound >= bar
+
+    @staticmethod
+    def _keep(top, limit, score, contact_id):
+        """Add a result to the bounded heap; ties go to the contact loaded first"""
+        item = (score, -contact_id)
+        if len(top) < limit:
+            heapq.heappush(top, item)
+        elif item > top[0]:
+            heapq.heapreplace(top, item)
+
+    def search_linear(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Score every name (the behaviour before indexing, kept for comparison)"""
+        query = query.lower().strip()
+        sound_alikes = not any(query in name for name in self.lower_names)
+        matches = []
+        for name, lower_name in zip(self.names, self.lower_names):
+            score = match_score(query, lower_name, sound_alikes)
+            if score is not None:
+                matches.append((name, score))
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches[:limit]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Names with a word starting with prefix, e.g. "kel" -> Kelvin ..."""
+        return [self.names[i] for i in self.tokens.starting_with(prefix.lower().strip(), limit)]
+
+    def get_stats(self):
+        """Return index size and lookup cost"""
+        return {
+            "contacts": len(self.names),
+            "tokens": self.tokens.tokens,
+            "trigrams": len(self.postings),
+            "bigrams": len(self.bigram_postings),
+            "phonetic_keys": len(self.phonetic),
+            "build_ms": self.build_seconds * 1000,
+            "lookups": self.lookups,
+            "avg_candidates": self.candidates_scored / self.lookups if self.lookups else 0.0,
+            "avg_fuzzy": self.fuzzy_scored / self.lookups if self.lookups else 0.0,
+            "avg_lookup_ms": self.lookup_seconds / self.lookups * 1000 if self.lookups else 0.0
+        }
+
+    def print_stats(self, label="Contact index"):
+        """Print index size and how much scoring the index saved"""
+        stats = self.get_stats()
+        print(f"🗂️ {label}: {stats['contacts']} contacts, {stats['tokens']} tokens, {stats['trigrams']} trigrams, {stats['bigrams']} bigrams, "
+              f"{stats['phonetic_keys']} sound keys "
+              f"(built in {stats['build_ms']:.0f}ms); {stats['lookups']} lookups, "
+              f"{stats['avg_candidates']:.0f} candidates, {stats['avg_fuzzy']:.0f} fuzzy ratios, "
+              f"{stats['avg_lookup_ms']:.2f}ms per lookup")
+
+FIRST_NAMES = ["kelvin", "calvin", "john", "mary", "james", "grace", "kwame", "ama", "kofi", "abena",
+               "michael", "sarah", "david", "esther", "samuel", "ruth", "daniel", "joyce", "emmanuel", "linda",
+               "peter", "comfort", "isaac", "patience", "joseph", "mercy", "paul", "felicia", "eric", "gloria"]
+LAST_NAMES = ["mensah", "ofori", "asante", "boateng", "owusu", "appiah", "johnson", "smith", "doe", "addo",
+              "osei", "badu", "darko", "frimpong", "agyeman", "nkrumah", "ansah", "quaye", "tetteh", "amoah"]
+SUFFIXES = ["", "", "", " work", " home", " (church)", " uni", " mum", " 2", " shop"]
+
+def synthetic_names(count: int, seed: int = 0) -> List[str]:
+    """Phone-book-like names: first + last (+ a label), with some duplicates"""
+    rng = random.Random(seed)
+    return [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.choice(SUFFIXES)} {rng.randrange(count)}".title()
+            for _ in range(count)]
+
+def benchmark_index(sizes=(1000, 10000, 100000), queries=("Kelvin", "kel", "Ofori", "kelvin mensah",
+                                                          "calvin ofori", "a fori", "Grace Asante Work", "Jhon", "xyz")):
+    """Compare indexed and linear lookups on synthetic phone books"""
+    print("🗂️ Contact index benchmark")
+    print("=" * 70)
+    for size in sizes:
+        index = ContactIndex(synthetic_names(size))
+        linear_queries = queries if size <= 10000 else queries[:3]
+
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query)
+        indexed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        start = time.perf_counter()
+        agree = 0
+        for query in linear_queries:
+            if index.search_linear(query) == index.search(query):
+                agree += 1
+        linear_ms = (time.perf_counter() - start) * 1000 / len(linear_queries) - indexed_ms
+
+        stats = index.get_stats()
+        print(f"{size:>7} contacts: build {stats['build_ms']:.0f}ms, indexed {indexed_ms:.2f}ms vs "
+              f"linear {linear_ms:.1f}ms per lookup ({linear_ms / max(indexed_ms, 1e-6):.0f}x), "
+              f"same top 5 for {agree}/{len(linear_queries)} queries")
+
+if __name__ == "__main__":
+    benchmark_index()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+📇 Myra Contact Store
+One compact record per vCard, keeping every phone number with its TEL types
+"""
+
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Spoken labels for TEL types, in the order they are preferred
+PHONE_TYPE_LABELS = [("CELL", "mobile"), ("WORK", "work"), ("HOME", "home"), ("MAIN", "main"), ("VOICE", "phone")]
+
+class Contact:
+    """
+    One vCard: display name and all its phone numbers
+
+    phones is a tuple of (number, types) pairs where types is a tuple of
+    uppercase TEL types such as ("CELL", "PREF"). __slots__ and shared
+    type tuples keep a record to a few hundred bytes, so memory grows
+    linearly and predictably with the phone book.
+    """
+
+    __slots__ = ("contact_id", "name", "phones")
+
+    def __init__(self, contact_id: int, name: str, phones: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        self.contact_id = contact_id
+        self.name = name
+        self.phones = phones
+
+    @property
+    def phone(self) -> Optional[str]:
+        """Preferred number: the first one typed PREF, else the first one"""
+        for number, types in self.phones:
+            if "PREF" in types:
+                return number
+        return self.phones[0][0] if self.phones else None
+
+    def phone_label(self, number: Optional[str] = None) -> str:
+        """How to say a number so duplicate names can be told apart: "mobile ending in 1335" """
+        number = number or self.phone or ""
+        types = next((types for phone, types in self.phones if phone == number), ())
+        label = next((spoken for tel_type, spoken in PHONE_TYPE_LABELS if tel_type in types), "number")
+        return f"{label} ending in {number[-4:]}"
+
+    def to_dict(self) -> Dict:
+        """The contact as a plain dict ('name', preferred 'phone' and all 'phones')"""
+        return {
+            "name": self.name,
+            "phone": self.phone,
+            "phones": [{"number": number, "types": list(types)} for number, types in self.phones]
+        }
+
+    def __repr__(self):
+        return f"Contact({self.contact_id}, {self.name!r}, {len(self.phones)} numbers)"
+
+class ContactStore:
+    """
+    All contacts in load order, with a lowercase name -> ids index
+
+    Contacts that share a name are kept as separate records (contact_id is
+    the position in load order), so several Kelvins stay several Kelvins.
+    """
+
+    def __init__(self):
+        self.contacts: List[Contact] = []
+        self.by_name: Dict[str, List[int]] = {}
+        self._types: Dict[Tuple[str, ...], Tuple[str, ...]] = {}  # Shared type tuples
+
+    @classmethod
+    def from_tables(cls, contacts, by_name) -> "ContactStore":
+        """
+        A read-only store over tables built earlier (e.g. memory-mapped from the contact cache)
+
+        Args:
+            contacts: Sequence of Contact by contact id
+            by_name: Lowercase name -> ids, supporting .get(name, default)
+        """
+        store = cls()
+        store.contacts = contacts
+        store.by_name = by_name
+        return store
+
+    def add(self, name: str, phones: Iterable[Tuple[str, Iterable[str]]]) -> Contact:
+        """
+        Add a contact
+
+        Args:
+            name: Display name
+            phones: (number, types) pairs; repeated numbers are kept once
+        """
+        kept = []
+        seen = set()
+        for number, types in phones:
+            if number in seen:
+                continue
+            seen.add(number)
+            types = tuple(types)
+            kept.append((sys.intern(number), self._types.setdefault(types, types)))
+        contact = Contact(len(self.contacts), name, tuple(kept))
+        self.contacts.append(contact)
+        self.by_name.setdefault(name.lower(), []).append(contact.contact_id)
+        return contact
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self.contacts)
+
+    def __getitem__(self, contact_id: int) -> Contact:
+        return self.contacts[contact_id]
+
+    def names(self) -> List[str]:
+        """Display name of every contact, by contact id"""
+        return [contact.name for contact in self.contacts]
+
+    def find_by_name(self, name: str) -> List[Contact]:
+        """Every contact with this name (case-insensitive)"""
+        return [self.contacts[contact_id] for contact_id in self.by_name.get(name.lower().strip(), ())]
+
+    def get_stats(self):
+        """Return record, name and number counts"""
+        return {
+            "contacts": len(self.contacts),
+            "names": len(self.by_name),
+            "duplicate_names": sum(1 for ids in self.by_name.values() if len(ids) > 1),
+            "numbers": sum(len(contact.phones) for contact in self.contacts)
+        }
+
+    def print_stats(self, label="Contact store"):
+        """Print how many records, names and numbers are held"""
+        stats = self.get_stats()
+        print(f"📇 {label}: {stats['contacts']} contacts, {stats['names']} names "
+              f"({stats['duplicate_names']} shared), {stats['numbers']} numbers")
+
+def benchmark_memory(count=100000):
+    """Memory per contact: the old dict-per-name layout versus Contact records"""
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    cards = [(f"Contact {rng.randrange(count // 2)}", [(f"+2332{rng.randrange(10**8):08d}", ("CELL",)),
+                                                     (f"03{rng.randrange(10**8):08d}", ("WORK", "PREF"))])
+             for _ in range(count)]
+
+    tracemalloc.start()
+    old = {}
+    for name, phones in cards:
+        old[name] = {"name": name, "phone": phones[-1][0]}
+    old_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = ContactStore()
+    for name, phones in cards:
+        store.add(name, phones)
+    build_ms = (time.perf_counter() - start) * 1000
+    new_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"📇 {count} vCards")
+    print(f"dict per name  : {len(old)} contacts kept, 1 number each, {old_bytes / len(old):.0f} bytes per contact")
+    print(f"Contact records: {len(store)} contacts kept, {store.get_stats()['numbers']} numbers, "
+          f"{new_bytes / len(store):.0f} bytes per contact (built in {build_ms:.0f}ms)")
+
+if __name__ == "__main__":
+    benchmark_memory()
@@ -22,33 +22,39 @@ from datetime import datetime
 import threading
 import fnmatch
 import random
-import socket
-from difflib import SequenceMatcher
 
 # Import our custom modules
 from myra_session_manager import MyraSessionManager, SessionState
 from myra_fuzzy_matcher import FuzzyKeywordMatcher
+from myra_wake_detector import create_wake_detector, FUZZY_THRESHOLD
+from myra_connectivity import get_monitor
+from myra_microphone import get_microphone
+from myra_ollama_client import get_client
 
 # Speech recognition - prioritize speed
 import speech_recognition as sr
-import pyttsx3
+from myra_tts import TTSWorker
 import requests
 
 # === Enhanced Setup ===
-# TTS Engine - optimized for speed
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-for voice in voices:
-    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-        engine.setProperty('voice', voice.id)
-        print(f"🎤 Using voice: {voice.name}")
-        break
-else:
-    if len(voices) > 1:
-        engine.setProperty('voice', voices[1].id)
+# TTS Engine - optimized for speed (owned by a worker thread; speak() only queues text)
+def configure_voice(engine):
+    """Pick a female voice and set the speaking rate (runs on the TTS thread)"""
+    voices = engine.getProperty('voices')
+    for voice in voices:
+        if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            print(f"🎤 Using voice: {voice.name}")
+            break
+    else:
+        if len(voices) > 1:
+            engine.setProperty('voice', voices[1].id)
+
+    engine.setProperty('rate', 190)
+    engine.setProperty('volume', 0.9)
 
-engine.setProperty('rate', 190)
-engine.setProperty('volume', 0.9)
+tts = TTSWorker(configure=configure_voice).start()
+TTS_LISTEN_TAIL = 0.4  # Start listening for the next command this long before Myra stops talking
 
 # Fast speech recognition setup
 recognizer = sr.Recognizer()
@@ -60,14 +66,15 @@ recognizer.pause_threshold = 0.8
 recognizer.phrase_threshold = 0.3
 recognizer.non_speaking_duration = 0.8
 
-# Enhanced wake words
-WAKE_WORDS = ["myra", "hey myra", "hello myra", "hi myra"]
 MEMORY_FILE = "myra_memory.json"
 
 # Initialize session manager and fuzzy matcher
 session_manager = MyraSessionManager(timeout_seconds=45, warning_seconds=10)  # Longer timeout
 fuzzy_matcher = FuzzyKeywordMatcher()
 
+# This front-end has always accepted a heard text spelled close to "myra" as a whole
+wake_detector = create_wake_detector(fuzzy_threshold=FUZZY_THRESHOLD)
+
 # Load microphone configuration if available
 def load_microphone_config():
     """Load microphone configuration"""
@@ -82,29 +89,28 @@ def load_microphone_config():
 
 mic_config = load_microphone_config()
 
+# Opened and calibrated once; a background tracker keeps energy_threshold current
+microphone = get_microphone(mic_config.get("microphone_index"))
+microphone.attach(recognizer)
+
 def speak(text):
     """Fast text-to-speech with session tracking"""
     print(f"🤖 Myra: {text}")
-    engine.say(text)
-    engine.runAndWait()
-    session_manager.update_activity()  # Update activity after speaking
+    future = tts.say(text)
+    future.add_done_callback(lambda _: session_manager.update_activity())  # Update activity after speaking
+    return future
+
+# Probed on a background thread with back-off; the listening loop only reads the flag
+connectivity = get_monitor()
 
 def check_internet():
-    """Quick internet check"""
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=2)
-        return True
-    except OSError:
-        return False
+    """Quick internet check (cached, never blocks)"""
+    return connectivity.is_online()
 
 def listen_for_wake_word():
     """Listen specifically for wake words with fuzzy matching"""
-    mic_index = mic_config.get("microphone_index")
-    microphone = sr.Microphone(device_index=mic_index) if mic_index is not None else sr.Microphone()
-    
     with microphone as source:
         print("🔊 Listening for wake word...")
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
         
         try:
             audio = recognizer.listen(source, timeout=5, phrase_time_limit=3)
@@ -115,33 +121,24 @@ def listen_for_wake_word():
                 return False
                 
             print(f"🗣️ Heard: {text}")
+            if tts.is_echo(text):
+                return False  # Myra's own voice
             
-            # Check for wake words (including fuzzy matching)
-            text_lower = text.lower().strip()
-            for wake_word in WAKE_WORDS:
-                if wake_word in text_lower:
-                    print(f"✅ Wake word detected: {wake_word}")
-                    return True
-            
-            # Fuzzy match wake words
-            wake_similarity = SequenceMatcher(None, text_lower, "myra").ratio()
-            if wake_similarity >= 0.7:
-                print(f"✅ Fuzzy wake word detected: {text} (similarity: {wake_similarity:.2f})")
+            # Check for wake words (exact, misrecognitions, fuzzy matching)
+            detected, label, score = wake_detector.detect(text)
+            if detected:
+                print(f"✅ Wake word detected: {label} (confidence: {score:.0%})")
+                if tts.cancel():
+                    print("✋ Interrupted speech")
                 return True
             
-            # Check for common misrecognitions
-            misrecognitions = ["mirror", "maria", "mira", "maya"]
-            for misrec in misrecognitions:
-                if misrec in text_lower:
-                    print(f"✅ Misrecognition corrected: {text}")
-                    return True
-            
             return False
             
         except sr.UnknownValueError:
             return False
         except sr.RequestError:
             print("⚠️ Speech service error")
+            connectivity.report_failure()
             return False
         except sr.WaitTimeoutError:
             return False
@@ -149,13 +146,10 @@ def listen_for_wake_word():
 def listen_for_command():
     """Listen for commands after wake word"""
     session_manager.set_state(SessionState.LISTENING)
-    
-    mic_index = mic_config.get("microphone_index")
-    microphone = sr.Microphone(device_index=mic_index) if mic_index is not None else sr.Microphone()
+    tts.wait(tail=TTS_LISTEN_TAIL)  # Overlap the listen with the last words of the reply
     
     with microphone as source:
         print("🎧 Listening for command...")
-        recognizer.adjust_for_ambient_noise(source, duration=0.3)
         
         try:
             audio = recognizer.listen(source, timeout=12, phrase_time_limit=10)  # Longer timeout
@@ -174,6 +168,7 @@ def listen_for_command():
             speak("Sorry, I didn't catch that. Could you repeat?")
             return ""
         except sr.RequestError:
+            connectivity.report_failure()
             speak("Sorry, speech service is unavailable.")
             return ""
         except sr.WaitTimeoutError:
@@ -325,13 +320,15 @@ def smart_file_search(query):
         return f"Search error: {str(e)}"
 
 # === AI Response (Ollama) ===
+AI_MODEL = "llama3.2:1b"
+ollama = get_client()  # Pooled keep-alive connection
+
 def get_ai_response(question):
     """Quick AI response from Ollama"""
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "llama3.2:1b",
+        response = ollama.generate(
+            {
+                "model": AI_MODEL,
                 "prompt": f"Answer briefly and conversationally: {question}",
                 "stream": False,
                 "options": {"temperature": 0.7, "top_p": 0.9}
@@ -442,7 +439,7 @@ def main():
     
     print("🚀 Myra Voice Assistant - FAST & ENHANCED MODE")
     print("=" * 60)
-    print("✅ Internet:", "🌐 Connected" if check_internet() else "❌ Offline")
+    print("✅ Internet:", "🌐 Connected" if connectivity.wait_for_status() else "❌ Offline")
     print("🎤 Speech Recognition: Google (Online)")
     print("🤖 AI Model: Ollama llama3.2:1b")
     print("🧠 Fuzzy Matching: Enabled")
@@ -476,6 +473,7 @@ def main():
                 # Listen for wake word
                 if listen_for_wake_word():
                     session_manager.wake_up()
+                    ollama.warm_up(AI_MODEL)  # Load the model while the user speaks
                     speak("Yes? How can I help you?")
                     
             elif session_manager.is_awake():
@@ -502,7 +500,9 @@ def main():
     except KeyboardInterrupt:
         print("\n👋 Myra shutting down. Goodbye!")
         session_manager.print_stats()
+        ollama.print_stats()
         speak("Goodbye!")
+        tts.close(drain=True)
 
 if __name__ == "__main__":
     main()
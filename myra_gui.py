@@ -5,8 +5,7 @@ from PIL import Image, ImageTk, ImageDraw
 import threading
 import time
 import speech_recognition as sr
-import pyttsx3
-import requests
+from myra_tts import TTSWorker
 import json
 import os
 import subprocess
@@ -18,6 +17,10 @@ import re
 import shutil
 from datetime import datetime
 import getpass
+from myra_wake_detector import wake_detector
+from myra_microphone import get_microphone
+from myra_ollama_client import get_client
+from myra_model_registry import get_model_resolver
 
 # Set the appearance mode and color theme
 ctk.set_appearance_mode("dark")  # Modes: "System", "Dark", "Light"
@@ -33,25 +36,28 @@ class MyraGUI:
         
         # Initialize voice components
         self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
-        self.setup_voice()
+        # One worker thread owns the TTS engine; speak() only queues text
+        self.tts = TTSWorker(configure=self.setup_voice).start()
         
         # State variables
         self.is_listening = False
         self.is_active = False
         self.is_sleeping = True
         
-        # Wake words with better pattern matching
-        self.wake_words = ["hello myra", "hey myra", "hi myra", "myra", "okay myra"]
+        # Wake words and misrecognitions come from the shared myra_wake_detector
         # Configure recognizer for better accuracy
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.dynamic_energy_adjustment_damping = 0.15
         self.recognizer.dynamic_energy_ratio = 1.5
         
+        # Opened and calibrated once; a background tracker keeps energy_threshold current
+        self.microphone = get_microphone()
+        self.microphone.attach(self.recognizer)
+        
         # Setup Ollama
-        self.ollama_url = "http://localhost:11434/api/generate"
-        self.model_name = self.select_model()
+        self.ollama = get_client()  # Pooled keep-alive connection
+        self.model_resolver = get_model_resolver()  # Resolved in the background, cached on disk
         
         # Create GUI elements
         self.setup_gui()
@@ -63,36 +69,24 @@ class MyraGUI:
         # Original update interval was too high; reduce to once per second
         self.root.after(1000, self.update_status)
         
-    def setup_voice(self):
-        """Configure voice to be female"""
-        voices = self.engine.getProperty('voices')
+    def setup_voice(self, engine):
+        """Configure voice to be female (runs on the TTS thread)"""
+        voices = engine.getProperty('voices')
         for voice in voices:
             if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
+                engine.setProperty('voice', voice.id)
                 break
         else:
             if len(voices) > 1:
-                self.engine.setProperty('voice', voices[1].id)
+                engine.setProperty('voice', voices[1].id)
         
-        self.engine.setProperty('rate', 180)
-        self.engine.setProperty('volume', 0.9)
+        engine.setProperty('rate', 180)
+        engine.setProperty('volume', 0.9)
     
-    def select_model(self):
-        """Select the best available Ollama model"""
-        try:
-            response = requests.get("http://localhost:11434/api/tags")
-            if response.status_code == 200:
-                models = response.json()
-                if models.get('models'):
-                    preferred = ['llama3.2:1b', 'llama3.2:3b', 'mistral:latest']
-                    for pref in preferred:
-                        for model in models['models']:
-                            if model['name'] == pref:
-                                return pref
-                    return models['models'][0]['name']
-        except:
-            pass
-        return None
+    @property
+    def model_name(self):
+        """Best available Ollama model (None until one is known)"""
+        return self.model_resolver.get()
     
     def setup_gui(self):
         """Create the GUI elements"""
@@ -229,51 +223,17 @@ class MyraGUI:
     def speak(self, text):
         """Text to speech with GUI updates"""
         self.log_activity(f"🗣️ Myra: {text}")
-        
-        def speak_thread():
-            self.engine.say(text)
-            self.engine.runAndWait()
-        
-        threading.Thread(target=speak_thread, daemon=True).start()
+        return self.tts.say(text)
     
     def check_wake_word(self, command):
         """Check if wake word is detected with fuzzy matching"""
-        command_lower = command.lower()
-        
-        # Direct matches
-        if any(wake_word in command_lower for wake_word in self.wake_words):
-            return True
-            
-        # Handle common misrecognitions
-        misrecognitions = {
-            "mirror": "myra",
-            "maria": "myra", 
-            "mira": "myra",
-            "maya": "myra",
-            "hello maria": "hello myra",
-            "hey maria": "hey myra",
-            "hi maria": "hi myra",
-            "hello mirror": "hello myra",
-            "hey mirror": "hey myra",
-            "hi mirror": "hi myra",
-            "hello mira": "hello myra",
-            "hey mira": "hey myra",
-            "hi mira": "hi myra"
-        }
-        
-        # Check for misrecognitions
-        for misrecognition, correct in misrecognitions.items():
-            if misrecognition in command_lower:
-                self.log_activity(f"🔧 Corrected '{misrecognition}' to '{correct}'")
-                return True
-                
-        return False
+        detected, label, score = wake_detector.detect(command)
+        if detected and score < 1.0:
+            self.log_activity(f"🔧 Corrected to {label}")
+        return detected
 
     def listen_loop(self):
         """Background listening loop for wake words"""
-        with sr.Microphone() as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
-        
         # Improved listening loop with reduced blocking
         while True:
             if not self.is_sleeping:
@@ -281,18 +241,18 @@ class MyraGUI:
                 continue
             
             try:
-                with sr.Microphone() as source:
-                    # Optimize ambient noise adjustment
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                with self.microphone as source:
                     audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=3)
                 
                 try:
                     command = self.recognizer.recognize_google(audio).lower()
                     self.log_activity(f"👂 Heard: {command}")
                     
-                    # Check for wake words with fuzzy matching
-                    if self.check_wake_word(command):
+                    # Check for wake words with fuzzy matching (ignoring Myra's own voice)
+                    if self.check_wake_word(command) and not self.tts.is_echo(command):
                         self.log_activity("🚀 Wake word detected!")
+                        if self.tts.cancel():
+                            self.log_activity("✋ Interrupted speech")
                         self.wake_up()
                         
                 except sr.UnknownValueError:
@@ -314,6 +274,7 @@ class MyraGUI:
         self.status_label.configure(text="👁️ Awake & Listening")
         self.wake_button.configure(text="😴 Go to Sleep")
         self.log_activity("👁️ Myra is now awake!")
+        self.ollama.warm_up(self.model_name)  # Load the model while the user speaks
         
         username = getpass.getuser()
         time_greeting = self.get_time_greeting()
@@ -345,7 +306,9 @@ class MyraGUI:
         
         while self.is_active and not self.is_sleeping:
             try:
-                with sr.Microphone() as source:
+                # Overlap the next listen with the last words of the reply
+                self.tts.wait(tail=0.4)
+                with self.microphone as source:
                     self.log_activity("👂 Listening for command...")
                     audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=7)
                 
@@ -435,7 +398,7 @@ class MyraGUI:
                 "prompt": prompt,
                 "stream": False
             }
-            response = requests.post(self.ollama_url, json=payload, timeout=30)
+            response = self.ollama.generate(payload, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -490,8 +453,8 @@ class MyraGUI:
         
         # Apply button
         def apply_settings():
-            self.engine.setProperty('rate', int(speed_slider.get()))
-            self.engine.setProperty('volume', volume_slider.get())
+            self.tts.set_property('rate', int(speed_slider.get()))
+            self.tts.set_property('volume', volume_slider.get())
             self.log_activity("⚙️ Settings updated")
             settings_window.destroy()
         
@@ -520,6 +483,8 @@ class MyraGUI:
             self.root.mainloop()
         except KeyboardInterrupt:
             self.log_activity("👋 Shutting down Myra...")
+        finally:
+            self.tts.close()
 
 def main():
     """Main function"""
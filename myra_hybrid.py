@@ -19,8 +19,6 @@ from datetime import datetime
 import threading
 import fnmatch
 import random
-import socket
-import urllib.request
 
 # Online speech recognition
 import speech_recognition as sr
@@ -34,30 +32,45 @@ except ImportError:
     VOSK_AVAILABLE = False
     print("⚠️  Vosk not available - will only work in online mode")
 
+from myra_vosk_service import VoskRecognizerService, WAKE_PHASE, COMMAND_PHASE
+from myra_wake_detector import wake_detector
+from myra_connectivity import get_monitor
+from myra_recognition_race import RecognitionRace
+from myra_microphone import get_microphone
+from myra_llm_stream import StreamingResponder
+from myra_ollama_client import get_client
+from myra_model_registry import get_model_resolver
+from myra_response_cache import ResponseCache
+from myra_intent_router import IntentRouter, SLEEP_EXCLUDES, contains_phrase
+from myra_shell_host import get_system_actions, VK_VOLUME_MUTE, VK_VOLUME_UP, VK_VOLUME_DOWN
+
 # Text to speech
-import pyttsx3
+from myra_tts import TTSWorker, NORMAL
 
 # For AI responses (Ollama - runs locally)
 import requests
 
 # === Setup ===
-# TTS Engine
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-for voice in voices:
-    if 'female' in voice.name.lower() or 'zira' in voice.name.lower() or 'hazel' in voice.name.lower():
-        engine.setProperty('voice', voice.id)
-        print(f"🎤 Using voice: {voice.name}")
-        break
-else:
-    if len(voices) > 1:
-        engine.setProperty('voice', voices[1].id)
-        print(f"🎤 Using voice: {voices[1].name}")
+# TTS Engine (owned by a worker thread; speak() only queues text)
+def configure_voice(engine):
+    """Pick a female voice and set the speaking rate (runs on the TTS thread)"""
+    voices = engine.getProperty('voices')
+    for voice in voices:
+        if 'female' in voice.name.lower() or 'zira' in voice.name.lower() or 'hazel' in voice.name.lower():
+            engine.setProperty('voice', voice.id)
+            print(f"🎤 Using voice: {voice.name}")
+            break
     else:
-        print(f"🎤 Using default voice")
+        if len(voices) > 1:
+            engine.setProperty('voice', voices[1].id)
+            print(f"🎤 Using voice: {voices[1].name}")
+        else:
+            print(f"🎤 Using default voice")
 
-engine.setProperty('rate', 180)
-engine.setProperty('volume', 0.9)
+    engine.setProperty('rate', 180)
+    engine.setProperty('volume', 0.9)
+
+tts = TTSWorker(configure=configure_voice).start()
 
 # Online speech recognition setup
 recognizer = sr.Recognizer()
@@ -66,14 +79,20 @@ recognizer.dynamic_energy_threshold = True
 recognizer.dynamic_energy_adjustment_damping = 0.1
 recognizer.dynamic_energy_ratio = 1.2
 recognizer.pause_threshold = 0.5
+recognizer.operation_timeout = 5  # A stalled Google request fails instead of holding its race engine
+
+# Opened and calibrated once; a background tracker keeps energy_threshold current
+microphone = get_microphone()
+microphone.attach(recognizer)
 
 # Offline speech recognition setup
 MODEL_PATH = "vosk-model"
 if VOSK_AVAILABLE and os.path.exists(MODEL_PATH):
-    model = vosk.Model(MODEL_PATH)
-    rec = vosk.KaldiRecognizer(model, 16000)
-    rec.SetWords(True)
-    audio = pyaudio.PyAudio()
+    # One model and one open stream for the whole session; the wake phase
+    # uses a small grammar recognizer, commands use the full model
+    vosk_service = VoskRecognizerService(
+        MODEL_PATH, wake_phrases=wake_detector.get_phrases()
+    )
     OFFLINE_READY = True
     print("✅ Offline speech recognition ready")
 else:
@@ -84,34 +103,32 @@ else:
 # Ollama setup (local AI)
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
-# Wake words
-WAKE_WORDS = ["hello myra", "hey myra", "hi myra", "myra", "okay myra"]
-
 MEMORY_FILE = "myra_memory.json"
 
 # Global state
 listening_active = False
 current_mode = "unknown"
 
+# Online and offline both ready: decode each utterance with Google and Vosk at once
+RACE_MODE = True
+GOOGLE_LATENCY_BUDGET = 1.5  # Seconds Google may take before a Vosk result is used
+TTS_LISTEN_TAIL = 0.4  # Start listening for the next command this long before Myra stops talking
+
+# Probed on a background thread with back-off; the listening loop only reads the flag
+connectivity = get_monitor()
+
 def check_internet_connection():
-    """Check if internet connection is available"""
-    try:
-        # Try to connect to Google DNS
-        socket.create_connection(("8.8.8.8", 53), timeout=3)
-        return True
-    except OSError:
-        try:
-            # Fallback: try to reach a reliable website
-            urllib.request.urlopen('http://www.google.com', timeout=3)
-            return True
-        except:
-            return False
+    """Check if internet connection is available (cached, never blocks)"""
+    return connectivity.is_online()
 
 def get_speech_mode():
     """Determine which speech recognition mode to use"""
     global current_mode
     
-    if check_internet_connection():
+    if check_internet_connection() and OFFLINE_READY and RACE_MODE:
+        current_mode = "race"
+        return "race"
+    elif check_internet_connection():
         current_mode = "online"
         return "online"
     elif OFFLINE_READY:
@@ -147,7 +164,7 @@ def forget_memory(key):
         del memory[key]
         save_memory(memory)
 
-def get_memory_context():
+def get_memory_context(include_last_conversation=True):
     """Get a formatted string of what Myra knows about the user"""
     memory = load_memory()
     if not memory:
@@ -158,7 +175,8 @@ def get_memory_context():
         if key == "user_name":
             context_parts.append(f"User's name is {value}")
         elif key == "last_conversation":
-            context_parts.append(f"Last talked about: {value}")
+            if include_last_conversation:
+                context_parts.append(f"Last talked about: {value}")
         elif isinstance(value, str):
             context_parts.append(f"{key}: {value}")
         elif value is True:
@@ -167,51 +185,35 @@ def get_memory_context():
     return "; ".join(context_parts) if context_parts else None
 
 # === AI Setup ===
-def get_available_models():
-    """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
-        if response.status_code == 200:
-            models = response.json()
-            return [model['name'] for model in models.get('models', [])]
-        return []
-    except:
-        return []
-
-def select_model():
-    """Automatically select the best available model"""
-    models = get_available_models()
-    if not models:
-        print("⚠️  No Ollama models found. AI features will be limited.")
-        return None
-    
-    preferred_models = [
-        'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
-        'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
-    ]
-    
-    for preferred in preferred_models:
-        if preferred in models:
-            print(f"✅ Using AI model: {preferred}")
-            return preferred
-    
-    selected = models[0]
-    print(f"✅ Using AI model: {selected}")
-    return selected
-
-MODEL_NAME = select_model()
+# Resolved in the background; the last known model is loaded from disk instantly
+model_resolver = get_model_resolver()
 
-def speak(text):
-    """Text to speech function"""
+def speak(text, priority=NORMAL):
+    """Queue text for the TTS worker (returns a Future; does not block)"""
     print("Myra:", text)
-    engine.say(text)
-    engine.runAndWait()
+    return tts.say(text, priority)
+
+def wait_for_speech(tail=TTS_LISTEN_TAIL):
+    """
+    Let Myra finish talking before the next listen, allowing barge-in
+
+    With the offline wake grammar available, listen for the wake word while
+    the response plays and cut it off when the user talks over Myra.
+    """
+    while tts.is_speaking() and tts.remaining() > tail:
+        if not OFFLINE_READY:
+            tts.wait(tail=tail)
+            return
+        heard = vosk_service.listen(phase=WAKE_PHASE, timeout=min(1.0, tts.remaining()))
+        if heard and check_wake_word(heard) and not tts.is_echo(heard):
+            print("✋ Barge-in - stopping speech")
+            tts.cancel()
+            return
 
 def listen_online():
     """Listen using Google Speech Recognition (online)"""
     try:
-        with sr.Microphone() as source:
-            recognizer.adjust_for_ambient_noise(source, duration=0.3)
+        with microphone as source:
             audio = recognizer.listen(source, timeout=10, phrase_time_limit=7)
         
         command = recognizer.recognize_google(audio)
@@ -220,6 +222,7 @@ def listen_online():
         return ""
     except sr.RequestError:
         print("⚠️  Online speech service unavailable, switching to offline...")
+        connectivity.report_failure()
         return None  # Signal to switch modes
     except sr.WaitTimeoutError:
         return ""
@@ -227,81 +230,82 @@ def listen_online():
         print(f"Error in online speech recognition: {e}")
         return ""
 
-def listen_offline():
+def listen_offline(phase=COMMAND_PHASE):
     """Listen using Vosk offline speech recognition"""
     if not OFFLINE_READY:
         return ""
     
-    stream = audio.open(format=pyaudio.paInt16,
-                       channels=1,
-                       rate=16000,
-                       input=True,
-                       frames_per_buffer=8000)
-    
-    stream.start_stream()
-    
     try:
-        timeout = time.time() + 10  # 10 second timeout
-        while True:
-            if time.time() > timeout:
-                return ""
-                
-            data = stream.read(4000, exception_on_overflow=False)
-            
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                text = result.get('text', '').strip()
-                if text:
-                    return text
-                    
+        return vosk_service.listen(phase=phase, timeout=10)  # 10 second timeout
     except Exception as e:
         print(f"Error in offline speech recognition: {e}")
         return ""
-    finally:
-        stream.stop_stream()
-        stream.close()
 
-def listen_adaptive():
+def recognize_google_engine(audio, phase):
+    """Race engine: Google Speech Recognition"""
+    try:
+        return recognizer.recognize_google(audio)
+    except sr.UnknownValueError:
+        return ""
+    except sr.RequestError:
+        connectivity.report_failure()
+        raise
+
+def recognize_vosk_engine(audio, phase):
+    """Race engine: Vosk on the same captured audio"""
+    return vosk_service.recognize_pcm(audio.get_raw_data(convert_rate=16000, convert_width=2), phase)
+
+speech_race = RecognitionRace(
+    {"google": recognize_google_engine, "vosk": recognize_vosk_engine},
+    prefer="google", prefer_budget=GOOGLE_LATENCY_BUDGET
+)
+
+def listen_race(phase=COMMAND_PHASE):
+    """Capture one utterance and recognize it with Google and Vosk concurrently"""
+    try:
+        with microphone as source:
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=7)
+    except sr.WaitTimeoutError:
+        return ""
+    except Exception as e:
+        print(f"Error capturing audio: {e}")
+        return ""
+    
+    text, engine = speech_race.recognize(audio, phase)
+    if text:
+        print(f"🏁 {engine} answered first")
+    return text
+
+def listen_adaptive(phase=COMMAND_PHASE):
     """Adaptively choose between online and offline speech recognition"""
     mode = get_speech_mode()
     
-    if mode == "online":
+    if mode == "race":
+        return listen_race(phase)
+    elif mode == "online":
         print("🌐 Using online speech recognition")
         result = listen_online()
         if result is None:  # Online failed, try offline
             mode = "offline"
             if OFFLINE_READY:
                 print("🔄 Switching to offline speech recognition")
-                return listen_offline()
+                return listen_offline(phase)
             else:
                 return ""
         return result
     elif mode == "offline":
         print("📴 Using offline speech recognition")
-        return listen_offline()
+        return listen_offline(phase)
     else:
         print("❌ No speech recognition available")
         return ""
 
 def check_wake_word(command):
     """Check if wake word is detected"""
-    command_lower = command.lower()
-    
-    # Direct matches
-    if any(wake_word in command_lower for wake_word in WAKE_WORDS):
-        return True
-        
-    # Handle common misrecognitions
-    misrecognitions = {
-        "mirror": "myra", "maria": "myra", "mira": "myra", "maya": "myra"
-    }
-    
-    for misrecognition, correct in misrecognitions.items():
-        if misrecognition in command_lower:
-            print(f"🔧 Corrected '{misrecognition}' to '{correct}'")
-            return True
-            
-    return False
+    detected, label, score = wake_detector.detect(command)
+    if detected and score < 1.0:
+        print(f"🔧 Corrected to {label}")
+    return detected
 
 def give_feedback():
     """Provide user with real-time status updates"""
@@ -377,19 +381,13 @@ def adjust_brightness(action):
         if percentage_match:
             percentage = int(percentage_match.group(1))
             percentage = max(10, min(100, percentage))
-            subprocess.run(["powershell", "-Command", 
-                          f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {percentage})"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(percentage)
             return f"Brightness set to {percentage} percent."
         elif any(word in action_lower for word in increase_words):
-            subprocess.run(["powershell", "-Command", 
-                          "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, 100)"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(100)
             return "Brightness increased to maximum."
         elif any(word in action_lower for word in decrease_words):
-            subprocess.run(["powershell", "-Command", 
-                          "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, 30)"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(30)
             return "Brightness decreased to 30 percent."
         else:
             return "I can make your screen brighter or darker. What would you prefer?"
@@ -397,124 +395,137 @@ def adjust_brightness(action):
     except Exception as e:
         return "Sorry, I couldn't adjust the brightness. This might require administrator privileges."
 
+# === System Commands ===
+# Every trigger phrase is compiled into one matcher. Device intents outrank the
+# bare power verbs, so "turn off the sound" mutes instead of shutting down, and
+# "cancel the shutdown" aborts it instead of starting one.
+system_router = IntentRouter()
+
+# Volume and brightness go through one long-lived shell host (or direct Win32
+# calls); the five volume steps are a single call instead of five PowerShell launches
+system_actions = get_system_actions()
+system_actions.start(background=True)
+VOLUME_STEPS = 5
+
+@system_router.intent("shutdown", ["shutdown", "shut down", "turn off", "power off"])
+def shutdown_computer(command_lower):
+    speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Shutting down now.")
+    try:
+        os.system("shutdown /s /t 5")
+        return "Computer is shutting down."
+    except:
+        return "Sorry, I couldn't shut down the computer."
+
+@system_router.intent("restart", ["restart", "reboot"])
+def restart_computer(command_lower):
+    speak("Restarting the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Restarting now.")
+    try:
+        os.system("shutdown /r /t 5")
+        return "Computer is restarting."
+    except:
+        return "Sorry, I couldn't restart the computer."
+
+@system_router.intent("lock", ["lock", "lock screen", "lock computer"])
+def lock_computer(command_lower):
+    try:
+        os.system("rundll32.exe user32.dll, LockWorkStation")
+        return "Screen locked."
+    except:
+        return "Sorry, I couldn't lock the screen."
+
+@system_router.intent("sleep", ["sleep", "hibernate"], exclude=SLEEP_EXCLUDES)
+def sleep_computer(command_lower):
+    try:
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+        return "Computer is going to sleep."
+    except:
+        return "Sorry, I couldn't put the computer to sleep."
+
+@system_router.intent("brightness", ["brightness", "brighter", "darker", "dim"], priority=1)
+def brightness_command(command_lower):
+    return adjust_brightness(command_lower)
+
+@system_router.intent("volume", ["volume", "sound"], priority=1)
+def volume_command(command_lower):
+    volume_up_words = ["up", "increase", "higher", "louder", "more"]
+    volume_down_words = ["down", "decrease", "lower", "quieter", "less"]
+    mute_words = ["mute", "silence", "quiet", "off"]
+    
+    try:
+        if contains_phrase(command_lower, mute_words):
+            system_actions.press_key(VK_VOLUME_MUTE)
+            return "Audio muted."
+        elif contains_phrase(command_lower, volume_up_words):
+            system_actions.press_key(VK_VOLUME_UP, VOLUME_STEPS)
+            return "Volume increased."
+        elif contains_phrase(command_lower, volume_down_words):
+            system_actions.press_key(VK_VOLUME_DOWN, VOLUME_STEPS)
+            return "Volume decreased."
+    except:
+        return "Sorry, I couldn't adjust the volume."
+
+APP_COMMANDS = {
+    "calculator": "calc", "notepad": "notepad", 
+    "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
+}
+
+@system_router.intent("app", list(APP_COMMANDS), priority=1)
+def app_command(command_lower):
+    for app_word, app_cmd in APP_COMMANDS.items():
+        if contains_phrase(command_lower, [app_word]):
+            try:
+                if contains_phrase(command_lower, ["close"]):
+                    os.system(f"taskkill /f /im {app_cmd}.exe")
+                    return f"{app_word.title()} closed."
+                else:
+                    os.system(app_cmd)
+                    return f"{app_word.title()} opened."
+            except:
+                return f"Sorry, I couldn't handle {app_word.title()}."
+
+@system_router.intent("system_info", ["system info", "pc info"])
+def system_info(command_lower):
+    try:
+        cpu_usage = psutil.cpu_percent(interval=1)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('C:\\\\')
+        return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
+    except:
+        return "Sorry, I couldn't get system information."
+
+@system_router.intent("time", ["time", "date"])
+def time_and_date(command_lower):
+    now = datetime.now()
+    if contains_phrase(command_lower, ["time"]):
+        return f"The current time is {now.strftime('%I:%M %p')}."
+    else:
+        return f"Today is {now.strftime('%A, %B %d, %Y')}."
+
+@system_router.intent("screenshot", ["screenshot"])
+def take_screenshot(command_lower):
+    try:
+        screenshot = pyautogui.screenshot()
+        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        screenshot.save(filename)
+        return f"Screenshot saved as {filename}."
+    except:
+        return "Sorry, I couldn't take a screenshot."
+
+@system_router.intent("cancel", ["cancel"], priority=2)
+def cancel_shutdown(command_lower):
+    try:
+        os.system("shutdown /a")
+        return "Shutdown cancelled."
+    except:
+        return "No shutdown to cancel."
+
 def control_system(command):
     """Handle all system control commands"""
-    command_lower = command.lower()
-    
-    # System power commands
-    if any(x in command_lower for x in ["shutdown", "turn off", "power off"]):
-        speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Shutting down now.")
-        try:
-            os.system("shutdown /s /t 5")
-            return "Computer is shutting down."
-        except:
-            return "Sorry, I couldn't shut down the computer."
-    
-    elif any(x in command_lower for x in ["restart", "reboot"]):
-        speak("Restarting the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Restarting now.")
-        try:
-            os.system("shutdown /r /t 5")
-            return "Computer is restarting."
-        except:
-            return "Sorry, I couldn't restart the computer."
-    
-    elif any(x in command_lower for x in ["lock", "lock screen", "lock computer"]):
-        try:
-            os.system("rundll32.exe user32.dll, LockWorkStation")
-            return "Screen locked."
-        except:
-            return "Sorry, I couldn't lock the screen."
-    
-    elif any(x in command_lower for x in ["sleep", "hibernate"]):
-        try:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            return "Computer is going to sleep."
-        except:
-            return "Sorry, I couldn't put the computer to sleep."
-    
-    # Brightness and volume controls
-    elif any(x in command_lower for x in ["brightness", "brighter", "darker", "dim"]):
-        return adjust_brightness(command_lower)
-    
-    elif "volume" in command_lower or "sound" in command_lower:
-        volume_up_words = ["up", "increase", "higher", "louder", "more"]
-        volume_down_words = ["down", "decrease", "lower", "quieter", "less"]
-        mute_words = ["mute", "silence", "quiet", "off"]
-        
-        try:
-            if any(word in command_lower for word in mute_words):
-                subprocess.run(["powershell", "-Command", 
-                              "(New-Object -comObject WScript.Shell).SendKeys([char]173)"], 
-                              check=True, capture_output=True)
-                return "Audio muted."
-            elif any(word in command_lower for word in volume_up_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "(New-Object -comObject WScript.Shell).SendKeys([char]175)"], 
-                                  check=True, capture_output=True)
-                    time.sleep(0.1)
-                return "Volume increased."
-            elif any(word in command_lower for word in volume_down_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "(New-Object -comObject WScript.Shell).SendKeys([char]174)"], 
-                                  check=True, capture_output=True)
-                    time.sleep(0.1)
-                return "Volume decreased."
-        except:
-            return "Sorry, I couldn't adjust the volume."
-    
-    # Application management
-    elif any(x in command_lower for x in ["calculator", "notepad", "chrome", "firefox", "edge"]):
-        app_mapping = {
-            "calculator": "calc", "notepad": "notepad", 
-            "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
-        }
-        for app_word, app_cmd in app_mapping.items():
-            if app_word in command_lower:
-                try:
-                    if "close" in command_lower:
-                        os.system(f"taskkill /f /im {app_cmd}.exe")
-                        return f"{app_word.title()} closed."
-                    else:
-                        os.system(app_cmd)
-                        return f"{app_word.title()} opened."
-                except:
-                    return f"Sorry, I couldn't handle {app_word.title()}."
-    
-    # System info
-    elif "system info" in command_lower or "pc info" in command_lower:
-        try:
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('C:\\\\')
-            return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
-        except:
-            return "Sorry, I couldn't get system information."
-    
-    # Time and date
-    elif "time" in command_lower or "date" in command_lower:
-        now = datetime.now()
-        if "time" in command_lower:
-            return f"The current time is {now.strftime('%I:%M %p')}."
-        else:
-            return f"Today is {now.strftime('%A, %B %d, %Y')}."
-    
-    # Screenshot
-    elif "screenshot" in command_lower:
-        try:
-            screenshot = pyautogui.screenshot()
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            screenshot.save(filename)
-            return f"Screenshot saved as {filename}."
-        except:
-            return "Sorry, I couldn't take a screenshot."
-    
-    return None
+    return system_router.route(command.lower())
 
 def handle_memory_command(command):
     """Handle memory-specific commands"""
@@ -591,31 +602,32 @@ def handle_memory_command(command):
         if count == 0:
             speak("I have some information stored, but it's mostly system data. Tell me more about yourself!")
 
-def ask_ollama(prompt):
-    """Get AI response from Ollama (local)"""
-    if not MODEL_NAME:
-        return "Sorry, no AI model is available. But I can still help with system commands!"
-    
-    try:
-        payload = {
-            "model": MODEL_NAME,
-            "prompt": prompt,
-            "stream": False
-        }
-        response = requests.post(OLLAMA_URL, json=payload, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('response', 'Sorry, I got an empty response.')
-        else:
-            return "Sorry, the AI service isn't responding right now."
-            
-    except requests.exceptions.Timeout:
-        return "The AI is taking too long to respond."
-    except requests.exceptions.ConnectionError:
-        return "I can't connect to the AI service right now, but I can still help with system commands."
-    except Exception as e:
-        return "Sorry, there was an error with the AI response."
+# Pooled keep-alive connection; each sentence goes to the TTS queue as soon as it is generated
+ollama = get_client()
+ollama_stream = StreamingResponder(speak, client=ollama, timeout=15)
+response_cache = ResponseCache()
+
+def ask_ollama(prompt, model, cache_key=None):
+    """Get AI response from Ollama (local) with the model resolved for this turn, speaking it sentence by sentence"""
+    if not model:
+        message = "Sorry, no AI model is available. But I can still help with system commands!"
+    else:
+        try:
+            answer = ollama_stream.ask({"model": model, "prompt": prompt})
+            if answer:
+                response_cache.put(cache_key, answer, prompt)
+                return answer
+            message = "Sorry, I got an empty response."
+        except requests.exceptions.Timeout:
+            message = "The AI is taking too long to respond."
+        except requests.exceptions.ConnectionError:
+            message = "I can't connect to the AI service right now, but I can still help with system commands."
+        except requests.exceptions.HTTPError:
+            message = "Sorry, the AI service isn't responding right now."
+        except Exception as e:
+            message = "Sorry, there was an error with the AI response."
+    speak(message)
+    return message
 
 def remember_conversation(statement):
     """Automatically remember important conversation details"""
@@ -637,8 +649,8 @@ def main_loop():
     """Main conversation loop"""
     global listening_active
     
-    # Check initial capabilities
-    internet_status = "🌐 Online" if check_internet_connection() else "📴 Offline"
+    # Check initial capabilities (waits for the monitor's first probe)
+    internet_status = "🌐 Online" if connectivity.wait_for_status() else "📴 Offline"
     offline_status = "✅ Available" if OFFLINE_READY else "❌ Not Available"
     
     print("🤖 Myra Voice Assistant - HYBRID MODE")
@@ -653,12 +665,16 @@ def main_loop():
         try:
             if not listening_active:
                 # Listen for wake word
-                command = listen_adaptive()
+                command = listen_adaptive(phase=WAKE_PHASE)
                 if command:
                     print(f"🔍 Heard: {command}")
+                    if tts.is_echo(command):
+                        continue  # Myra's own voice (e.g. "say Hello Myra to wake me")
                     if check_wake_word(command):
                         print("🚀 Wake word detected! Activating Myra...")
                         listening_active = True
+                        tts.cancel()
+                        ollama.warm_up(model_resolver.get())  # Load the model while the user speaks
                         
                         # Personalized greeting based on memory
                         user_name = recall_memory("user_name")
@@ -673,6 +689,7 @@ def main_loop():
                             speak("Hi! I'm awake and ready to help. What can I do for you?")
             else:
                 # Active listening mode
+                wait_for_speech()
                 print("👂 Listening...")
                 command = listen_adaptive()
                 
@@ -716,10 +733,18 @@ def main_loop():
                     else:
                         enhanced_prompt = command
                     
-                    answer = ask_ollama(enhanced_prompt)
+                    # Repeated questions are answered from the cache (keyed without the
+                    # last-conversation note, which changes every turn)
+                    # Resolved once per turn, so the cache key names the model that answers
+                    model = model_resolver.get(wait=2.0)
+                    cache_key = response_cache.make_key(command, model,
+                                                        get_memory_context(include_last_conversation=False))
+                    answer = response_cache.get(cache_key)
                     if answer:
                         speak(answer)
-                        
+                    else:
+                        answer = ask_ollama(enhanced_prompt, model, cache_key)  # Spoken while it streams
+                    if answer:
                         # Remember important information from the conversation
                         remember_conversation(command)
                         
@@ -734,5 +759,15 @@ if __name__ == "__main__":
     try:
         main_loop()
     finally:
+        tts.close()
+        ollama_stream.print_stats()
+        ollama.print_stats()
+        response_cache.flush()
+        response_cache.print_stats()
+        system_router.print_stats("System commands")
+        system_actions.print_stats()
+        system_actions.close()
+        speech_race.print_stats()
+        speech_race.close()
         if OFFLINE_READY:
-            audio.terminate()
+            vosk_service.close()
@@ -15,6 +15,25 @@ import shutil
 from pathlib import Path
 import json
 
+# Helper modules myra_hybrid.py imports - installed next to myra.py
+MYRA_SUPPORT_FILES = [
+    "myra_audio_buffer.py",
+    "myra_vosk_service.py",
+    "myra_vad.py",
+    "myra_connectivity.py",
+    "myra_recognition_race.py",
+    "myra_microphone.py",
+    "myra_tts.py",
+    "myra_llm_stream.py",
+    "myra_ollama_client.py",
+    "myra_model_registry.py",
+    "myra_response_cache.py",
+    "myra_intent_router.py",
+    "myra_shell_host.py",
+    "myra_wake_matcher.py",
+    "myra_wake_detector.py",
+]
+
 class MyraInstaller:
     def __init__(self):
         self.root = tk.Tk()
@@ -265,6 +284,11 @@ This installer will set up everything you need to run Myra."""
             # Create a basic version if source not found
             self.create_myra_application()
         
+        for support_file in MYRA_SUPPORT_FILES:
+            support_source = os.path.join(current_dir, support_file)
+            if os.path.exists(support_source):
+                shutil.copy2(support_source, os.path.join(self.install_dir, support_file))
+        
         # Create batch file for easy execution
         batch_content = f'''@echo off
 cd /d "{self.install_dir}"
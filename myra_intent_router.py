@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+🧭 Myra Intent Router
+Table-driven command routing: every trigger phrase in one compiled matcher
+"""
+import re
+import time
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def _phrase_pattern(phrases):
+    alternatives = "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+def contains_phrase(text, phrases):
+    """True if any phrase occurs in text as whole words ("quiet" does not match "quieter")"""
+    return _phrase_pattern(tuple(phrases)).search(text) is not None
+
+# "sleep" as Myra's own command or as conversation, not a request to suspend the PC
+SLEEP_EXCLUDES = ["go to sleep", "back to sleep", "how much sleep", "can't sleep"]
+
+class IntentRouter:
+    """
+    Registry of intents, each with trigger phrases and a handler
+
+    All trigger phrases are compiled into one regular expression with word
+    boundaries, so routing is a single scan of the command no matter how
+    many intents exist, and "lock" no longer fires on "clock" or "edge" on
+    "knowledge". When several intents are triggered the one with the
+    highest priority wins, then the one registered first - the same rule
+    as the old if/elif chains, but with the order made explicit.
+
+    An intent can list exclude phrases that veto it ("go to sleep" is a
+    Myra command, not a request to suspend the PC). Exclude phrases are part
+    of the same pattern; since longer phrases are tried first they also
+    keep the shorter trigger inside them from matching.
+    """
+
+    def __init__(self):
+        self._intents = {}  # name -> (handler, priority, order)
+        self._phrases = {}  # phrase -> [(name, is_exclude)]
+        self._pattern = None
+        self._rank = {}     # name -> sort key, best first
+        self._sole = {}     # phrase -> the one intent it triggers on its own
+
+        # Statistics
+        self.routed = 0
+        self.matched = 0
+        self.routing_seconds = 0.0
+
+    def register(self, name, phrases, handler, priority=0, exclude=()):
+        """
+        Add an intent
+
+        Args:
+            name: Intent name
+            phrases: Trigger phrases (lowercase, matched as whole words)
+            handler: Function(command_lower) returning a response (or None)
+            priority: Higher wins when several intents are triggered
+            exclude: Phrases that veto this intent
+        """
+        self._intents[name] = (handler, priority, len(self._intents))
+        for phrase in phrases:
+            self._phrases.setdefault(phrase.lower(), []).append((name, False))
+        for phrase in exclude:
+            self._phrases.setdefault(phrase.lower(), []).append((name, True))
+        self._pattern = None
+        return handler
+
+    def intent(self, name, phrases, priority=0, exclude=()):
+        """Decorator form of register()"""
+        def decorator(handler):
+            return self.register(name, phrases, handler, priority, exclude)
+        return decorator
+
+    def _compile(self):
+        self._pattern = _phrase_pattern(tuple(self._phrases))
+        self._rank = {name: (-priority, order) for name, (_, priority, order) in self._intents.items()}
+        # A phrase that triggers one intent and vetoes none decides a command where it is the only hit
+        self._sole = {phrase: entries[0][0] for phrase, entries in self._phrases.items()
+                      if len(entries) == 1 and not entries[0][1]}
+
+    def match(self, command_lower):
+        """Return the winning intent name for a lowercase command, or None"""
+        if self._pattern is None:
+            self._compile()
+        hits = self._pattern.findall(command_lower)
+        if not hits:
+            return None
+        if len(hits) == 1 and hits[0] in self._sole:
+            return self._sole[hits[0]]
+        triggered = set()
+        vetoed = set()
+        for phrase in hits:
+            for name, is_exclude in self._phrases[phrase]:
+                (vetoed if is_exclude else triggered).add(name)
+        triggered -= vetoed
+        if not triggered:
+            return None
+        return min(triggered, key=self._rank.__getitem__)
+
+    def route(self, command_lower):
+        """
+        Dispatch a lowercase command to its intent handler
+
+        Returns:
+            The handler's response, or None if no intent matched
+        """
+        start = time.perf_counter()
+        name = self.match(command_lower)
+        self.routed += 1
+        self.routing_seconds += time.perf_counter() - start
+        if name is None:
+            return None
+        self.matched += 1
+        return self._intents[name][0](command_lower)
+
+    def intents(self):
+        """Registered intent names in registration order"""
+        return list(self._intents)
+
+    def get_stats(self):
+        """Return routing counts and the average routing cost"""
+        return {
+            "intents": len(self._intents),
+            "phrases": len(self._phrases),
+            "routed": self.routed,
+            "matched": self.matched,
+            "avg_routing_us": self.routing_seconds / self.routed * 1e6 if self.routed else 0.0
+        }
+
+    def print_stats(self, label="Intent router"):
+        """Print how many commands were routed and what it cost"""
+        stats = self.get_stats()
+        print(f"🧭 {label}: {stats['matched']}/{stats['routed']} commands matched an intent, "
+              f"{stats['avg_routing_us']:.1f} µs per routing ({stats['intents']} intents, "
+              f"{stats['phrases']} phrases)")
+
+# Trigger table of the hybrid/offline control_system, used by the benchmark
+SYSTEM_INTENTS = [
+    # (name, phrases, priority, exclude)
+    ("shutdown", ["shutdown", "shut down", "turn off", "power off"], 0, ()),
+    ("restart", ["restart", "reboot"], 0, ()),
+    ("lock", ["lock", "lock screen", "lock computer"], 0, ()),
+    ("sleep", ["sleep", "hibernate"], 0, SLEEP_EXCLUDES),
+    ("brightness", ["brightness", "brighter", "darker", "dim"], 1, ()),
+    ("volume", ["volume", "sound"], 1, ()),
+    ("app", ["calculator", "notepad", "chrome", "firefox", "edge"], 1, ()),
+    ("system_info", ["system info", "pc info"], 0, ()),
+    ("time", ["time", "date"], 0, ()),
+    ("screenshot", ["screenshot"], 0, ()),
+    ("cancel", ["cancel"], 2, ()),
+]
+
+# Transcribed commands with the intent they should reach (None: not a system command)
+COMMAND_CORPUS = [
+    ("shutdown the computer", "shutdown"), ("please power off", "shutdown"),
+    ("turn off the volume", "volume"), ("turn off the sound", "volume"),
+    ("restart my pc", "restart"), ("reboot", "restart"),
+    ("lock the screen", "lock"), ("lock computer", "lock"),
+    ("what's on the clock", None), ("block that website", None),
+    ("put the computer to sleep", "sleep"), ("put the computer to sleep now", "sleep"), ("hibernate now", "sleep"),
+    ("go to sleep", None), ("how much sleep do i need", None), ("i can't sleep", None),
+    ("increase brightness", "brightness"), ("make the screen darker", "brightness"),
+    ("dim the screen", "brightness"), ("what is a dimension", None),
+    ("volume up", "volume"), ("make the volume quieter", "volume"), ("mute the sound", "volume"),
+    ("that sounds good", None),
+    ("open calculator", "app"), ("close chrome", "app"), ("launch firefox", "app"),
+    ("open microsoft edge", "app"), ("test my knowledge of history", None),
+    ("system info", "system_info"), ("show pc info", "system_info"),
+    ("what time is it", "time"), ("what's the date today", "time"),
+    ("sometimes i wonder about stars", None), ("update my settings", None),
+    ("take a screenshot", "screenshot"), ("cancel the shutdown", "cancel"),
+    ("tell me a joke", None), ("what is the capital of france", None),
+    ("who wrote hamlet", None), ("explain quantum computing", None),
+]
+
+def legacy_route(command_lower):
+    """The old linear any(x in command) chain, returning the branch it would take"""
+    if any(x in command_lower for x in ["shutdown", "turn off", "power off"]):
+        return "shutdown"
+    elif any(x in command_lower for x in ["restart", "reboot"]):
+        return "restart"
+    elif any(x in command_lower for x in ["lock", "lock screen", "lock computer"]):
+        return "lock"
+    elif any(x in command_lower for x in ["sleep", "hibernate"]):
+        return "sleep"
+    elif any(x in command_lower for x in ["brightness", "brighter", "darker", "dim"]):
+        return "brightness"
+    elif "volume" in command_lower or "sound" in command_lower:
+        return "volume"
+    elif any(x in command_lower for x in ["calculator", "notepad", "chrome", "firefox", "edge"]):
+        return "app"
+    elif "system info" in command_lower or "pc info" in command_lower:
+        return "system_info"
+    elif "time" in command_lower or "date" in command_lower:
+        return "time"
+    elif "screenshot" in command_lower:
+        return "screenshot"
+    elif "cancel" in command_lower:
+        return "cancel"
+    return None
+
+def benchmark_router(router=None, corpus=COMMAND_CORPUS, rounds=2000):
+    """Compare routing time and correctness of the router and the old if/elif chain"""
+    if router is None:
+        router = IntentRouter()
+        for name, phrases, priority, exclude in SYSTEM_INTENTS:
+            router.register(name, phrases, lambda command, name=name: name, priority, exclude)
+
+    print("🧭 Intent router benchmark")
+    print("=" * 70)
+    results = {}
+    for label, classify in (("if/elif chain", legacy_route), ("intent router", router.match)):
+        correct = 0
+        for command, expected in corpus:
+            got = classify(command)
+            if got == expected:
+                correct += 1
+            elif label == "intent router":
+                print(f"  ❌ '{command}': expected {expected}, got {got}")
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for command, _ in corpus:
+                classify(command)
+        per_command = (time.perf_counter() - start) / (rounds * len(corpus))
+        results[label] = {"correct": correct, "us_per_command": per_command * 1e6}
+
+    for label, result in results.items():
+        print(f"{label:14}: {result['correct']}/{len(corpus)} routed correctly, "
+              f"{result['us_per_command']:.2f} µs per command")
+    return results
+
+if __name__ == "__main__":
+    benchmark_router()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+💬 Myra LLM Streaming
+Speak Ollama answers sentence by sentence while the rest is still generating
+"""
+import json
+import re
+import time
+
+import requests
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) then whitespace, or a line break
+SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s+|\n+')
+SOFT_BREAK = re.compile(r'[,;:]\s+')
+MARKUP = re.compile(r'[*#`]+')
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "approx", "no"}
+
+def clean_for_speech(text):
+    """Drop markdown symbols the TTS engine would read out"""
+    return " ".join(MARKUP.sub("", text).split())
+
+class SentenceSegmenter:
+    """
+    Cuts a token stream into speakable sentences
+
+    A sentence is complete once its terminal punctuation is followed by
+    whitespace (so "3.5" and "e.g." are not split) or at a line break.
+    Fragments shorter than min_chars are joined to the next sentence; a run
+    longer than max_chars is cut at the last comma/semicolon so a long
+    first sentence does not hold back the audio.
+    """
+
+    def __init__(self, min_chars=12, max_chars=200):
+        """
+        Initialize the segmenter
+
+        Args:
+            min_chars: Shortest text worth handing to TTS on its own
+            max_chars: Force a break (at a comma if possible) past this length
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, token):
+        """Add a token; return the sentences it completed"""
+        self.buffer += token
+        sentences = []
+        while True:
+            cut = self._find_boundary()
+            if cut is None:
+                break
+            sentence = clean_for_speech(self.buffer[:cut])
+            self.buffer = self.buffer[cut:]
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self):
+        """Return whatever is left once the stream has ended"""
+        sentence = clean_for_speech(self.buffer)
+        self.buffer = ""
+        return sentence
+
+    def _find_boundary(self):
+        buffer = self.buffer
+        for match in SENTENCE_END.finditer(buffer):
+            text = buffer[:match.start()].strip()
+            if not text:
+                continue
+            if match.group().startswith("\n"):
+                return match.end()
+            if len(text) < self.min_chars:
+                continue
+            last_word = text.split()[-1].lower().rstrip(".")
+            if last_word in ABBREVIATIONS or last_word.isdigit() or (len(last_word) == 1 and last_word.isalpha()):
+                continue  # "Dr. Smith", "1. First", "J. Doe"
+            return match.end()
+
+        if len(buffer) > self.max_chars:
+            soft = [m.end() for m in SOFT_BREAK.finditer(buffer, 0, self.max_chars)]
+            if soft:
+                return soft[-1]
+            space = buffer.rfind(" ", 0, self.max_chars)
+            return space + 1 if space > 0 else self.max_chars
+        return None
+
+def iter_tokens(response):
+    """Yield response text tokens from a streaming Ollama /api/generate reply"""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        token = data.get("response", "")
+        if token:
+            yield token
+        if data.get("done", False):
+            break
+
+class StreamingResponder:
+    """
+    Asks Ollama with stream=True and speaks each sentence as soon as it is complete
+
+    Time to first spoken word becomes the time to generate the first
+    sentence instead of the whole answer. With a non-blocking speak (the
+    TTS worker) generation and speech fully overlap; with a blocking speak
+    the remaining tokens simply wait in the socket buffer.
+    """
+
+    def __init__(self, speak, url=OLLAMA_URL, timeout=30, client=None,
+                 min_chars=12, max_chars=200, on_token=None):
+        """
+        Initialize the responder
+
+        Args:
+            speak: Function(sentence) that speaks (or queues) one sentence
+            url: Ollama generate endpoint (ignored when a client is given)
+            timeout: Seconds to wait for the connection and between tokens
+            client: OllamaClient whose pooled session to use (None uses requests.post)
+            min_chars: Passed to SentenceSegmenter
+            max_chars: Passed to SentenceSegmenter
+            on_token: Optional function(token) for live printing
+        """
+        self.speak = speak
+        self.url = url
+        self.timeout = timeout
+        self.client = client
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.on_token = on_token
+
+        # Statistics
+        self.requests = 0
+        self.sentences = 0
+        self.first_token_seconds = 0.0
+        self.first_sentence_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def ask(self, payload):
+        """
+        Stream one answer into speech
+
+        Args:
+            payload: /api/generate JSON body (stream is forced on)
+
+        Returns:
+            str: The full answer text (already spoken)
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors, timeouts or a non-200 reply
+        """
+        start = time.perf_counter()
+        payload = dict(payload, stream=True)
+        if self.client is not None:
+            response = self.client.generate(payload, stream=True, timeout=self.timeout)
+        else:
+            response = requests.post(self.url, json=payload, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+
+        segmenter = SentenceSegmenter(self.min_chars, self.max_chars)
+        parts = []
+        first_token = first_sentence = None
+        with response:
+            for token in iter_tokens(response):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(token)
+                if self.on_token:
+                    self.on_token(token)
+                for sentence in segmenter.feed(token):
+                    if first_sentence is None:
+                        first_sentence = time.perf_counter() - start
+                    self._say(sentence)
+
+        tail = segmenter.flush()
+        if tail:
+            if first_sentence is None:
+                first_sentence = time.perf_counter() - start
+            self._say(tail)
+
+        total = time.perf_counter() - start
+        self.requests += 1
+        self.first_token_seconds += first_token if first_token is not None else total
+        self.first_sentence_seconds += first_sentence if first_sentence is not None else total
+        self.total_seconds += total
+        return "".join(parts).strip()
+
+    def _say(self, sentence):
+        self.sentences += 1
+        self.speak(sentence)
+
+    def get_stats(self):
+        """Return average time to first token, first sentence and full answer"""
+        n = self.requests
+        return {
+            "requests": n,
+            "sentences": self.sentences,
+            "avg_first_token_ms": self.first_token_seconds / n * 1000 if n else 0.0,
+            "avg_first_sentence_ms": self.first_sentence_seconds / n * 1000 if n else 0.0,
+            "avg_total_ms": self.total_seconds / n * 1000 if n else 0.0
+        }
+
+    def print_stats(self, label="Streaming answers"):
+        """Print how much sooner speech started than the full answer was ready"""
+        stats = self.get_stats()
+        print(f"💬 {label}: {stats['requests']} answers, {stats['sentences']} sentences, "
+              f"first token {stats['avg_first_token_ms']:.0f} ms, "
+              f"first sentence spoken after {stats['avg_first_sentence_ms']:.0f} ms "
+              f"vs full answer {stats['avg_total_ms']:.0f} ms")
+
+def benchmark_segmenter(text=None, token_delay=0.03):
+    """Replay an answer word by word and compare first-sentence time with full generation time"""
+    text = text or ("Sure! The capital of Australia is Canberra, not Sydney as many people think. "
+                    "It was chosen in 1908 as a compromise between Sydney and Melbourne. "
+                    "Parliament moved there in 1927, e.g. after the temporary stay in Melbourne.")
+    tokens = re.findall(r'\S+\s*', text)
+
+    print("💬 Sentence streaming benchmark")
+    print("=" * 60)
+    segmenter = SentenceSegmenter()
+    start = time.perf_counter()
+    first_sentence = None
+    for token in tokens:
+        time.sleep(token_delay)  # Simulated generation speed
+        for sentence in segmenter.feed(token):
+            elapsed = time.perf_counter() - start
+            first_sentence = first_sentence or elapsed
+            print(f"  {elapsed * 1000:6.0f} ms  🗣️ {sentence}")
+    tail = segmenter.flush()
+    total = time.perf_counter() - start
+    if tail:
+        first_sentence = first_sentence or total
+        print(f"  {total * 1000:6.0f} ms  🗣️ {tail}")
+
+    print(f"Time to first spoken sentence: {first_sentence * 1000:.0f} ms "
+          f"(was {total * 1000:.0f} ms for the full answer)")
+    return first_sentence, total
+
+if __name__ == "__main__":
+    benchmark_segmenter()
@@ -14,6 +14,9 @@ import threading
 import queue
 import socket
 import numpy as np
+from myra_audio_dsp import AudioEnhancer
+from myra_audio_buffer import AudioRingBuffer, CallbackStats
+from myra_wake_detector import WakeTokenStream
 
 # Speech recognition - optimized for distance
 try:
@@ -54,6 +57,9 @@ NOISE_GATE_THRESHOLD = 200  # Lower threshold for distant sounds
 VOICE_ACTIVITY_THRESHOLD = 300
 ENERGY_AMPLIFICATION = 2.5  # Amplify quiet distant sounds
 SILENCE_TIMEOUT = 3.0  # Longer timeout for distant speech
+NOISE_GATE_HOLD = 160  # Samples (10 ms) the gate stays open after speech
+COMPRESSION_SCALE = 16384.0
+RAW_BUFFER_FRAMES = 32  # Raw callback frames buffered ahead of the processing thread
 
 audio = pyaudio.PyAudio()
 print("✅ Long-distance speech recognition ready")
@@ -77,8 +83,9 @@ WAKE_WORDS = ["myra", "hey myra", "hello myra", "hi myra", "wake up myra"]
 MEMORY_FILE = "myra_memory.json"
 is_awake = False
 
-# Enhanced audio processing queue
-audio_queue = queue.Queue(maxsize=100)  # Larger queue for processing
+# Enhanced audio ring buffer - preallocated, O(1) clear, counts dropped frames
+# (frames are read as memoryviews; Vosk's cffi binding still needs bytes())
+audio_buffer = AudioRingBuffer(capacity=100, frame_bytes=CHUNK * 2)
 processed_queue = queue.Queue()
 
 def speak(text):
@@ -102,29 +109,15 @@ def check_internet():
     except OSError:
         return False
 
-def enhance_audio_for_distance(audio_data):
-    """Apply audio enhancement for distant speech detection"""
-    try:
-        # Convert to numpy array for processing
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-        
-        # Apply noise gate - remove very quiet background noise
-        audio_np = np.where(np.abs(audio_np) > NOISE_GATE_THRESHOLD, audio_np, 0)
-        
-        # Amplify remaining audio for distant voices
-        audio_np = audio_np * ENERGY_AMPLIFICATION
-        
-        # Apply dynamic range compression to make quiet sounds louder
-        audio_np = np.tanh(audio_np / 16384.0) * 16384.0
-        
-        # Ensure we don't clip
-        audio_np = np.clip(audio_np, -32767, 32767)
-        
-        return audio_np.astype(np.int16).tobytes()
-        
-    except Exception as e:
-        print(f"⚠️ Audio enhancement error: {e}")
-        return audio_data
+def create_audio_enhancer():
+    """Build the streaming enhancement chain for distant speech detection"""
+    return AudioEnhancer(
+        noise_gate_threshold=NOISE_GATE_THRESHOLD,  # Remove very quiet background noise
+        amplification=ENERGY_AMPLIFICATION,         # Amplify remaining audio for distant voices
+        compression_scale=COMPRESSION_SCALE,        # Make quiet sounds louder without clipping
+        gate_hold_samples=NOISE_GATE_HOLD,
+        chunk_size=CHUNK
+    )
 
 def get_microphone_with_best_range():
     """Find the best microphone for long-distance listening"""
@@ -171,6 +164,14 @@ class LongDistanceVoskListener:
         self.listening = False
         self.partial_result = ""
         self.last_activity = 0
+        self.enhancer = create_audio_enhancer()
+        self.wake_stream = WakeTokenStream(WAKE_WORDS)
+        
+        # Raw frames from the PyAudio callback, enhanced on a worker thread
+        self.raw_buffer = AudioRingBuffer(capacity=RAW_BUFFER_FRAMES, frame_bytes=CHUNK * 2)
+        self.callback_stats = CallbackStats(overflow_flag=pyaudio.paInputOverflow)
+        self.processing_thread = None
+        self.running = False
         
     def start_stream(self):
         """Start enhanced audio stream for long-distance"""
@@ -184,6 +185,9 @@ class LongDistanceVoskListener:
                 frames_per_buffer=CHUNK,
                 stream_callback=self.audio_callback
             )
+            self.running = True
+            self.processing_thread = threading.Thread(target=self.process_audio_loop, daemon=True)
+            self.processing_thread.start()
             self.stream.start_stream()
             print("🎙️ Long-distance audio stream active")
         except Exception as e:
@@ -191,29 +195,45 @@ class LongDistanceVoskListener:
             raise
     
     def audio_callback(self, in_data, frame_count, time_info, status):
-        """Enhanced audio callback with distance processing"""
+        """Realtime callback - only copies raw frames into the ring buffer"""
+        started = time.perf_counter()
         if self.listening:
+            self.raw_buffer.write(in_data)
+        self.callback_stats.record(started, status)
+        return (in_data, pyaudio.paContinue)
+    
+    def process_audio_loop(self):
+        """Worker thread: enhancement and voice activity detection off the audio thread"""
+        while self.running:
+            in_data = self.raw_buffer.read(timeout=0.1)
+            if in_data is None:
+                continue
+            
             # Apply audio enhancement before queueing
-            enhanced_audio = enhance_audio_for_distance(in_data)
+            enhanced_audio = self.enhancer.process(in_data)
             
             # Check for voice activity
-            audio_np = np.frombuffer(enhanced_audio, dtype=np.int16)
-            energy = np.sqrt(np.mean(audio_np.astype(np.float32)**2))
+            energy = self.enhancer.last_energy
             
             if energy > VOICE_ACTIVITY_THRESHOLD:
                 self.last_activity = time.time()
-                audio_queue.put(enhanced_audio)
+                audio_buffer.write(enhanced_audio)
             elif time.time() - self.last_activity < SILENCE_TIMEOUT:
                 # Keep processing for a bit after voice stops
-                audio_queue.put(enhanced_audio)
-        
-        return (in_data, pyaudio.paContinue)
+                audio_buffer.write(enhanced_audio)
     
     def stop_stream(self):
         """Stop audio stream"""
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+        self.running = False
+        if self.processing_thread:
+            self.processing_thread.join(timeout=1.0)
+        self.callback_stats.print_stats("Long-distance audio callback")
+        self.raw_buffer.print_stats("Raw callback buffer")
+        audio_buffer.print_stats("Enhanced audio buffer")
+        self.enhancer.print_stage_timings()
     
     def listen_for_wake_word(self, timeout=10):
         """Enhanced wake word detection for long distance"""
@@ -225,39 +245,31 @@ class LongDistanceVoskListener:
         self.last_activity = time.time()
         
         # Clear old audio data
-        while not audio_queue.empty():
-            try:
-                audio_queue.get_nowait()
-            except:
-                break
+        audio_buffer.clear()
         
-        accumulated_text = ""
+        # Only words that are new since the last result get checked
+        self.wake_stream.reset()
         
         while time.time() - start_time < timeout:
             try:
                 # Get enhanced audio data
-                data = audio_queue.get(timeout=0.5)
+                data = audio_buffer.read(timeout=0.5)
+                if data is None:
+                    continue
                 
-                if rec.AcceptWaveform(data):
+                if rec.AcceptWaveform(bytes(data)):
                     result = json.loads(rec.Result())
                     text = result.get('text', '').strip()
                     
                     if text:
-                        accumulated_text += " " + text
                         print(f"🗣️ Heard: {text}")
-                        print(f"🔍 Checking: '{accumulated_text.strip()}'")
-                        
-                        # Check for wake words in accumulated text
-                        full_text = accumulated_text.lower().strip()
-                        for wake_word in WAKE_WORDS:
-                            if wake_word in full_text:
-                                print(f"✅ Wake word detected: {wake_word}")
-                                self.listening = False
-                                return True
                         
-                        # Reset if text gets too long without wake word
-                        if len(accumulated_text.split()) > 10:
-                            accumulated_text = " ".join(accumulated_text.split()[-5:])
+                        # Check the new words (phrases may continue from the last result)
+                        wake_word = self.wake_stream.feed_final(text)
+                        if wake_word:
+                            print(f"✅ Wake word detected: {wake_word}")
+                            self.listening = False
+                            return True
                 
                 else:
                     # Process partial results for immediate feedback
@@ -268,15 +280,13 @@ class LongDistanceVoskListener:
                         self.partial_result = partial_text
                         print(f"🎧 Hearing: {partial_text}")
                         
-                        # Quick check on partial results too
-                        for wake_word in WAKE_WORDS:
-                            if wake_word in partial_text.lower():
-                                print(f"✅ Wake word detected (partial): {wake_word}")
-                                self.listening = False
-                                return True
+                        # Quick check on the words the partial added
+                        wake_word = self.wake_stream.feed_partial(partial_text)
+                        if wake_word:
+                            print(f"✅ Wake word detected (partial): {wake_word}")
+                            self.listening = False
+                            return True
                                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"⚠️ Processing error: {e}")
                 continue
@@ -296,17 +306,21 @@ class LongDistanceVoskListener:
         command_parts = []
         
         # Clear queue
-        while not audio_queue.empty():
-            try:
-                audio_queue.get_nowait()
-            except:
-                break
+        audio_buffer.clear()
         
         while time.time() - start_time < timeout:
             try:
-                data = audio_queue.get(timeout=1.0)
+                data = audio_buffer.read(timeout=1.0)
+                if data is None:
+                    # Check if we have enough for a command
+                    if command_parts:
+                        full_command = ' '.join(command_parts)
+                        if len(full_command.split()) >= 1:
+                            self.listening = False
+                            return full_command
+                    continue
                 
-                if rec.AcceptWaveform(data):
+                if rec.AcceptWaveform(bytes(data)):
                     result = json.loads(rec.Result())
                     text = result.get('text', '').strip()
                     
@@ -330,14 +344,6 @@ class LongDistanceVoskListener:
                         self.partial_result = partial_text
                         print(f"🎧 Hearing: {partial_text}")
                         
-            except queue.Empty:
-                # Check if we have enough for a command
-                if command_parts:
-                    full_command = ' '.join(command_parts)
-                    if len(full_command.split()) >= 1:
-                        self.listening = False
-                        return full_command
-                continue
             except Exception as e:
                 print(f"⚠️ Command processing error: {e}")
                 continue
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+🎙️ Myra Persistent Microphone
+One long-lived input stream with a background noise-floor tracker
+"""
+import math
+import threading
+import time
+from collections import deque
+import numpy as np
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+    _AudioSource = sr.AudioSource
+except ImportError:
+    SR_AVAILABLE = False
+    _AudioSource = object
+
+from myra_audio_buffer import AudioRingBuffer
+
+class _CapturedStream:
+    """The .stream speech_recognition reads from while a listen is in progress"""
+
+    def __init__(self, microphone):
+        self.microphone = microphone
+
+    def read(self, size):
+        return self.microphone._read_frame()
+
+    def close(self):
+        pass
+
+class PersistentMicrophone(_AudioSource):
+    """
+    speech_recognition audio source that never closes between listens
+
+    sr.Microphone() opens a fresh PyAudio stream for every listen and the
+    callers then spend 0.3-1 s in adjust_for_ambient_noise() before the
+    first frame is even looked at. This source opens the device once,
+    calibrates once, and keeps a capture thread reading it. While nobody is
+    listening the thread tracks the room's noise floor and keeps the
+    energy_threshold of every attached recognizer up to date, so entering
+    the source starts capturing immediately. A short pre-roll of the most
+    recent frames is replayed on entry so a word that started just before
+    the listen is not clipped.
+
+    Usage is the same as sr.Microphone:
+        with microphone as source:
+            audio = recognizer.listen(source, timeout=10)
+    """
+
+    def __init__(self, device_index=None, sample_rate=None, chunk_size=1024,
+                 noise_ratio=1.5, min_threshold=100.0, max_threshold=4000.0,
+                 noise_adapt=0.05, preroll_ms=300, calibrate_seconds=0.5):
+        """
+        Initialize the microphone (the device is opened on first use)
+
+        Args:
+            device_index: PyAudio input device (None for the default microphone)
+            sample_rate: Sample rate in Hz (None for the device default)
+            chunk_size: Frames per buffer
+            noise_ratio: energy_threshold = noise floor * noise_ratio
+            min_threshold: Lowest energy_threshold handed to recognizers
+            max_threshold: Highest energy_threshold handed to recognizers
+            noise_adapt: Noise floor smoothing factor
+            preroll_ms: Audio from before the listen that is replayed on entry
+            calibrate_seconds: Ambient audio measured once before the first listen
+        """
+        if not SR_AVAILABLE:
+            raise ImportError("speech_recognition not available - install with: pip install SpeechRecognition pyaudio")
+
+        self._mic = sr.Microphone(device_index=device_index, sample_rate=sample_rate,
+                                  chunk_size=chunk_size)
+        self.device_index = device_index
+        self.format = self._mic.format
+        self.SAMPLE_WIDTH = self._mic.SAMPLE_WIDTH
+        self.SAMPLE_RATE = self._mic.SAMPLE_RATE
+        self.CHUNK = self._mic.CHUNK
+        self.stream = None  # Only set while a listen is in progress
+
+        self.noise_ratio = noise_ratio
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.noise_adapt = noise_adapt
+        self.calibrate_seconds = calibrate_seconds
+
+        frame_ms = self.CHUNK * 1000.0 / self.SAMPLE_RATE
+        self.buffer = AudioRingBuffer(capacity=256, frame_bytes=self.CHUNK * self.SAMPLE_WIDTH)
+        self._preroll = deque(maxlen=max(1, math.ceil(preroll_ms / frame_ms)))
+        self._recognizers = []
+        self._lock = threading.Lock()
+        self._listen_lock = threading.Lock()
+        self._calibrated = threading.Event()
+        self._thread = None
+        self._running = False
+        self.capturing = False
+
+        self.noise_floor = 0.0
+        self.energy_threshold = min_threshold
+        self._entered_at = None
+
+        # Statistics
+        self.frames_seen = 0
+        self.listens = 0
+        self.first_frame_seconds = 0.0
+        self.max_first_frame_seconds = 0.0
+        self.calibration_seconds = 0.0
+
+    def attach(self, recognizer):
+        """Keep recognizer.energy_threshold in step with the tracked noise floor"""
+        if recognizer not in self._recognizers:
+            self._recognizers.append(recognizer)
+            if self._calibrated.is_set():
+                recognizer.energy_threshold = self.energy_threshold
+        return recognizer
+
+    def start(self):
+        """Open the device, start the capture thread and wait for the one-time calibration"""
+        if self._running:
+            return self
+        started = time.perf_counter()
+        self._mic.__enter__()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._calibrated.wait(self.calibrate_seconds + 2.0)
+        self.calibration_seconds = time.perf_counter() - started
+        return self
+
+    def _run(self):
+        calibration_frames = max(1, math.ceil(self.calibrate_seconds * self.SAMPLE_RATE / self.CHUNK))
+        while self._running:
+            try:
+                data = self._mic.stream.read(self.CHUNK)
+            except Exception as e:
+                if self._running:
+                    print(f"⚠️ Microphone read error: {e}")
+                    time.sleep(0.1)
+                continue
+
+            self.frames_seen += 1
+            with self._lock:
+                capturing = self.capturing
+                if capturing:
+                    self.buffer.write(data)
+                else:
+                    self._preroll.append(data)
+
+            samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+            energy = float(np.sqrt(np.dot(samples, samples) / len(samples))) if len(samples) else 0.0
+
+            # While idle every frame is room noise; during a listen only quiet frames are
+            if not capturing or energy < self.energy_threshold:
+                self._update_noise_floor(energy)
+            if not capturing and self.frames_seen >= calibration_frames:
+                self._publish_threshold()
+                self._calibrated.set()
+
+    def _update_noise_floor(self, energy):
+        if self.noise_floor == 0.0:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += self.noise_adapt * (energy - self.noise_floor)
+        self.energy_threshold = min(self.max_threshold,
+                                    max(self.min_threshold, self.noise_floor * self.noise_ratio))
+
+    def _publish_threshold(self):
+        # Not changed mid-listen: speech_recognition compares every frame against it
+        for recognizer in self._recognizers:
+            recognizer.energy_threshold = self.energy_threshold
+
+    def __enter__(self):
+        self.start()
+        self._listen_lock.acquire()
+        self.listens += 1
+        with self._lock:
+            self.buffer.clear()
+            for frame in self._preroll:
+                self.buffer.write(frame)
+            self._preroll.clear()
+            self.capturing = True
+        self._publish_threshold()
+        self._entered_at = time.perf_counter()
+        self.stream = _CapturedStream(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._lock:
+            self.capturing = False
+        self.stream = None
+        self._listen_lock.release()
+
+    def _read_frame(self):
+        while self._running:
+            data = self.buffer.read(timeout=0.5)
+            if data is None:
+                continue
+            if self._entered_at is not None:
+                waited = time.perf_counter() - self._entered_at
+                self._entered_at = None
+                self.first_frame_seconds += waited
+                self.max_first_frame_seconds = max(self.max_first_frame_seconds, waited)
+            return bytes(data)
+        return b""
+
+    def close(self):
+        """Stop the capture thread and release the device"""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._mic.__exit__(None, None, None)
+        self.print_stats()
+
+    def get_stats(self):
+        """Return time-to-first-frame and noise tracking figures"""
+        return {
+            "listens": self.listens,
+            "avg_first_frame_ms": self.first_frame_seconds / self.listens * 1000 if self.listens else 0.0,
+            "max_first_frame_ms": self.max_first_frame_seconds * 1000,
+            "calibration_ms": self.calibration_seconds * 1000,
+            "noise_floor": self.noise_floor,
+            "energy_threshold": self.energy_threshold,
+            "frames_seen": self.frames_seen,
+            "overruns": self.buffer.overruns
+        }
+
+    def print_stats(self, label="Persistent microphone"):
+        """Print how quickly listens got their first frame"""
+        stats = self.get_stats()
+        print(f"🎙️ {label}: {stats['listens']} listens, first frame after "
+              f"{stats['avg_first_frame_ms']:.1f} ms avg ({stats['max_first_frame_ms']:.1f} ms max), "
+              f"calibrated once in {stats['calibration_ms']:.0f} ms, noise floor {stats['noise_floor']:.0f} "
+              f"-> threshold {stats['energy_threshold']:.0f}, {stats['overruns']} frames dropped")
+
+_microphones = {}
+
+def get_microphone(device_index=None):
+    """Shared persistent microphone for an input device (opened on first listen)"""
+    if device_index not in _microphones:
+        _microphones[device_index] = PersistentMicrophone(device_index=device_index)
+    return _microphones[device_index]
+
+def benchmark_time_to_first_frame(listens=5, device_index=None):
+    """
+    Compare time-to-first-captured-frame: a fresh sr.Microphone plus
+    adjust_for_ambient_noise(0.3) per listen versus the persistent source
+    """
+    print("🎙️ Time-to-first-frame benchmark (needs a real microphone)")
+    print("=" * 60)
+    recognizer = sr.Recognizer()
+
+    legacy = []
+    for _ in range(listens):
+        start = time.perf_counter()
+        with sr.Microphone(device_index=device_index) as source:
+            recognizer.adjust_for_ambient_noise(source, duration=0.3)
+            source.stream.read(source.CHUNK)
+        legacy.append(time.perf_counter() - start)
+
+    microphone = PersistentMicrophone(device_index=device_index)
+    microphone.attach(recognizer)
+    microphone.start()
+    persistent = []
+    for _ in range(listens):
+        start = time.perf_counter()
+        with microphone as source:
+            source.stream.read(source.CHUNK)
+        persistent.append(time.perf_counter() - start)
+        time.sleep(0.2)
+
+    legacy_ms = sum(legacy) / len(legacy) * 1000
+    persistent_ms = sum(persistent) / len(persistent) * 1000
+    print(f"Per-listen sr.Microphone + calibration: {legacy_ms:7.1f} ms to first frame")
+    print(f"Persistent microphone:                  {persistent_ms:7.1f} ms to first frame "
+          f"({legacy_ms / persistent_ms if persistent_ms else float('inf'):.0f}x faster)")
+    print(f"Tracked energy_threshold: {recognizer.energy_threshold:.0f}")
+    microphone.close()
+    return {"legacy_ms": legacy_ms, "persistent_ms": persistent_ms}
+
+if __name__ == "__main__":
+    benchmark_time_to_first_frame()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+🧭 Myra Model Registry
+Background, cached Ollama model discovery so nothing blocks at import time
+"""
+import json
+import os
+import threading
+import time
+
+import requests
+
+from myra_ollama_client import get_client
+
+PREFERRED_MODELS = [
+    'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
+    'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
+]
+MODEL_CACHE_FILE = "myra_model_cache.json"
+
+def choose_model(models, preferred=PREFERRED_MODELS):
+    """Pick the first preferred model that is installed, else the first installed one"""
+    for name in preferred:
+        if name in models:
+            return name
+    return models[0] if models else None
+
+class ModelResolver:
+    """
+    Lazily resolved, cached choice of Ollama model
+
+    The last model that worked is loaded from disk in the constructor, so
+    get() answers instantly after a restart. A background thread asks the
+    server for the installed models (with a timeout), persists the choice,
+    and repeats every ttl seconds to notice models being pulled or removed.
+    A failed lookup keeps the last known model. Only a first run with no
+    cache file has to wait, and only callers that pass wait= to get().
+    """
+
+    def __init__(self, client=None, cache_file=MODEL_CACHE_FILE, ttl=300.0, timeout=2.0,
+                 preferred=None):
+        """
+        Initialize the resolver (call start() to begin background discovery)
+
+        Args:
+            client: OllamaClient used for /api/tags (defaults to the shared client)
+            cache_file: JSON file holding the last resolved model
+            ttl: Seconds between background refreshes
+            timeout: Seconds allowed for one /api/tags request
+            preferred: Model names in order of preference
+        """
+        self.client = client or get_client()
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.timeout = timeout
+        self.preferred = list(preferred or PREFERRED_MODELS)
+
+        self.model = None
+        self.models = []
+        self.resolved_at = None
+        self.source = None
+        self._created = time.perf_counter()
+        self._resolved = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+
+        # Statistics
+        self.ready_seconds = None
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.failures = 0
+
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("model"):
+            self.model = cached["model"]
+            self.models = cached.get("models", [])
+            self.resolved_at = cached.get("resolved_at")
+            self.source = "disk"
+            self._mark_ready()
+
+    def _save_cache(self):
+        data = {"model": self.model, "models": self.models, "resolved_at": self.resolved_at}
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ Could not save model cache: {e}")
+
+    def _mark_ready(self):
+        if self.ready_seconds is None:
+            self.ready_seconds = time.perf_counter() - self._created
+        self._resolved.set()
+
+    def start(self):
+        """Begin background discovery and TTL refreshes (no-op if running)"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="myra-models")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._running = False
+        self._wake.set()
+
+    def _run(self):
+        while self._running:
+            self.refresh()
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+
+    def refresh(self):
+        """
+        Ask the server for the installed models now
+
+        Returns:
+            str: The chosen model (the last known one if the server can't be reached)
+        """
+        start = time.perf_counter()
+        try:
+            models = self.client.list_models(timeout=self.timeout)
+        except (requests.exceptions.RequestException, ValueError):
+            self.failures += 1
+            if self.source is None:
+                self.source = "unavailable"
+            self._resolved.set()  # Let waiters give up instead of timing out
+            return self.model
+        finally:
+            self.lookups += 1
+            self.lookup_seconds += time.perf_counter() - start
+
+        model = choose_model(models, self.preferred)
+        changed = model != self.model
+        self.models = models
+        self.model = model
+        self.resolved_at = time.time()
+        self.source = "server"
+
+        if changed:
+            if model:
+                print(f"✅ Using AI model: {model}")
+            else:
+                print("⚠️  No Ollama models found. AI features will be limited.")
+        self._save_cache()
+        if model:
+            self._mark_ready()
+        else:
+            self._resolved.set()
+        return model
+
+    def get(self, wait=0.0):
+        """
+        Current model name, or None if none is known yet
+
+        Args:
+            wait: Seconds to wait for the first lookup when nothing is cached
+        """
+        if self.model is None and wait:
+            self.start()
+            self._resolved.wait(wait)
+        elif self.resolved_at is None or time.time() - self.resolved_at > self.ttl:
+            self._wake.set()  # Stale - refresh in the background
+        return self.model
+
+    def get_stats(self):
+        """Return how quickly a model was known and lookup cost"""
+        return {
+            "model": self.model,
+            "source": self.source,
+            "ready_ms": self.ready_seconds * 1000 if self.ready_seconds is not None else None,
+            "lookups": self.lookups,
+            "avg_lookup_ms": self.lookup_seconds / self.lookups * 1000 if self.lookups else 0.0,
+            "failures": self.failures
+        }
+
+    def print_stats(self, label="Model registry"):
+        """Print time-to-ready and lookup counts"""
+        stats = self.get_stats()
+        ready = f"{stats['ready_ms']:.1f} ms" if stats['ready_ms'] is not None else "not ready"
+        print(f"🧭 {label}: {stats['model'] or 'no model'} (from {stats['source']}), ready after {ready}, "
+              f"{stats['lookups']} lookups (avg {stats['avg_lookup_ms']:.0f} ms), {stats['failures']} failed")
+
+_resolver = None
+
+def get_model_resolver():
+    """Shared, already started resolver for the whole process"""
+    global _resolver
+    if _resolver is None:
+        _resolver = ModelResolver().start()
+    return _resolver
+
+if __name__ == "__main__":
+    # Old behaviour: a blocking /api/tags call before anything else can start
+    start = time.perf_counter()
+    try:
+        blocking_model = choose_model(get_client().list_models(timeout=30))
+    except requests.exceptions.RequestException:
+        blocking_model = None
+    blocking_ms = (time.perf_counter() - start) * 1000
+    print(f"Blocking select_model(): {blocking_model} after {blocking_ms:.1f} ms")
+
+    start = time.perf_counter()
+    resolver = ModelResolver().start()
+    model = resolver.get()
+    print(f"ModelResolver.get():    {model} after {(time.perf_counter() - start) * 1000:.3f} ms "
+          f"({'cached on disk' if model else 'run again once the cache file exists'})")
+    resolver.get(wait=3.0)
+    resolver.print_stats()
@@ -20,8 +20,12 @@ import fnmatch
 import random
 
 # Offline speech recognition
-import vosk
-import pyaudio
+from myra_vosk_service import VoskRecognizerService, WAKE_PHASE, COMMAND_PHASE
+from myra_wake_detector import wake_detector
+from myra_model_registry import get_model_resolver
+from myra_response_cache import ResponseCache
+from myra_intent_router import IntentRouter, SLEEP_EXCLUDES, contains_phrase
+from myra_shell_host import get_system_actions, VK_VOLUME_MUTE, VK_VOLUME_UP, VK_VOLUME_DOWN
 
 # Text to speech
 import pyttsx3
@@ -54,20 +58,12 @@ if not os.path.exists(MODEL_PATH):
     print("❌ Vosk model not found. Please run download_vosk_model.py first")
     exit(1)
 
-# Initialize Vosk
-model = vosk.Model(MODEL_PATH)
-rec = vosk.KaldiRecognizer(model, 16000)
-rec.SetWords(True)
-
-# Audio setup
-audio = pyaudio.PyAudio()
+# Initialize Vosk - one model and one open stream for the whole session
+vosk_service = VoskRecognizerService(MODEL_PATH, wake_phrases=wake_detector.get_phrases())
 
 # Ollama setup (local AI)
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
-# Wake words
-WAKE_WORDS = ["hello myra", "hey myra", "hi myra", "myra", "okay myra"]
-
 MEMORY_FILE = "myra_memory.json"
 
 # Load memory
@@ -105,39 +101,8 @@ def forget_memory(key):
 # Global state
 listening_active = False
 
-def get_available_models():
-    """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
-        if response.status_code == 200:
-            models = response.json()
-            return [model['name'] for model in models.get('models', [])]
-        return []
-    except:
-        return []
-
-def select_model():
-    """Automatically select the best available model"""
-    models = get_available_models()
-    if not models:
-        print("⚠️  No Ollama models found. AI features will be limited.")
-        return None
-    
-    preferred_models = [
-        'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
-        'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
-    ]
-    
-    for preferred in preferred_models:
-        if preferred in models:
-            print(f"✅ Using AI model: {preferred}")
-            return preferred
-    
-    selected = models[0]
-    print(f"✅ Using AI model: {selected}")
-    return selected
-
-MODEL_NAME = select_model()
+# Resolved in the background; the last known model is loaded from disk instantly
+model_resolver = get_model_resolver()
 
 def speak(text):
     """Text to speech function"""
@@ -145,55 +110,20 @@ def speak(text):
     engine.say(text)
     engine.runAndWait()
 
-def listen_offline():
+def listen_offline(phase=COMMAND_PHASE):
     """Listen using Vosk offline speech recognition"""
-    stream = audio.open(format=pyaudio.paInt16,
-                       channels=1,
-                       rate=16000,
-                       input=True,
-                       frames_per_buffer=8000)
-    
-    stream.start_stream()
-    
     try:
-        while True:
-            data = stream.read(4000, exception_on_overflow=False)
-            
-            if rec.AcceptWaveform(data):
-                result = json.loads(rec.Result())
-                text = result.get('text', '').strip()
-                if text:
-                    return text
-            else:
-                partial = json.loads(rec.PartialResult())
-                # You can use partial results for real-time feedback if needed
-                
+        return vosk_service.listen(phase=phase, timeout=None)
     except Exception as e:
         print(f"Error in speech recognition: {e}")
         return ""
-    finally:
-        stream.stop_stream()
-        stream.close()
 
 def check_wake_word(command):
     """Check if wake word is detected"""
-    command_lower = command.lower()
-    
-    # Direct matches
-    if any(wake_word in command_lower for wake_word in WAKE_WORDS):
-        return True
-        
-    # Handle common misrecognitions
-    misrecognitions = {
-        "mirror": "myra", "maria": "myra", "mira": "myra", "maya": "myra"
-    }
-    
-    for misrecognition, correct in misrecognitions.items():
-        if misrecognition in command_lower:
-            print(f"🔧 Corrected '{misrecognition}' to '{correct}'")
-            return True
-            
-    return False
+    detected, label, score = wake_detector.detect(command)
+    if detected and score < 1.0:
+        print(f"🔧 Corrected to {label}")
+    return detected
 
 def remember_conversation(statement):
     """Decide whether to remember something from the conversation"""
@@ -290,19 +220,13 @@ def adjust_brightness(action):
         if percentage_match:
             percentage = int(percentage_match.group(1))
             percentage = max(10, min(100, percentage))
-            subprocess.run(["powershell", "-Command", 
-                          f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {percentage})"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(percentage)
             return f"Brightness set to {percentage} percent."
         elif any(word in action_lower for word in increase_words):
-            subprocess.run(["powershell", "-Command", 
-                          "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, 100)"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(100)
             return "Brightness increased to maximum."
         elif any(word in action_lower for word in decrease_words):
-            subprocess.run(["powershell", "-Command", 
-                          "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, 30)"], 
-                          check=True, capture_output=True)
+            system_actions.set_brightness(30)
             return "Brightness decreased to 30 percent."
         else:
             return "I can make your screen brighter or darker. What would you prefer?"
@@ -310,127 +234,139 @@ def adjust_brightness(action):
     except Exception as e:
         return "Sorry, I couldn't adjust the brightness. This might require administrator privileges."
 
+# === System Commands ===
+# Every trigger phrase is compiled into one matcher. Device intents outrank the
+# bare power verbs, so "turn off the sound" mutes instead of shutting down, and
+# "cancel the shutdown" aborts it instead of starting one.
+system_router = IntentRouter()
+
+# Volume and brightness go through one long-lived shell host (or direct Win32
+# calls); the five volume steps are a single call instead of five PowerShell launches
+system_actions = get_system_actions()
+system_actions.start(background=True)
+VOLUME_STEPS = 5
+
+@system_router.intent("shutdown", ["shutdown", "shut down", "turn off", "power off"])
+def shutdown_computer(command_lower):
+    speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Shutting down now.")
+    try:
+        os.system("shutdown /s /t 5")
+        return "Computer is shutting down."
+    except:
+        return "Sorry, I couldn't shut down the computer."
+
+@system_router.intent("restart", ["restart", "reboot"])
+def restart_computer(command_lower):
+    speak("Restarting the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Restarting now.")
+    try:
+        os.system("shutdown /r /t 5")
+        return "Computer is restarting."
+    except:
+        return "Sorry, I couldn't restart the computer."
+
+@system_router.intent("lock", ["lock", "lock screen", "lock computer"])
+def lock_computer(command_lower):
+    try:
+        os.system("rundll32.exe user32.dll, LockWorkStation")
+        return "Screen locked."
+    except:
+        return "Sorry, I couldn't lock the screen."
+
+@system_router.intent("sleep", ["sleep", "hibernate"], exclude=SLEEP_EXCLUDES)
+def sleep_computer(command_lower):
+    try:
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+        return "Computer is going to sleep."
+    except:
+        return "Sorry, I couldn't put the computer to sleep."
+
+@system_router.intent("brightness", ["brightness", "brighter", "darker", "dim"], priority=1)
+def brightness_command(command_lower):
+    return adjust_brightness(command_lower)
+
+@system_router.intent("volume", ["volume", "sound"], priority=1)
+def volume_command(command_lower):
+    volume_up_words = ["up", "increase", "higher", "louder", "more"]
+    volume_down_words = ["down", "decrease", "lower", "quieter", "less"]
+    mute_words = ["mute", "silence", "quiet", "off"]
+    
+    try:
+        if contains_phrase(command_lower, mute_words):
+            system_actions.press_key(VK_VOLUME_MUTE)
+            return "Audio muted."
+        elif contains_phrase(command_lower, volume_up_words):
+            system_actions.press_key(VK_VOLUME_UP, VOLUME_STEPS)
+            return "Volume increased."
+        elif contains_phrase(command_lower, volume_down_words):
+            system_actions.press_key(VK_VOLUME_DOWN, VOLUME_STEPS)
+            return "Volume decreased."
+    except:
+        return "Sorry, I couldn't adjust the volume."
+
+APP_COMMANDS = {
+    "calculator": "calc", "notepad": "notepad", 
+    "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
+}
+
+@system_router.intent("app", list(APP_COMMANDS), priority=1)
+def app_command(command_lower):
+    for app_word, app_cmd in APP_COMMANDS.items():
+        if contains_phrase(command_lower, [app_word]):
+            try:
+                if contains_phrase(command_lower, ["close"]):
+                    os.system(f"taskkill /f /im {app_cmd}.exe")
+                    return f"{app_word.title()} closed."
+                else:
+                    os.system(app_cmd)
+                    return f"{app_word.title()} opened."
+            except:
+                return f"Sorry, I couldn't handle {app_word.title()}."
+
+@system_router.intent("system_info", ["system info", "pc info"])
+def system_info(command_lower):
+    try:
+        cpu_usage = psutil.cpu_percent(interval=1)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('C:\\\\')
+        return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
+    except:
+        return "Sorry, I couldn't get system information."
+
+@system_router.intent("time", ["time", "date"])
+def time_and_date(command_lower):
+    now = datetime.now()
+    if contains_phrase(command_lower, ["time"]):
+        return f"The current time is {now.strftime('%I:%M %p')}."
+    else:
+        return f"Today is {now.strftime('%A, %B %d, %Y')}."
+
+@system_router.intent("screenshot", ["screenshot"])
+def take_screenshot(command_lower):
+    try:
+        screenshot = pyautogui.screenshot()
+        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        screenshot.save(filename)
+        return f"Screenshot saved as {filename}."
+    except:
+        return "Sorry, I couldn't take a screenshot."
+
+@system_router.intent("cancel", ["cancel"], priority=2)
+def cancel_shutdown(command_lower):
+    try:
+        os.system("shutdown /a")
+        return "Shutdown cancelled."
+    except:
+        return "No shutdown to cancel."
+
 def control_system(command):
     """Handle all system control commands"""
-    command_lower = command.lower()
-    
-    # System power commands
-    if any(x in command_lower for x in ["shutdown", "turn off", "power off"]):
-        speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Shutting down now.")
-        try:
-            os.system("shutdown /s /t 5")
-            return "Computer is shutting down."
-        except:
-            return "Sorry, I couldn't shut down the computer."
-    
-    elif any(x in command_lower for x in ["restart", "reboot"]):
-        speak("Restarting the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Restarting now.")
-        try:
-            os.system("shutdown /r /t 5")
-            return "Computer is restarting."
-        except:
-            return "Sorry, I couldn't restart the computer."
-    
-    elif any(x in command_lower for x in ["lock", "lock screen", "lock computer"]):
-        try:
-            os.system("rundll32.exe user32.dll, LockWorkStation")
-            return "Screen locked."
-        except:
-            return "Sorry, I couldn't lock the screen."
-    
-    elif any(x in command_lower for x in ["sleep", "hibernate"]):
-        try:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            return "Computer is going to sleep."
-        except:
-            return "Sorry, I couldn't put the computer to sleep."
-    
-    # Brightness and volume controls
-    elif any(x in command_lower for x in ["brightness", "brighter", "darker", "dim"]):
-        return adjust_brightness(command_lower)
-    
-    elif "volume" in command_lower or "sound" in command_lower:
-        # Volume control logic (same as before)
-        volume_up_words = ["up", "increase", "higher", "louder", "more"]
-        volume_down_words = ["down", "decrease", "lower", "quieter", "less"]
-        mute_words = ["mute", "silence", "quiet", "off"]
-        
-        try:
-            if any(word in command_lower for word in mute_words):
-                subprocess.run(["powershell", "-Command", 
-                              "(New-Object -comObject WScript.Shell).SendKeys([char]173)"], 
-                              check=True, capture_output=True)
-                return "Audio muted."
-            elif any(word in command_lower for word in volume_up_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "(New-Object -comObject WScript.Shell).SendKeys([char]175)"], 
-                                  check=True, capture_output=True)
-                    time.sleep(0.1)
-                return "Volume increased."
-            elif any(word in command_lower for word in volume_down_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "(New-Object -comObject WScript.Shell).SendKeys([char]174)"], 
-                                  check=True, capture_output=True)
-                    time.sleep(0.1)
-                return "Volume decreased."
-        except:
-            return "Sorry, I couldn't adjust the volume."
-    
-    # Application management
-    elif any(x in command_lower for x in ["calculator", "notepad", "chrome", "firefox", "edge"]):
-        app_mapping = {
-            "calculator": "calc", "notepad": "notepad", 
-            "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
-        }
-        for app_word, app_cmd in app_mapping.items():
-            if app_word in command_lower:
-                try:
-                    if "close" in command_lower:
-                        os.system(f"taskkill /f /im {app_cmd}.exe")
-                        return f"{app_word.title()} closed."
-                    else:
-                        os.system(app_cmd)
-                        return f"{app_word.title()} opened."
-                except:
-                    return f"Sorry, I couldn't handle {app_word.title()}."
-    
-    # System info
-    elif "system info" in command_lower or "pc info" in command_lower:
-        try:
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('C:\\\\')
-            return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
-        except:
-            return "Sorry, I couldn't get system information."
-    
-    # Time and date
-    elif "time" in command_lower or "date" in command_lower:
-        now = datetime.now()
-        if "time" in command_lower:
-            return f"The current time is {now.strftime('%I:%M %p')}."
-        else:
-            return f"Today is {now.strftime('%A, %B %d, %Y')}."
-    
-    # Screenshot
-    elif "screenshot" in command_lower:
-        try:
-            screenshot = pyautogui.screenshot()
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            screenshot.save(filename)
-            return f"Screenshot saved as {filename}."
-        except:
-            return "Sorry, I couldn't take a screenshot."
-    
-    return None
+    return system_router.route(command.lower())
 
-def get_memory_context():
+def get_memory_context(include_last_conversation=True):
     """Get a formatted string of what Myra knows about the user"""
     memory = load_memory()
     if not memory:
@@ -441,7 +377,8 @@ def get_memory_context():
         if key == "user_name":
             context_parts.append(f"User's name is {value}")
         elif key == "last_conversation":
-            context_parts.append(f"Last talked about: {value}")
+            if include_last_conversation:
+                context_parts.append(f"Last talked about: {value}")
         elif isinstance(value, str):
             context_parts.append(f"{key}: {value}")
         elif value is True:
@@ -524,14 +461,16 @@ def handle_memory_command(command):
         if count == 0:
             speak("I have some information stored, but it's mostly system data. Tell me more about yourself!")
 
-def ask_ollama(prompt):
-    """Get AI response from Ollama (local)"""
-    if not MODEL_NAME:
+response_cache = ResponseCache()
+
+def ask_ollama(prompt, model, cache_key=None):
+    """Get AI response from Ollama (local) with the model resolved for this turn"""
+    if not model:
         return "Sorry, no AI model is available. But I can still help with system commands!"
     
     try:
         payload = {
-            "model": MODEL_NAME,
+            "model": model,
             "prompt": prompt,
             "stream": False  # Non-streaming for simplicity
         }
@@ -539,7 +478,11 @@ def ask_ollama(prompt):
         
         if response.status_code == 200:
             data = response.json()
-            return data.get('response', 'Sorry, I got an empty response.')
+            answer = data.get('response')
+            if not answer:
+                return 'Sorry, I got an empty response.'
+            response_cache.put(cache_key, answer, prompt)
+            return answer
         else:
             return "Sorry, the AI service isn't responding right now."
             
@@ -564,7 +507,7 @@ def main_loop():
         try:
             if not listening_active:
                 # Listen for wake word
-                command = listen_offline()
+                command = listen_offline(phase=WAKE_PHASE)
                 if command:
                     print(f"🔍 Heard: {command}")
                     if check_wake_word(command):
@@ -627,7 +570,13 @@ def main_loop():
                     else:
                         enhanced_prompt = command
                     
-                    answer = ask_ollama(enhanced_prompt)
+                    # Repeated questions are answered from the cache (keyed without the
+                    # last-conversation note, which changes every turn)
+                    # Resolved once per turn, so the cache key names the model that answers
+                    model = model_resolver.get(wait=2.0)
+                    cache_key = response_cache.make_key(command, model,
+                                                        get_memory_context(include_last_conversation=False))
+                    answer = response_cache.get(cache_key) or ask_ollama(enhanced_prompt, model, cache_key)
                     if answer:
                         speak(answer)
                         
@@ -645,4 +594,9 @@ if __name__ == "__main__":
     try:
         main_loop()
     finally:
-        audio.terminate()
+        response_cache.flush()
+        response_cache.print_stats()
+        system_router.print_stats("System commands")
+        system_actions.print_stats()
+        system_actions.close()
+        vosk_service.close()
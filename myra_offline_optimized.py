@@ -13,6 +13,10 @@ from datetime import datetime
 import threading
 import queue
 import socket
+from myra_audio_buffer import AudioRingBuffer
+from myra_vad import VoiceActivityDetector, recognize_speech
+from myra_llm_stream import StreamingResponder
+from myra_ollama_client import get_client
 
 # Speech recognition - optimized offline
 try:
@@ -71,12 +75,15 @@ WAKE_WORDS = ["myra", "hey myra", "hello myra", "hi myra"]
 MEMORY_FILE = "myra_memory.json"
 is_awake = False
 
-# Audio processing queue for threading
-audio_queue = queue.Queue()
+# Preallocated audio ring buffer filled by the PyAudio callback
+# (frames are read as memoryviews; Vosk's cffi binding still needs bytes())
+audio_buffer = AudioRingBuffer(capacity=200, frame_bytes=CHUNK * 2)
 result_queue = queue.Queue()
 
 def speak(text):
     """Fast text-to-speech"""
+    if not text:
+        return  # Already spoken (e.g. a streamed AI answer)
     print(f"🤖 Myra: {text}")
     engine.say(text)
     engine.runAndWait()
@@ -96,6 +103,8 @@ class OptimizedVoskListener:
         self.stream = None
         self.listening = False
         self.partial_result = ""
+        # Only speech segments reach the recognizer; silence is skipped
+        self.vad = VoiceActivityDetector(rate=RATE)
         
     def start_stream(self):
         """Start optimized audio stream"""
@@ -112,7 +121,7 @@ class OptimizedVoskListener:
     def audio_callback(self, in_data, frame_count, time_info, status):
         """Audio callback for continuous processing"""
         if self.listening:
-            audio_queue.put(in_data)
+            audio_buffer.write(in_data)
         return (in_data, pyaudio.paContinue)
     
     def stop_stream(self):
@@ -120,6 +129,8 @@ class OptimizedVoskListener:
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+        audio_buffer.print_stats()
+        self.vad.print_stats()
     
     def listen_for_wake_word(self, timeout=5):
         """Optimized wake word detection"""
@@ -128,45 +139,44 @@ class OptimizedVoskListener:
         start_time = time.time()
         
         # Clear any old data
-        while not audio_queue.empty():
-            audio_queue.get()
+        audio_buffer.clear()
+        self.vad.reset()
         
         while time.time() - start_time < timeout:
             try:
-                data = audio_queue.get(timeout=0.1)
+                data = audio_buffer.read(timeout=0.1)
+                if data is None:
+                    continue
                 
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    text = result.get('text', '').strip()
-                    
-                    if text:
-                        print(f"🗣️ Heard: {text}")
+                for is_final, result in recognize_speech(self.vad, rec, data):
+                    if is_final:
+                        text = result.get('text', '').strip()
                         
-                        # Check for wake words
-                        for wake_word in WAKE_WORDS:
-                            if wake_word in text.lower():
-                                print(f"✅ Wake word detected: {wake_word}")
-                                self.listening = False
-                                return True
-                
-                else:
-                    # Check partial results for immediate feedback
-                    partial = json.loads(rec.PartialResult())
-                    partial_text = partial.get('partial', '').strip()
+                        if text:
+                            print(f"🗣️ Heard: {text}")
+                            
+                            # Check for wake words
+                            for wake_word in WAKE_WORDS:
+                                if wake_word in text.lower():
+                                    print(f"✅ Wake word detected: {wake_word}")
+                                    self.listening = False
+                                    return True
                     
-                    if partial_text and partial_text != self.partial_result:
-                        self.partial_result = partial_text
-                        print(f"🎧 Partial: {partial_text}")
+                    else:
+                        # Check partial results for immediate feedback
+                        partial_text = result.get('partial', '').strip()
                         
-                        # Quick wake word check on partial results
-                        for wake_word in WAKE_WORDS:
-                            if wake_word in partial_text.lower():
-                                print(f"✅ Wake word detected (partial): {wake_word}")
-                                self.listening = False
-                                return True
+                        if partial_text and partial_text != self.partial_result:
+                            self.partial_result = partial_text
+                            print(f"🎧 Partial: {partial_text}")
+                            
+                            # Quick wake word check on partial results
+                            for wake_word in WAKE_WORDS:
+                                if wake_word in partial_text.lower():
+                                    print(f"✅ Wake word detected (partial): {wake_word}")
+                                    self.listening = False
+                                    return True
                                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"⚠️ Audio processing error: {e}")
                 continue
@@ -182,44 +192,43 @@ class OptimizedVoskListener:
         command_parts = []
         
         # Clear queue
-        while not audio_queue.empty():
-            audio_queue.get()
+        audio_buffer.clear()
+        self.vad.reset()
         
         while time.time() - start_time < timeout:
             try:
-                data = audio_queue.get(timeout=0.5)
-                
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    text = result.get('text', '').strip()
-                    
-                    if text:
-                        command_parts.append(text)
-                        print(f"📝 Command part: {text}")
-                        
-                        # If we get a complete phrase, process it
-                        if len(text.split()) >= 2:
-                            full_command = ' '.join(command_parts)
+                data = audio_buffer.read(timeout=0.5)
+                if data is None:
+                    # Check if we have accumulated command parts
+                    if command_parts:
+                        full_command = ' '.join(command_parts)
+                        if len(full_command.split()) >= 1:  # At least one word
                             self.listening = False
                             return full_command
+                    continue
                 
-                else:
-                    # Show partial results for user feedback
-                    partial = json.loads(rec.PartialResult())
-                    partial_text = partial.get('partial', '').strip()
+                for is_final, result in recognize_speech(self.vad, rec, data):
+                    if is_final:
+                        text = result.get('text', '').strip()
+                        
+                        if text:
+                            command_parts.append(text)
+                            print(f"📝 Command part: {text}")
+                            
+                            # If we get a complete phrase, process it
+                            if len(text.split()) >= 2:
+                                full_command = ' '.join(command_parts)
+                                self.listening = False
+                                return full_command
                     
-                    if partial_text and partial_text != self.partial_result:
-                        self.partial_result = partial_text
-                        print(f"🎧 Hearing: {partial_text}")
+                    else:
+                        # Show partial results for user feedback
+                        partial_text = result.get('partial', '').strip()
+                        
+                        if partial_text and partial_text != self.partial_result:
+                            self.partial_result = partial_text
+                            print(f"🎧 Hearing: {partial_text}")
                         
-            except queue.Empty:
-                # Check if we have accumulated command parts
-                if command_parts:
-                    full_command = ' '.join(command_parts)
-                    if len(full_command.split()) >= 1:  # At least one word
-                        self.listening = False
-                        return full_command
-                continue
             except Exception as e:
                 print(f"⚠️ Command processing error: {e}")
                 continue
@@ -355,25 +364,22 @@ def smart_file_search(query):
         return f"Search error: {str(e)}"
 
 # === AI RESPONSE (OLLAMA) ===
+# Pooled keep-alive connection; sentences are spoken as they stream in
+AI_MODEL = "llama3.2:1b"
+ollama = get_client()
+ollama_stream = StreamingResponder(speak, client=ollama, timeout=8)
+
 def get_ai_response(question):
-    """Quick AI response from Ollama"""
+    """Quick AI response from Ollama, spoken sentence by sentence ("" once spoken)"""
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "llama3.2:1b",
-                "prompt": f"Answer briefly in 1-2 sentences: {question}",
-                "stream": False,
-                "options": {"temperature": 0.7, "num_predict": 50}  # Limit response length
-            },
-            timeout=8
-        )
-        
-        if response.status_code == 200:
-            return response.json().get("response", "Sorry, no response from AI")
-        else:
-            return "AI is not responding right now"
-            
+        answer = ollama_stream.ask({
+            "model": AI_MODEL,
+            "prompt": f"Answer briefly in 1-2 sentences: {question}",
+            "options": {"temperature": 0.7, "num_predict": 50}  # Limit response length
+        })
+        return "" if answer else "Sorry, no response from AI"
+    except requests.exceptions.HTTPError:
+        return "AI is not responding right now"
     except:
         return "AI service unavailable"
 
@@ -447,6 +453,7 @@ def main():
                 # Listen for wake word
                 if vosk_listener.listen_for_wake_word():
                     is_awake = True
+                    ollama.warm_up(AI_MODEL)  # Load the model while the user speaks
                     speak("Yes? How can I help you?")
                     
                     # Wait for command
@@ -475,6 +482,8 @@ def main():
         speak("Goodbye!")
     finally:
         vosk_listener.stop_stream()
+        ollama_stream.print_stats()
+        ollama.print_stats()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+🦙 Myra Ollama Client
+One pooled keep-alive HTTP session for every Ollama call, plus model warm-up
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OLLAMA_HOST = "http://localhost:11434"
+KEEP_ALIVE_SECONDS = 30 * 60  # How long Ollama keeps the model loaded after a request
+
+class OllamaClient:
+    """
+    Shared Ollama API client
+
+    All requests go through one requests.Session with a small connection
+    pool, so questions reuse an open TCP connection instead of connecting
+    every time. Every generate request carries a keep_alive so Ollama keeps
+    the model in memory between questions. warm_up() loads the model on a
+    background thread - call it when the wake word fires and the load
+    overlaps with the user speaking the command.
+
+    A request counts as cold when this client has not used the model within
+    the keep_alive window; cold and warm latencies are reported separately.
+    """
+
+    def __init__(self, host=OLLAMA_HOST, keep_alive=KEEP_ALIVE_SECONDS, pool_size=4, warm_up_timeout=120):
+        """
+        Initialize the client
+
+        Args:
+            host: Ollama base URL
+            keep_alive: Seconds the server should keep a model loaded after each request
+            pool_size: Connections kept open to the server
+            warm_up_timeout: Seconds allowed for loading a model
+        """
+        self.host = host.rstrip("/")
+        self.generate_url = f"{self.host}/api/generate"
+        self.tags_url = f"{self.host}/api/tags"
+        self.keep_alive = keep_alive
+        self.warm_up_timeout = warm_up_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._last_used = {}  # model -> time of the last successful request
+        self._warming = set()
+
+        # Statistics
+        self.cold_requests = 0
+        self.cold_seconds = 0.0
+        self.warm_requests = 0
+        self.warm_seconds = 0.0
+        self.warm_ups = 0
+        self.warm_up_seconds = 0.0
+        self.errors = 0
+
+    def is_warm(self, model):
+        """True if the model should still be loaded from this client's last request"""
+        last_used = self._last_used.get(model)
+        return last_used is not None and time.time() - last_used < self.keep_alive
+
+    def generate(self, payload, stream=False, timeout=30):
+        """
+        POST to /api/generate over the pooled session
+
+        Args:
+            payload: Request JSON (keep_alive is added unless already set)
+            stream: Stream the response body
+            timeout: Seconds to wait for the connection and the response
+
+        Returns:
+            requests.Response (latency is measured to the headers when streaming)
+        """
+        payload = dict(payload)
+        payload.setdefault("keep_alive", self.keep_alive)
+        model = payload.get("model")
+        cold = not self.is_warm(model)
+
+        start = time.perf_counter()
+        try:
+            response = self.session.post(self.generate_url, json=payload, stream=stream, timeout=timeout)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self.errors += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            if cold:
+                self.cold_requests += 1
+                self.cold_seconds += elapsed
+            else:
+                self.warm_requests += 1
+                self.warm_seconds += elapsed
+            if response.ok:
+                self._last_used[model] = time.time()
+            else:
+                self.errors += 1
+        return response
+
+    def list_models(self, timeout=3):
+        """Return the names of the installed models"""
+        response = self.session.get(self.tags_url, timeout=timeout)
+        response.raise_for_status()
+        return [model['name'] for model in response.json().get('models', [])]
+
+    def warm_up(self, model, background=True):
+        """
+        Load a model without generating anything
+
+        Skipped when the model is already warm or a warm-up is in flight.
+
+        Returns:
+            bool: True if a warm-up was started
+        """
+        if not model:
+            return False
+        with self._lock:
+            if self.is_warm(model) or model in self._warming:
+                return False
+            self._warming.add(model)
+
+        if background:
+            threading.Thread(target=self._warm_up, args=(model,), daemon=True).start()
+        else:
+            self._warm_up(model)
+        return True
+
+    def _warm_up(self, model):
+        start = time.perf_counter()
+        try:
+            # A request without a prompt just loads the model
+            response = self.session.post(self.generate_url,
+                                         json={"model": model, "keep_alive": self.keep_alive},
+                                         timeout=self.warm_up_timeout)
+            if response.ok:
+                with self._lock:
+                    self._last_used[model] = time.time()
+                    self.warm_ups += 1
+                    self.warm_up_seconds += time.perf_counter() - start
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Ollama warm-up failed: {e}")
+        finally:
+            with self._lock:
+                self._warming.discard(model)
+
+    def get_stats(self):
+        """Return cold and warm request latency separately"""
+        with self._lock:
+            return {
+                "cold_requests": self.cold_requests,
+                "avg_cold_ms": self.cold_seconds / self.cold_requests * 1000 if self.cold_requests else 0.0,
+                "warm_requests": self.warm_requests,
+                "avg_warm_ms": self.warm_seconds / self.warm_requests * 1000 if self.warm_requests else 0.0,
+                "warm_ups": self.warm_ups,
+                "avg_warm_up_ms": self.warm_up_seconds / self.warm_ups * 1000 if self.warm_ups else 0.0,
+                "errors": self.errors
+            }
+
+    def print_stats(self, label="Ollama client"):
+        """Print cold-start and warm latency"""
+        stats = self.get_stats()
+        print(f"🦙 {label}: {stats['cold_requests']} cold requests (avg {stats['avg_cold_ms']:.0f} ms), "
+              f"{stats['warm_requests']} warm (avg {stats['avg_warm_ms']:.0f} ms), "
+              f"{stats['warm_ups']} warm-ups (avg {stats['avg_warm_up_ms']:.0f} ms), {stats['errors']} errors")
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+_client = None
+
+def get_client():
+    """Shared client for the whole process"""
+    global _client
+    if _client is None:
+        _client = OllamaClient()
+    return _client
+
+if __name__ == "__main__":
+    client = get_client()
+    try:
+        models = client.list_models()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Ollama not reachable: {e}")
+        raise SystemExit(1)
+    if not models:
+        print("❌ No Ollama models installed")
+        raise SystemExit(1)
+
+    model = models[0]
+    print(f"🦙 Benchmarking {model}")
+    for i in range(4):
+        start = time.perf_counter()
+        client.generate({"model": model, "prompt": "Say hi in one word.",
+                         "options": {"num_predict": 5}}).raise_for_status()
+        print(f"  Request {i + 1}: {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({'warm' if i else 'cold unless already loaded'})")
+    client.print_stats()
+    client.close()
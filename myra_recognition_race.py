@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🏁 Myra Recognition Race
+Run online and offline speech recognition on the same audio at once
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class RecognitionRace:
+    """
+    Feeds one captured utterance to several recognizers concurrently
+
+    The preferred engine (normally Google) wins if it returns text within
+    prefer_budget seconds. After that, or as soon as the preferred engine
+    has failed or heard nothing, the first other engine with text wins.
+    A flaky network therefore costs at most the budget instead of a full
+    request timeout before the offline result is used. Engines that lose
+    keep running in the background; their latency is still recorded.
+
+    Each engine has its own worker thread, and an engine whose call from
+    an earlier race is still running sits the next race out, so a hung
+    request can never queue the other engines behind it.
+    """
+
+    def __init__(self, engines, prefer=None, prefer_budget=1.5, timeout=10.0):
+        """
+        Initialize the race
+
+        Args:
+            engines: Dict of name -> function(audio, ...) returning text ("" if nothing heard)
+            prefer: Engine whose result is preferred within the budget
+            prefer_budget: Seconds to wait for the preferred engine once another has text
+            timeout: Give up on the race after this many seconds
+        """
+        self.engines = dict(engines)
+        self.prefer = prefer
+        self.prefer_budget = prefer_budget
+        self.timeout = timeout
+        self._executors = {name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"myra-race-{name}")
+                           for name in self.engines}
+        self._running = {}  # name -> future of the engine's latest call
+        self._lock = threading.Lock()
+        self.stats = {
+            name: {"runs": 0, "seconds": 0.0, "results": 0, "errors": 0, "wins": 0, "skipped": 0}
+            for name in self.engines
+        }
+        self.races = 0
+        self.no_result = 0
+
+    def _run_engine(self, name, args):
+        start = time.perf_counter()
+        try:
+            text = (self.engines[name](*args) or "").strip()
+            error = False
+        except Exception as e:
+            print(f"⚠️ {name} recognition error: {e}")
+            text = ""
+            error = True
+
+        with self._lock:
+            stats = self.stats[name]
+            stats["runs"] += 1
+            stats["seconds"] += time.perf_counter() - start
+            stats["results"] += int(bool(text))
+            stats["errors"] += int(error)
+        return text
+
+    def recognize(self, *args):
+        """
+        Run every engine on the same audio (and any extra arguments) and pick a result
+
+        Returns:
+            tuple: (text, engine name) - ("", None) if no engine heard anything
+        """
+        self.races += 1
+        start = time.perf_counter()
+        futures = {}
+        for name in self.engines:
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                # Still busy with an earlier utterance (e.g. a stalled request): skip this race
+                with self._lock:
+                    self.stats[name]["skipped"] += 1
+                continue
+            future = self._executors[name].submit(self._run_engine, name, args)
+            self._running[name] = future
+            futures[future] = name
+        pending = set(futures)
+        finished = []  # (name, text) in completion order
+        racing = set(futures.values())
+
+        while True:
+            elapsed = time.perf_counter() - start
+            done_names = {name for name, _ in finished}
+            preferred_done = self.prefer is None or self.prefer not in racing or self.prefer in done_names
+
+            for name, text in finished:
+                if text and name == self.prefer:
+                    return self._win(name, text)
+            others = [(name, text) for name, text in finished if text and name != self.prefer]
+            if others and (preferred_done or elapsed >= self.prefer_budget):
+                return self._win(*others[0])
+
+            if not pending or elapsed >= self.timeout:
+                self.no_result += 1
+                return "", None
+
+            if others:
+                wait_for = self.prefer_budget - elapsed
+            else:
+                wait_for = self.timeout - elapsed
+            done, pending = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+            for future in done:
+                finished.append((futures[future], future.result()))
+
+    def _win(self, name, text):
+        with self._lock:
+            self.stats[name]["wins"] += 1
+        return text, name
+
+    def get_stats(self):
+        """Return per-engine average latency, result rate and win rate"""
+        report = {}
+        with self._lock:
+            for name, stats in self.stats.items():
+                runs = stats["runs"]
+                report[name] = {
+                    "runs": runs,
+                    "avg_latency_ms": stats["seconds"] / runs * 1000 if runs else 0.0,
+                    "result_rate": stats["results"] / runs if runs else 0.0,
+                    "errors": stats["errors"],
+                    "skipped": stats["skipped"],
+                    "wins": stats["wins"],
+                    "win_rate": stats["wins"] / self.races if self.races else 0.0
+                }
+        return report
+
+    def print_stats(self, label="Recognition race"):
+        """Print per-engine latency and how often each engine won"""
+        print(f"🏁 {label}: {self.races} races, {self.no_result} without a result")
+        for name, stats in self.get_stats().items():
+            print(f"   {name:<8} avg {stats['avg_latency_ms']:7.0f} ms | "
+                  f"heard {stats['result_rate']:.0%} | errors {stats['errors']} | skipped {stats['skipped']} | "
+                  f"won {stats['wins']} ({stats['win_rate']:.0%})")
+
+    def close(self):
+        """Stop the worker threads (running engines are not interrupted)"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    import random
+
+    def fake_engine(latency, hit_rate, word):
+        def run(audio):
+            time.sleep(random.uniform(*latency))
+            return word if random.random() < hit_rate else ""
+        return run
+
+    race = RecognitionRace({
+        "google": fake_engine((0.2, 2.5), 0.9, "open calculator"),
+        "vosk": fake_engine((0.3, 0.6), 0.8, "open calculator"),
+    }, prefer="google", prefer_budget=1.0)
+
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        race.recognize(None)
+        latencies.append(time.perf_counter() - start)
+    print(f"Average race latency: {sum(latencies) / len(latencies) * 1000:.0f} ms")
+    race.print_stats()
+    race.close()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🗃️ Myra Response Cache
+On-disk TTL + LRU cache of LLM answers to repeated questions
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+RESPONSE_CACHE_FILE = "myra_response_cache.json"
+
+# Words that carry no meaning for the answer ("hey myra, what's ..." == "what's ...")
+FILLER_WORDS = {"hey", "hi", "hello", "myra", "please", "um", "uh", "okay", "ok", "so"}
+
+# Answers to these depend on when they are asked - never cache them
+TIME_SENSITIVE_WORDS = {"today", "tonight", "tomorrow", "yesterday", "now", "time", "date",
+                        "latest", "news", "current", "currently", "recent"}
+
+def normalize_prompt(prompt):
+    """Lowercase, drop punctuation and filler words, collapse whitespace"""
+    words = re.sub(r"[^a-z0-9' ]+", " ", prompt.lower()).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+class ResponseCache:
+    """
+    Remembers answers keyed on question, model and what Myra knows about the user
+
+    Keys are a hash of the normalized prompt, the model name and a hash of
+    the memory context, so an answer is only reused for the same model and
+    the same user facts. Entries expire after ttl seconds; beyond
+    max_entries the least recently used answer is evicted. Questions that
+    mention time-sensitive words are never cached. The cache is a small
+    JSON file written atomically after each store.
+    """
+
+    def __init__(self, cache_file=RESPONSE_CACHE_FILE, ttl=24 * 3600, max_entries=500):
+        """
+        Initialize the cache and load it from disk
+
+        Args:
+            cache_file: JSON file the entries are persisted to (None keeps them in memory)
+            ttl: Seconds an answer stays valid
+            max_entries: Most answers kept before LRU eviction
+        """
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> {"answer", "created", "prompt"}, oldest use first
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.lookups = 0
+        self.hits = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self.skipped = 0
+
+        self._load()
+
+    def _load(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry.get("created", 0) < self.ttl:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ Could not save response cache: {e}")
+
+    def make_key(self, prompt, model, context=None):
+        """
+        Cache key for a question, or None if it must not be cached
+
+        Args:
+            prompt: The user's question (without the memory context)
+            model: Model name the answer comes from
+            context: Stable memory context the answer may depend on
+        """
+        normalized = normalize_prompt(prompt)
+        if not model or not normalized or TIME_SENSITIVE_WORDS.intersection(normalized.split()):
+            self.skipped += 1
+            return None
+        context_hash = hashlib.sha1((context or "").encode("utf-8")).hexdigest()
+        return hashlib.sha1(f"{model}\n{normalized}\n{context_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached answer for a key, or None"""
+        if key is None:
+            return None
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["created"] >= self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["answer"]
+
+    def put(self, key, answer, prompt=""):
+        """Store an answer (ignored for a None key or empty answer)"""
+        if key is None or not answer:
+            return
+        with self._lock:
+            self._entries[key] = {"answer": answer, "created": time.time(), "prompt": normalize_prompt(prompt)}
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._save()
+
+    def clear(self):
+        """Forget every cached answer"""
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def flush(self):
+        """Write the current LRU order to disk"""
+        with self._lock:
+            self._save()
+
+    def get_stats(self):
+        """Return hit rate and eviction counters"""
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "expired": self.expired,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "skipped": self.skipped
+        }
+
+    def print_stats(self, label="Response cache"):
+        """Print how many questions were answered from the cache"""
+        stats = self.get_stats()
+        print(f"🗃️ {label}: {stats['hits']}/{stats['lookups']} hits ({stats['hit_rate']:.0%}), "
+              f"{stats['entries']} entries, {stats['stores']} stored, {stats['evictions']} evicted, "
+              f"{stats['expired']} expired, {stats['skipped']} not cacheable")
+
+if __name__ == "__main__":
+    import random
+
+    cache = ResponseCache(cache_file=None, max_entries=20)
+    questions = ["What can you do?", "hey myra what can you do", "Define photosynthesis.",
+                 "what is a black hole", "What's the weather like today?", "Tell me a joke"]
+    questions += [f"what is {word}" for word in ("gravity", "entropy", "a qubit", "inflation", "dna")]
+    rng = random.Random(0)
+
+    saved = 0.0
+    for _ in range(200):
+        question = rng.choice(questions)
+        key = cache.make_key(question, "llama3.2:1b", "User's name is Sam")
+        if cache.get(key) is None:
+            cache.put(key, f"Answer to {question}", question)
+        else:
+            saved += 2.5  # Typical seconds for a full generation on a small model
+    cache.print_stats()
+    print(f"Estimated generation time saved: {saved:.0f}s over 200 questions")
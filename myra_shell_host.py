@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+🖥️ Myra Shell Host
+Volume and brightness actions without a PowerShell cold start per keypress
+"""
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+try:
+    import ctypes
+    USER32 = ctypes.windll.user32 if sys.platform == "win32" else None
+except (ImportError, AttributeError):
+    USER32 = None
+NATIVE_AVAILABLE = USER32 is not None
+
+# Windows virtual-key codes of the media keys
+VK_VOLUME_MUTE = 0xAD
+VK_VOLUME_DOWN = 0xAE
+VK_VOLUME_UP = 0xAF
+KEYEVENTF_KEYUP = 0x0002
+
+# Loaded once per host process: presses a key any number of times in one call
+KEY_PRESS_TYPE = (
+    "Add-Type -TypeDefinition 'using System; using System.Runtime.InteropServices; "
+    "public static class MyraKeys { "
+    "[DllImport(\"user32.dll\")] static extern void keybd_event(byte vk, byte scan, uint flags, UIntPtr extra); "
+    "public static void Press(byte vk, int count) { for (int i = 0; i < count; i++) { "
+    "keybd_event(vk, 0, 0, UIntPtr.Zero); keybd_event(vk, 0, 2, UIntPtr.Zero); } } }'"
+)
+
+def brightness_script(percent):
+    """PowerShell one-liner setting the built-in display's brightness through WMI"""
+    return ("(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
+            f".WmiSetBrightness(1, {int(percent)})")
+
+class SystemBackend(ABC):
+    """
+    Common interface of the system-action backends
+
+    press_key() sends a key repeatedly in a single backend call, so "volume
+    up" is one round trip instead of five PowerShell launches. Backends
+    raise RuntimeError when an action fails.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.calls = 0
+        self.keypresses = 0
+        self.call_seconds = 0.0
+        self.errors = 0
+
+    def start(self, background=False):
+        """Prepare the backend (a no-op unless it has a process to launch)"""
+        return self
+
+    @abstractmethod
+    def _press_key(self, key, count):
+        """Press and release key count times in one backend call"""
+
+    @abstractmethod
+    def _set_brightness(self, percent):
+        """Set the brightness to an already clamped percentage"""
+
+    def _timed(self, action, *args):
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                return action(*args)
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.calls += 1
+                self.call_seconds += time.perf_counter() - start
+
+    def press_key(self, key, count=1):
+        """
+        Press and release a virtual key
+
+        Args:
+            key: Virtual-key code (VK_VOLUME_UP etc.)
+            count: Presses, all sent in one backend call
+        """
+        self.keypresses += count
+        return self._timed(self._press_key, key, count)
+
+    def set_brightness(self, percent):
+        """Set the display brightness (0-100)"""
+        return self._timed(self._set_brightness, max(0, min(100, int(percent))))
+
+    def close(self):
+        """Release the backend's resources"""
+
+    def get_stats(self):
+        """Return call counts and the average cost of an action"""
+        return {
+            "backend": self.name,
+            "calls": self.calls,
+            "keypresses": self.keypresses,
+            "avg_call_ms": self.call_seconds / self.calls * 1000 if self.calls else 0.0,
+            "errors": self.errors
+        }
+
+    def print_stats(self, label="System actions"):
+        """Print how many actions ran and what they cost"""
+        stats = self.get_stats()
+        print(f"🖥️ {label} ({stats['backend']}): {stats['calls']} calls, {stats['keypresses']} keypresses, "
+              f"{stats['avg_call_ms']:.1f}ms per call, {stats['errors']} errors")
+
+class PowerShellHost(SystemBackend):
+    """
+    One long-lived PowerShell process that runs commands sent over stdin
+
+    The process is started once (optionally in the background at startup)
+    and the key-press helper type is compiled into it right away, so every
+    later action costs a pipe round trip instead of a PowerShell cold start.
+    Each command is wrapped in try/catch and followed by a numbered marker
+    line; run() reads output up to that marker. A host that dies or stops
+    answering is restarted on the next command.
+    """
+
+    name = "powershell"
+    MARKER = "__MYRA_DONE__"
+
+    def __init__(self, executable=None, timeout=10):
+        """
+        Initialize the host (the process starts on first use or start())
+
+        Args:
+            executable: PowerShell binary (powershell, falling back to pwsh)
+            timeout: Seconds to wait for a command to finish
+        """
+        super().__init__()
+        self.executable = executable or shutil.which("powershell") or shutil.which("pwsh") or "powershell"
+        self.timeout = timeout
+        self._process = None
+        self._output = None
+        self._sequence = 0
+        self._starting = threading.Lock()
+
+        # Statistics
+        self.starts = 0
+        self.start_seconds = 0.0
+
+    def start(self, background=False):
+        """Launch the host process now (in a daemon thread when background=True)"""
+        if background:
+            threading.Thread(target=self._start_quietly, daemon=True).start()
+        else:
+            self._ensure_started()
+        return self
+
+    def _start_quietly(self):
+        try:
+            self._ensure_started()
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
+
+    def _ensure_started(self):
+        with self._starting:
+            if self._process is not None and self._process.poll() is None:
+                return
+            start = time.perf_counter()
+            try:
+                self._process = subprocess.Popen(
+                    [self.executable, "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, bufsize=1,
+                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+            except OSError as e:
+                self._process = None
+                raise RuntimeError(f"Could not start PowerShell host: {e}")
+            self._output = queue.Queue()
+            threading.Thread(target=self._read_output, args=(self._process, self._output), daemon=True).start()
+            self.starts += 1
+            self._send(KEY_PRESS_TYPE)
+            self.start_seconds += time.perf_counter() - start
+
+    @staticmethod
+    def _read_output(process, output):
+        for line in process.stdout:
+            output.put(line.rstrip("\r\n"))
+        output.put(None)
+
+    def _send(self, script):
+        """Write one command line and collect its output up to the marker"""
+        self._sequence += 1
+        marker = f"{self.MARKER}{self._sequence}"
+        line = (f"try {{ {script} | Out-Null; '{marker} ok' }} "
+                f"catch {{ '{marker} ' + $_.Exception.Message }}\n")
+        try:
+            self._process.stdin.write(line)
+            self._process.stdin.flush()
+        except OSError as e:
+            self._kill()
+            raise RuntimeError(f"PowerShell host is gone: {e}")
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                text = self._output.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self._kill()
+                raise RuntimeError(f"PowerShell host did not answer within {self.timeout}s")
+            if text is None:
+                self._kill()
+                raise RuntimeError("PowerShell host exited")
+            if text.startswith(marker):
+                result = text[len(marker):].strip()
+                if result != "ok":
+                    raise RuntimeError(result)
+                return
+
+    def run(self, script):
+        """Run a single-line PowerShell command in the host; raises RuntimeError on failure"""
+        return self._timed(self._run, script)
+
+    def _run(self, script):
+        self._ensure_started()
+        self._send(script)
+
+    def _press_key(self, key, count):
+        self._run(f"[MyraKeys]::Press({key}, {count})")
+
+    def _set_brightness(self, percent):
+        self._run(brightness_script(percent))
+
+    def _kill(self):
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def close(self):
+        """Ask the host to exit, killing it if it does not"""
+        process = self._process
+        if process is None:
+            return
+        try:
+            process.stdin.write("exit\n")
+            process.stdin.flush()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self._kill()
+
+    def get_stats(self):
+        stats = super().get_stats()
+        stats["starts"] = self.starts
+        stats["start_ms"] = self.start_seconds / self.starts * 1000 if self.starts else 0.0
+        return stats
+
+    def print_stats(self, label="System actions"):
+        super().print_stats(label)
+        stats = self.get_stats()
+        print(f"   PowerShell host started {stats['starts']}x, {stats['start_ms']:.0f}ms per start")
+
+class NativeBackend(SystemBackend):
+    """
+    Direct Win32 calls through ctypes
+
+    Key presses go straight to keybd_event with no process involved.
+    Brightness has no simple user32 API for built-in panels, so it is
+    delegated to a PowerShellHost (launched by start() or on first use).
+    """
+
+    name = "native"
+
+    def __init__(self, shell_host=None):
+        if not NATIVE_AVAILABLE:
+            raise RuntimeError("Native system actions need Windows")
+        super().__init__()
+        self.shell_host = shell_host or PowerShellHost()
+
+    def start(self, background=False):
+        """Launch the brightness shell host ahead of the first request"""
+        self.shell_host.start(background)
+        return self
+
+    def _press_key(self, key, count):
+        for _ in range(count):
+            USER32.keybd_event(key, 0, 0, 0)
+            USER32.keybd_event(key, 0, KEYEVENTF_KEYUP, 0)
+
+    def _set_brightness(self, percent):
+        self.shell_host.run(brightness_script(percent))
+
+    def close(self):
+        self.shell_host.close()
+
+class StubBackend(SystemBackend):
+    """
+    Records actions instead of performing them
+
+    Only used when asked for (MYRA_SYSTEM_BACKEND=stub), so command routing
+    and key batching can be exercised on Linux. Every call appends an (action, argument, count) tuple to
+    actions; latency simulates the cost of one backend round trip.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.actions = []
+
+    def _press_key(self, key, count):
+        time.sleep(self.latency)
+        self.actions.append(("key", key, count))
+
+    def _set_brightness(self, percent):
+        time.sleep(self.latency)
+        self.actions.append(("brightness", percent, 1))
+
+class UnsupportedBackend(SystemBackend):
+    """
+    Backend for machines without volume or brightness control
+
+    Every action raises RuntimeError, so callers report the failure
+    instead of claiming a change that never happened.
+    """
+
+    name = "unsupported"
+
+    def _press_key(self, key, count):
+        raise RuntimeError(f"System actions are not supported on {sys.platform}")
+
+    def _set_brightness(self, percent):
+        raise RuntimeError(f"System actions are not supported on {sys.platform}")
+
+BACKENDS = {"native": NativeBackend, "powershell": PowerShellHost, "stub": StubBackend}
+
+def create_backend(name=None):
+    """
+    Build a backend by name, or the best one for this machine
+
+    MYRA_SYSTEM_BACKEND (native, powershell or stub) overrides the choice;
+    otherwise Windows gets the native backend and everything else a backend
+    whose actions fail (the stub is never picked implicitly). An unknown
+    name raises ValueError.
+    """
+    name = name or os.environ.get("MYRA_SYSTEM_BACKEND")
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown system backend '{name}' (choose from {', '.join(BACKENDS)})")
+        return BACKENDS[name]()
+    return NativeBackend() if NATIVE_AVAILABLE else UnsupportedBackend()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_system_actions():
+    """Return the shared system-action backend"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+def benchmark_backends(presses=5, rounds=5):
+    """Compare one PowerShell launch per keypress with the batched backends"""
+    print("🖥️ System action benchmark: volume up by", presses, "steps")
+    print("=" * 70)
+
+    stub = StubBackend()
+    stub.press_key(VK_VOLUME_UP, presses)
+    print(f"stub: {len(stub.actions)} backend call for {presses} keypresses -> {stub.actions}")
+
+    executable = shutil.which("powershell") or shutil.which("pwsh")
+    if not executable:
+        print("PowerShell not found - only the stub backend can run here")
+        return
+
+    start = time.perf_counter()
+    for _ in range(presses):
+        subprocess.run([executable, "-NoProfile", "-Command", "$null"], capture_output=True)
+    spawn_ms = (time.perf_counter() - start) * 1000
+    print(f"spawn per keypress : {spawn_ms:.0f}ms")
+
+    host = PowerShellHost(executable).start()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        host.run("$null")
+    print(f"persistent host    : {(time.perf_counter() - start) * 1000 / rounds:.1f}ms per call "
+          f"(one-off start {host.get_stats()['start_ms']:.0f}ms)")
+    host.close()
+
+if __name__ == "__main__":
+    benchmark_backends()
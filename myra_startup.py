@@ -1,7 +1,6 @@
 import speech_recognition as sr
 import pyttsx3
 import requests
-import json
 import os
 import subprocess
 import time
@@ -15,6 +14,10 @@ import shutil
 from datetime import datetime
 import threading
 import getpass
+from myra_llm_stream import StreamingResponder
+from myra_ollama_client import get_client
+from myra_model_registry import get_model_resolver
+from myra_intent_router import IntentRouter, SLEEP_EXCLUDES, contains_phrase
 
 # === Setup ===
 recognizer = sr.Recognizer()
@@ -131,47 +134,13 @@ def process_startup_request(command):
         listening_active = False
         return
     
-    # Get AI response for general questions
-    answer = ask_ollama(command)
-    if answer:
-        speak(answer)
+    # Get AI response for general questions (spoken while it streams)
+    ask_ollama(command)
     
     listening_active = False
 
-def get_available_models():
-    """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags")
-        if response.status_code == 200:
-            models = response.json()
-            return [model['name'] for model in models.get('models', [])]
-        return []
-    except:
-        return []
-
-def select_model():
-    """Automatically select the best available model"""
-    models = get_available_models()
-    if not models:
-        print("❌ No Ollama models found. Please install one first:")
-        print("  ollama pull llama3.2:1b")
-        return None
-    
-    preferred_models = [
-        'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
-        'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
-    ]
-    
-    for preferred in preferred_models:
-        if preferred in models:
-            print(f"✅ Using model: {preferred}")
-            return preferred
-    
-    selected = models[0]
-    print(f"✅ Using model: {selected}")
-    return selected
-
-MODEL_NAME = select_model()
+# Resolved in the background; the last known model is loaded from disk instantly
+model_resolver = get_model_resolver()
 
 def speak(text):
     """Text to speech function"""
@@ -210,6 +179,7 @@ def listen_for_wake_word():
                 if any(wake_word in command for wake_word in WAKE_WORDS):
                     print("🚀 Wake word detected! Activating Myra...")
                     listening_active = True
+                    ollama.warm_up(model_resolver.get())  # Load the model while the user speaks
                     activate_myra()
                     
             except sr.UnknownValueError:
@@ -286,221 +256,206 @@ def adjust_brightness(action):
     except Exception as e:
         return "Sorry, I couldn't adjust the brightness. This might require administrator privileges."
 
-def control_system(command):
-    """Handle all system control commands"""
-    command_lower = command.lower()
-    
-    # Shutdown commands
-    if any(x in command_lower for x in ["shutdown", "turn off", "power off"]):
-        speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Shutting down now.")
-        try:
-            os.system("shutdown /s /t 5")
-            return "Computer is shutting down."
-        except:
-            return "Sorry, I couldn't shut down the computer."
-    
-    # Restart commands
-    elif any(x in command_lower for x in ["restart", "reboot"]):
-        speak("Restarting the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Restarting now.")
-        try:
-            os.system("shutdown /r /t 5")
-            return "Computer is restarting."
-        except:
-            return "Sorry, I couldn't restart the computer."
-    
-    # Lock screen
-    elif any(x in command_lower for x in ["lock", "lock screen", "lock computer"]):
-        try:
-            os.system("rundll32.exe user32.dll, LockWorkStation")
-            return "Screen locked."
-        except:
-            return "Sorry, I couldn't lock the screen."
-    
-    # Sleep/hibernate
-    elif any(x in command_lower for x in ["sleep", "hibernate"]):
-        try:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            return "Computer is going to sleep."
-        except:
-            return "Sorry, I couldn't put the computer to sleep."
-    
-    # Brightness controls
-    elif any(x in command_lower for x in ["brightness", "screen brightness"]) or any(word in command_lower for word in ["brighter", "darker", "dim", "reduce brightness", "increase brightness"]):
-        return adjust_brightness(command_lower)
+# === System Commands ===
+# Every trigger phrase is compiled into one matcher. Device intents outrank the
+# bare power verbs, so "turn off the sound" mutes instead of shutting down, and
+# "cancel the shutdown" aborts it instead of starting one.
+system_router = IntentRouter()
+
+@system_router.intent("shutdown", ["shutdown", "shut down", "turn off", "power off"])
+def shutdown_computer(command_lower):
+    speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Shutting down now.")
+    try:
+        os.system("shutdown /s /t 5")
+        return "Computer is shutting down."
+    except:
+        return "Sorry, I couldn't shut down the computer."
+
+@system_router.intent("restart", ["restart", "reboot"])
+def restart_computer(command_lower):
+    speak("Restarting the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Restarting now.")
+    try:
+        os.system("shutdown /r /t 5")
+        return "Computer is restarting."
+    except:
+        return "Sorry, I couldn't restart the computer."
+
+@system_router.intent("lock", ["lock", "lock screen", "lock computer"])
+def lock_computer(command_lower):
+    try:
+        os.system("rundll32.exe user32.dll, LockWorkStation")
+        return "Screen locked."
+    except:
+        return "Sorry, I couldn't lock the screen."
+
+@system_router.intent("sleep", ["sleep", "hibernate"], exclude=SLEEP_EXCLUDES)
+def sleep_computer(command_lower):
+    try:
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+        return "Computer is going to sleep."
+    except:
+        return "Sorry, I couldn't put the computer to sleep."
+
+@system_router.intent("brightness", ["brightness", "screen brightness", "brighter", "darker", "dim",
+                                     "reduce brightness", "increase brightness"], priority=1)
+def brightness_command(command_lower):
+    return adjust_brightness(command_lower)
+
+@system_router.intent("volume", ["volume", "sound", "audio"], priority=1)
+def volume_command(command_lower):
+    volume_up_words = ["up", "increase", "higher", "raise", "boost", "more", "louder", "turn up"]
+    volume_down_words = ["down", "decrease", "lower", "reduce", "less", "quieter", "turn down", "softer"]
+    mute_words = ["mute", "silence", "quiet", "off", "shut up"]
     
-    # Volume controls
-    elif "volume" in command_lower or "sound" in command_lower or "audio" in command_lower:
-        volume_up_words = ["up", "increase", "higher", "raise", "boost", "more", "louder", "turn up"]
-        volume_down_words = ["down", "decrease", "lower", "reduce", "less", "quieter", "turn down", "softer"]
-        mute_words = ["mute", "silence", "quiet", "off", "shut up"]
-        
-        try:
-            if any(word in command_lower for word in mute_words):
+    try:
+        if contains_phrase(command_lower, mute_words):
+            subprocess.run(["powershell", "-Command", 
+                          "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_MUTE}')"], 
+                          check=True)
+            return "Audio muted."
+        elif contains_phrase(command_lower, volume_up_words):
+            for _ in range(5):
                 subprocess.run(["powershell", "-Command", 
-                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_MUTE}')"], 
+                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_UP}')"], 
                               check=True)
-                return "Audio muted."
-            elif any(word in command_lower for word in volume_up_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_UP}')"], 
-                                  check=True)
-                return "Volume increased."
-            elif any(word in command_lower for word in volume_down_words):
-                for _ in range(5):
-                    subprocess.run(["powershell", "-Command", 
-                                  "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_DOWN}')"], 
-                                  check=True)
-                return "Volume decreased."
-            else:
-                return "Would you like me to turn the volume up, down, or mute it?"
-        except:
-            return "Sorry, I couldn't adjust the volume."
-    
-    # Application management
-    elif any(x in command_lower for x in ["calculator", "notepad", "word", "excel", "powerpoint", "chrome", "firefox", "edge"]):
-        app_mapping = {
-            "calculator": "calc", "notepad": "notepad", "word": "winword", 
-            "excel": "excel", "powerpoint": "powerpnt", 
-            "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
-        }
-        for app_word, app_cmd in app_mapping.items():
-            if app_word in command_lower:
-                try:
-                    if "close" in command_lower:
-                        os.system(f"taskkill /f /im {app_cmd}.exe")
-                        return f"{app_word.title()} closed."
-                    else:
-                        os.system(app_cmd)
-                        return f"{app_word.title()} opened."
-                except:
-                    return f"Sorry, I couldn't handle {app_word.title()}."
-    
-    # Music playback
-    elif "play music" in command_lower or "play song" in command_lower:
-        song = command_lower.replace("play music ", "").replace("play song ", "").replace("play ", "")
-        try:
-            if song:
-                search_url = f"https://www.youtube.com/results?search_query={song.replace(' ', '+')}"
-                webbrowser.open(search_url)
-                return f"Opening YouTube to play {song}."
-            else:
-                os.system("start mswindowsstore://pdp/?ProductId=9WZDNCRFJ3PT")
-                return "Opening music player."
-        except:
-            return "Sorry, I couldn't play music."
-    
-    # Web browsing
-    elif "search" in command_lower or "google" in command_lower:
-        query = command_lower.replace("search ", "").replace("google ", "")
-        if query:
-            webbrowser.open(f"https://www.google.com/search?q={query.replace(' ', '+')}")
-            return f"Searching for {query} in your browser."
+            return "Volume increased."
+        elif contains_phrase(command_lower, volume_down_words):
+            for _ in range(5):
+                subprocess.run(["powershell", "-Command", 
+                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_DOWN}')"], 
+                              check=True)
+            return "Volume decreased."
         else:
-            webbrowser.open("https://www.google.com")
-            return "Opening Google."
-    
-    # Screenshot
-    elif "screenshot" in command_lower or "capture screen" in command_lower:
-        try:
-            screenshot = pyautogui.screenshot()
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            screenshot.save(filename)
-            return f"Screenshot saved as {filename}."
-        except:
-            return "Sorry, I couldn't take a screenshot."
-    
-    # System information
-    elif "system info" in command_lower or "pc info" in command_lower:
-        try:
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('C:\\')
-            return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
-        except:
-            return "Sorry, I couldn't get system information."
-    
-    # Time and date
-    elif "time" in command_lower or "date" in command_lower:
-        now = datetime.now()
-        if "time" in command_lower:
-            return f"The current time is {now.strftime('%I:%M %p')}."
+            return "Would you like me to turn the volume up, down, or mute it?"
+    except:
+        return "Sorry, I couldn't adjust the volume."
+
+APP_COMMANDS = {
+    "calculator": "calc", "notepad": "notepad", "word": "winword", 
+    "excel": "excel", "powerpoint": "powerpnt", 
+    "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
+}
+
+@system_router.intent("app", list(APP_COMMANDS), priority=1)
+def app_command(command_lower):
+    for app_word, app_cmd in APP_COMMANDS.items():
+        if contains_phrase(command_lower, [app_word]):
+            try:
+                if contains_phrase(command_lower, ["close"]):
+                    os.system(f"taskkill /f /im {app_cmd}.exe")
+                    return f"{app_word.title()} closed."
+                else:
+                    os.system(app_cmd)
+                    return f"{app_word.title()} opened."
+            except:
+                return f"Sorry, I couldn't handle {app_word.title()}."
+
+@system_router.intent("music", ["play music", "play song"])
+def play_music(command_lower):
+    song = command_lower.replace("play music ", "").replace("play song ", "").replace("play ", "")
+    try:
+        if song:
+            search_url = f"https://www.youtube.com/results?search_query={song.replace(' ', '+')}"
+            webbrowser.open(search_url)
+            return f"Opening YouTube to play {song}."
         else:
-            return f"Today is {now.strftime('%A, %B %d, %Y')}."
-    
-    # Weather
-    elif "weather" in command_lower:
-        try:
-            webbrowser.open("https://weather.com")
-            return "Opening weather information."
-        except:
-            return "Sorry, I couldn't open weather information."
-    
-    # News
-    elif "news" in command_lower:
-        try:
-            webbrowser.open("https://news.google.com")
-            return "Opening latest news."
-        except:
-            return "Sorry, I couldn't open news."
-    
-    # Cancel shutdown/restart
-    elif "cancel" in command_lower:
-        try:
-            os.system("shutdown /a")
-            return "Shutdown cancelled."
-        except:
-            return "No shutdown to cancel."
-    
-    return None
+            os.system("start mswindowsstore://pdp/?ProductId=9WZDNCRFJ3PT")
+            return "Opening music player."
+    except:
+        return "Sorry, I couldn't play music."
 
-def ask_ollama(prompt):
-    """Get AI response from Ollama"""
-    if not MODEL_NAME:
-        return "Sorry, no AI model is available."
-    
+@system_router.intent("search", ["search", "google"])
+def web_search(command_lower):
+    query = command_lower.replace("search ", "").replace("google ", "")
+    if query:
+        webbrowser.open(f"https://www.google.com/search?q={query.replace(' ', '+')}")
+        return f"Searching for {query} in your browser."
+    else:
+        webbrowser.open("https://www.google.com")
+        return "Opening Google."
+
+@system_router.intent("screenshot", ["screenshot", "capture screen"])
+def take_screenshot(command_lower):
     try:
-        payload = {
-            "model": MODEL_NAME,
-            "prompt": prompt,
-            "stream": True
-        }
-        response = requests.post(OLLAMA_URL, json=payload, stream=True, timeout=30)
-        
-        if response.status_code != 200:
-            return f"Error: Ollama returned status {response.status_code}"
-        
-        reply = ""
-        print("Myra: ", end="", flush=True)
-        
-        for line in response.iter_lines():
-            if line:
-                data = line.decode('utf-8')
-                try:
-                    if data.startswith('{') and 'response' in data:
-                        json_data = json.loads(data)
-                        text = json_data.get('response', '')
-                        print(text, end='', flush=True)
-                        reply += text
-                        
-                        if json_data.get('done', False):
-                            break
-                except json.JSONDecodeError:
-                    continue
-        
-        print()
-        return reply.strip()
-        
-    except requests.exceptions.Timeout:
-        return "Sorry, the AI model is taking too long to respond."
-    except requests.exceptions.ConnectionError:
-        return "Sorry, I can't connect to the AI service. Is Ollama running?"
-    except Exception as e:
-        return f"Sorry, there was an error: {str(e)}"
+        screenshot = pyautogui.screenshot()
+        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        screenshot.save(filename)
+        return f"Screenshot saved as {filename}."
+    except:
+        return "Sorry, I couldn't take a screenshot."
+
+@system_router.intent("system_info", ["system info", "pc info"])
+def system_info(command_lower):
+    try:
+        cpu_usage = psutil.cpu_percent(interval=1)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('C:\\')
+        return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
+    except:
+        return "Sorry, I couldn't get system information."
+
+@system_router.intent("time", ["time", "date"])
+def time_and_date(command_lower):
+    now = datetime.now()
+    if contains_phrase(command_lower, ["time"]):
+        return f"The current time is {now.strftime('%I:%M %p')}."
+    else:
+        return f"Today is {now.strftime('%A, %B %d, %Y')}."
+
+@system_router.intent("weather", ["weather"])
+def open_weather(command_lower):
+    try:
+        webbrowser.open("https://weather.com")
+        return "Opening weather information."
+    except:
+        return "Sorry, I couldn't open weather information."
+
+@system_router.intent("news", ["news"])
+def open_news(command_lower):
+    try:
+        webbrowser.open("https://news.google.com")
+        return "Opening latest news."
+    except:
+        return "Sorry, I couldn't open news."
+
+@system_router.intent("cancel", ["cancel"], priority=2)
+def cancel_shutdown(command_lower):
+    try:
+        os.system("shutdown /a")
+        return "Shutdown cancelled."
+    except:
+        return "No shutdown to cancel."
+
+def control_system(command):
+    """Handle all system control commands"""
+    return system_router.route(command.lower())
+
+# Pooled keep-alive connection; each sentence is spoken as soon as it has streamed in
+ollama = get_client()
+ollama_stream = StreamingResponder(speak, client=ollama, timeout=30)
+
+def ask_ollama(prompt):
+    """Get AI response from Ollama, speaking it sentence by sentence"""
+    model = model_resolver.get(wait=2.0)
+    if not model:
+        message = "Sorry, no AI model is available."
+    else:
+        try:
+            return ollama_stream.ask({"model": model, "prompt": prompt})
+        except requests.exceptions.Timeout:
+            message = "Sorry, the AI model is taking too long to respond."
+        except requests.exceptions.ConnectionError:
+            message = "Sorry, I can't connect to the AI service. Is Ollama running?"
+        except requests.exceptions.HTTPError as e:
+            message = f"Error: Ollama returned status {e.response.status_code}"
+        except Exception as e:
+            message = f"Sorry, there was an error: {str(e)}"
+    speak(message)
+    return message
 
 def activate_myra():
     """Main active session when Myra is awakened"""
@@ -544,14 +499,12 @@ def activate_myra():
             speak(system_response)
             continue
         
-        # Get AI response for general questions
-        answer = ask_ollama(query)
-        if answer:
-            speak(answer)
+        # Get AI response for general questions (spoken while it streams)
+        ask_ollama(query)
 
 def main():
     """Main function"""
-    if not MODEL_NAME:
+    if not model_resolver.get(wait=model_resolver.timeout + 1):
         print("❌ No AI models available. Please install one first.")
         return
     
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+🔊 Myra TTS Worker
+One thread owns the speech engine; everyone else just queues text
+"""
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    import pyttsx3
+    TTS_AVAILABLE = True
+except ImportError:
+    TTS_AVAILABLE = False
+
+# Utterance priorities (lower is spoken first)
+URGENT = 0
+NORMAL = 1
+LOW = 2
+
+_SAY = "say"
+_PROPERTY = "property"
+_STOP = "stop"
+
+class TTSWorker:
+    """
+    Non-blocking, interruptible text to speech
+
+    pyttsx3 engines are not thread-safe, so a single worker thread creates
+    the engine and is the only one that touches it. say() queues an
+    utterance and returns a Future straight away (result True when it was
+    spoken to the end, False when it was cancelled, interrupted or the
+    engine never finished it), so the caller can keep listening and
+    processing while Myra talks. Utterances are spoken in priority order,
+    FIFO within a priority.
+
+    cancel() is the barge-in hook: queued utterances are dropped and the one
+    being spoken is stopped at the next engine iteration. remaining() and
+    wait(tail) estimate when speech will end from the engine's words per
+    minute, so a caller can start listening for the next command while the
+    last words of the response are still playing.
+    """
+
+    def __init__(self, configure=None, words_per_minute=180, poll_interval=0.01):
+        """
+        Initialize the worker (call start() to create the engine)
+
+        Args:
+            configure: Function(engine) run on the worker thread after pyttsx3.init()
+            words_per_minute: Speaking rate used for estimates if the engine doesn't report one
+            poll_interval: Seconds between engine iterations while speaking
+        """
+        if not TTS_AVAILABLE:
+            raise ImportError("pyttsx3 not available - install with: pip install pyttsx3")
+
+        self.configure = configure
+        self.words_per_minute = words_per_minute
+        self.poll_interval = poll_interval
+
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._running = False
+        self._generation = 0  # Bumped by cancel(); older utterances are dropped
+
+        self.current_text = ""
+        self._current_started = 0.0
+        self._current_estimate = 0.0
+        self._queued_estimate = 0.0
+        self._queued = 0
+
+        # Statistics
+        self.utterances = 0
+        self.completed = 0
+        self.interrupted = 0
+        self.dropped = 0
+        self.barge_ins = 0
+        self.timeouts = 0
+        self.queue_wait_seconds = 0.0
+        self.speak_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def start(self):
+        """Start the worker thread and wait until the engine is ready"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="myra-tts")
+        self._thread.start()
+        self._ready.wait(10.0)
+        return self
+
+    def estimate_seconds(self, text):
+        """Rough speaking time for text at the engine's rate"""
+        words = len(text.split())
+        return words * 60.0 / max(self.words_per_minute, 1) + 0.3
+
+    def say(self, text, priority=NORMAL):
+        """
+        Queue text to be spoken
+
+        Returns:
+            Future: True once spoken completely, False if cancelled, interrupted or timed out
+        """
+        future = Future()
+        text = (text or "").strip()
+        if not text:
+            future.set_result(True)
+            return future
+
+        self.start()
+        estimate = self.estimate_seconds(text)
+        with self._lock:
+            self.utterances += 1
+            self._queued += 1
+            self._queued_estimate += estimate
+            self.max_queue_depth = max(self.max_queue_depth, self._queued)
+            generation = self._generation
+        self._queue.put((priority, next(self._order),
+                         (_SAY, text, future, time.perf_counter(), generation, estimate)))
+        return future
+
+    def speak(self, text, priority=NORMAL, timeout=None):
+        """Queue text and block until it has been spoken (or interrupted)"""
+        return self.say(text, priority).result(timeout)
+
+    def set_property(self, name, value):
+        """Change an engine property (rate, volume, voice) on the worker thread"""
+        if name == 'rate':
+            self.words_per_minute = value
+        self.start()
+        self._queue.put((URGENT, next(self._order), (_PROPERTY, name, value)))
+
+    def cancel(self, barge_in=True):
+        """
+        Stop speaking now and drop everything queued
+
+        Args:
+            barge_in: Count this as the user talking over Myra (for stats)
+
+        Returns:
+            bool: True if something was being spoken or queued
+        """
+        with self._lock:
+            active = bool(self.current_text) or self._queued > 0
+            if not active:
+                return False
+            self._generation += 1
+            if barge_in:
+                self.barge_ins += 1
+        return True
+
+    def is_speaking(self):
+        """True while an utterance is playing or waiting in the queue"""
+        return bool(self.current_text) or self._queued > 0
+
+    def remaining(self):
+        """Estimated seconds until everything queued has been spoken"""
+        with self._lock:
+            current = 0.0
+            if self.current_text:
+                elapsed = time.perf_counter() - self._current_started
+                current = max(0.0, self._current_estimate - elapsed)
+            return current + self._queued_estimate
+
+    def wait(self, tail=0.0, timeout=None):
+        """
+        Block until at most tail seconds of speech are left
+
+        With tail > 0 listening can start while the last words still play.
+
+        Returns:
+            bool: False if timeout expired first
+        """
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+        while self.is_speaking() and (tail <= 0 or self.remaining() > tail):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
+    def is_echo(self, heard):
+        """True if heard text is only words Myra is saying right now (her own voice)"""
+        words = heard.lower().split()
+        spoken = self.current_text.lower()
+        if not words or not spoken:
+            return False
+        spoken_words = {word.strip(",.!?") for word in spoken.replace("'", " ").split()}
+        return all(word.strip(",.!?'") in spoken_words for word in words)
+
+    def _run(self):
+        engine = pyttsx3.init()
+        if self.configure:
+            self.configure(engine)
+        rate = engine.getProperty('rate')
+        if rate:
+            self.words_per_minute = rate
+
+        finished = threading.Event()
+        engine.connect('finished-utterance', lambda name, completed: finished.set())
+        try:
+            # Drive the engine ourselves so an utterance can be stopped between iterations
+            engine.startLoop(False)
+            external_loop = True
+        except Exception:
+            external_loop = False
+        self._ready.set()
+
+        while self._running:
+            try:
+                _, _, item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            kind = item[0]
+            if kind == _STOP:
+                break
+            if kind == _PROPERTY:
+                try:
+                    engine.setProperty(item[1], item[2])
+                except Exception as e:
+                    print(f"⚠️ TTS property error: {e}")
+                continue
+
+            _, text, future, queued_at, generation, estimate = item
+            with self._lock:
+                self._queued -= 1
+                self._queued_estimate = max(0.0, self._queued_estimate - estimate)
+                if generation != self._generation:
+                    self.dropped += 1
+                    future.set_result(False)
+                    continue
+                self.current_text = text
+                self._current_started = time.perf_counter()
+                self._current_estimate = estimate
+            self.queue_wait_seconds += self._current_started - queued_at
+
+            completed = False
+            timed_out = False
+            try:
+                finished.clear()
+                engine.say(text)
+                if external_loop:
+                    deadline = self._current_started + estimate * 3 + 2.0
+                    while not finished.is_set():
+                        if generation != self._generation:
+                            engine.stop()
+                            break
+                        if time.perf_counter() >= deadline:
+                            # The engine never reported the end: stop it like a cancel would
+                            engine.stop()
+                            timed_out = True
+                            break
+                        engine.iterate()
+                        time.sleep(self.poll_interval)
+                else:
+                    engine.runAndWait()
+                completed = generation == self._generation and not timed_out
+            except Exception as e:
+                print(f"⚠️ TTS error: {e}")
+            finally:
+                with self._lock:
+                    self.speak_seconds += time.perf_counter() - self._current_started
+                    self.current_text = ""
+                    if completed:
+                        self.completed += 1
+                    else:
+                        self.interrupted += 1
+                    if timed_out:
+                        self.timeouts += 1
+                future.set_result(completed)
+
+        if external_loop:
+            try:
+                engine.endLoop()
+            except Exception:
+                pass
+
+    def close(self, drain=False, timeout=5.0):
+        """
+        Stop the worker thread
+
+        Args:
+            drain: Finish speaking what is queued first (otherwise it is cancelled)
+            timeout: Longest time to wait for the worker
+        """
+        if not self._running:
+            return
+        if drain:
+            self.wait(timeout=timeout)
+        else:
+            self.cancel(barge_in=False)
+        self._queue.put((LOW + 1, next(self._order), (_STOP,)))
+        if self._thread:
+            self._thread.join(timeout)
+        self._running = False
+        self.print_stats()
+
+    def get_stats(self):
+        """Return utterance counters and timings"""
+        spoken = self.completed + self.interrupted
+        return {
+            "utterances": self.utterances,
+            "completed": self.completed,
+            "interrupted": self.interrupted,
+            "dropped": self.dropped,
+            "barge_ins": self.barge_ins,
+            "timeouts": self.timeouts,
+            "avg_queue_wait_ms": self.queue_wait_seconds / spoken * 1000 if spoken else 0.0,
+            "avg_speak_seconds": self.speak_seconds / spoken if spoken else 0.0,
+            "max_queue_depth": self.max_queue_depth
+        }
+
+    def print_stats(self, label="TTS worker"):
+        """Print how much was spoken, interrupted and dropped"""
+        stats = self.get_stats()
+        print(f"🔊 {label}: {stats['utterances']} utterances, {stats['completed']} completed, "
+              f"{stats['interrupted']} interrupted, {stats['dropped']} dropped, "
+              f"{stats['barge_ins']} barge-ins, {stats['timeouts']} timed out, avg queue wait {stats['avg_queue_wait_ms']:.0f} ms, "
+              f"max queue depth {stats['max_queue_depth']}")
+
+if __name__ == "__main__":
+    tts = TTSWorker().start()
+
+    start = time.perf_counter()
+    first = tts.say("This is a long answer that keeps going for a while so it can be interrupted.")
+    tts.say("You should never hear this sentence.", priority=LOW)
+    print(f"say() returned after {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    time.sleep(1.5)
+    print("✋ Barge-in")
+    tts.cancel()
+    print("First utterance completed:", first.result(timeout=5))
+
+    urgent = tts.say("Urgent messages jump the queue.", priority=URGENT)
+    tts.say("Normal priority.")
+    print(f"Estimated speech left: {tts.remaining():.1f}s")
+    tts.wait(tail=0.5)
+    print("🎧 Would start listening now (tail overlap)")
+    print("Urgent utterance completed:", urgent.result(timeout=10))
+    tts.close(drain=True)
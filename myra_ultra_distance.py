@@ -14,8 +14,10 @@ import threading
 import queue
 import socket
 import numpy as np
-import difflib
-import re
+from myra_audio_dsp import AudioEnhancer
+from myra_audio_buffer import AudioRingBuffer, CallbackStats
+from myra_vosk_service import create_wake_recognizer, strip_unknown
+from myra_wake_detector import create_distance_detector, DISTANCE_WAKE_WORDS, ALL_WAKE_PATTERNS
 
 # Speech recognition - optimized for distance
 try:
@@ -57,94 +59,25 @@ VOICE_ACTIVITY_THRESHOLD = 250
 ENERGY_AMPLIFICATION = 3.5  # Higher amplification
 SILENCE_TIMEOUT = 4.0
 PRE_EMPHASIS = 0.97  # Audio pre-emphasis filter
+HIGH_PASS_ALPHA = 0.95  # Spectral enhancement high-pass filter
+NOISE_GATE_HOLD = 160  # Samples (10 ms) the gate stays open after speech
+COMPRESSION_SCALE = 10000.0
+RAW_BUFFER_FRAMES = 32  # Raw callback frames buffered ahead of the processing thread
 
 audio = pyaudio.PyAudio()
 print("✅ Ultra-distance speech recognition ready")
 
 # === FUZZY WAKE WORD MATCHING ===
-WAKE_WORDS = ["myra", "hey myra", "hello myra", "hi myra", "wake up myra"]
+# Wake words and misrecognition tables live in myra_wake_detector
+wake_detector = create_distance_detector()
 
-# Common misheard variations of "myra" at distance
-MYRA_VARIATIONS = [
-    "myra", "mira", "moira", "maya", "maria", "mya", "mira", 
-    "murh", "murph", "mur", "my", "mir", "more", "mar",
-    "europe", "euro", "your", "you", "yura", "yara",
-    "ira", "era", "ara", "ora", "ura", "ira",
-    "mya", "nya", "rya", "lya", "dya",
-    "mara", "mora", "mura", "mira", "mera"
-]
-
-HEY_MYRA_VARIATIONS = [
-    "hey myra", "hey mira", "hey maria", "hey maya", "hey moira",
-    "hey murph", "hey europe", "hey your", "hey you",
-    "a myra", "a mira", "hey my", "hey mir", "hey mar",
-    "hey more", "hey mur", "hey er", "hey are"
-]
-
-ALL_WAKE_PATTERNS = MYRA_VARIATIONS + HEY_MYRA_VARIATIONS
-
-def calculate_similarity(text1, text2):
-    """Calculate similarity between two strings"""
-    return difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
-
-def phonetic_similarity(word1, word2):
-    """Simple phonetic similarity check"""
-    # Remove common consonant confusions at distance
-    def normalize_phonetic(word):
-        word = word.lower()
-        # Common distant speech issues
-        word = word.replace('ph', 'f')
-        word = word.replace('europe', 'myra')  # Direct mapping for common mishearing
-        word = word.replace('murph', 'myra')   # Direct mapping
-        word = word.replace('mur', 'myr')
-        word = word.replace('eur', 'myr')
-        word = word.replace('ur', 'yr')
-        # Remove ending consonants that get lost at distance
-        if word.endswith(('h', 'p', 'k', 't')):
-            word = word[:-1]
-        return word
-    
-    norm1 = normalize_phonetic(word1)
-    norm2 = normalize_phonetic(word2)
-    
-    return calculate_similarity(norm1, norm2)
+# Wake phase decodes against these phrases only; commands use the full model (rec)
+wake_rec = create_wake_recognizer(model, DISTANCE_WAKE_WORDS + ALL_WAKE_PATTERNS, RATE)
+wake_rec.SetPartialWords(True)
 
 def is_wake_word_fuzzy(text):
     """Enhanced fuzzy wake word detection"""
-    text = text.lower().strip()
-    
-    # Direct exact matches first
-    for wake_word in WAKE_WORDS:
-        if wake_word in text:
-            return True, wake_word, 1.0
-    
-    # Check for direct variations
-    for variation in ALL_WAKE_PATTERNS:
-        if variation in text:
-            return True, f"myra (heard as '{variation}')", 0.9
-    
-    # Fuzzy matching with similarity threshold
-    words = text.split()
-    for word in words:
-        # Check similarity to "myra"
-        similarity = calculate_similarity(word, "myra")
-        if similarity >= 0.6:  # 60% similarity threshold
-            return True, f"myra (heard as '{word}', {similarity:.1%} match)", similarity
-        
-        # Check phonetic similarity
-        phonetic_sim = phonetic_similarity(word, "myra")
-        if phonetic_sim >= 0.7:  # 70% phonetic similarity
-            return True, f"myra (phonetic match '{word}', {phonetic_sim:.1%})", phonetic_sim
-    
-    # Check multi-word patterns
-    if len(words) >= 2:
-        for i in range(len(words) - 1):
-            phrase = f"{words[i]} {words[i+1]}"
-            for wake_phrase in ["hey myra", "hello myra", "hi myra"]:
-                if calculate_similarity(phrase, wake_phrase) >= 0.6:
-                    return True, f"{wake_phrase} (heard as '{phrase}')", 0.8
-    
-    return False, "", 0.0
+    return wake_detector.detect(text)
 
 # === ENHANCED TTS SETUP ===
 engine = pyttsx3.init()
@@ -164,8 +97,9 @@ engine.setProperty('volume', 1.0)
 MEMORY_FILE = "myra_memory.json"
 is_awake = False
 
-# Ultra-enhanced audio processing queue
-audio_queue = queue.Queue(maxsize=200)  # Even larger queue
+# Ultra-enhanced audio ring buffer - preallocated, O(1) clear, counts dropped frames
+# (frames are read as memoryviews; Vosk's cffi binding still needs bytes())
+audio_buffer = AudioRingBuffer(capacity=200, frame_bytes=CHUNK * 2)
 
 def speak(text):
     """Simple text-to-speech to avoid threading issues"""
@@ -185,52 +119,17 @@ def check_internet():
     except OSError:
         return False
 
-def apply_pre_emphasis(audio_data):
-    """Apply pre-emphasis filter to enhance speech intelligibility"""
-    try:
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-        
-        # Pre-emphasis filter to boost high frequencies (speech clarity)
-        emphasized = np.append(audio_np[0], audio_np[1:] - PRE_EMPHASIS * audio_np[:-1])
-        
-        return emphasized
-    except:
-        return np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-
-def enhance_audio_ultra_distance(audio_data):
-    """Ultra-enhanced audio processing for maximum distance"""
-    try:
-        # Apply pre-emphasis first
-        audio_np = apply_pre_emphasis(audio_data)
-        
-        # Aggressive noise gate
-        audio_np = np.where(np.abs(audio_np) > NOISE_GATE_THRESHOLD, audio_np, 0)
-        
-        # High amplification for distant speech
-        audio_np = audio_np * ENERGY_AMPLIFICATION
-        
-        # Dynamic range compression with soft limiting
-        audio_np = np.tanh(audio_np / 10000.0) * 10000.0
-        
-        # Spectral enhancement (simple high-pass filtering)
-        # This helps with speech intelligibility at distance
-        if len(audio_np) > 1:
-            # Simple high-pass filter
-            alpha = 0.95
-            filtered = np.zeros_like(audio_np)
-            filtered[0] = audio_np[0]
-            for i in range(1, len(audio_np)):
-                filtered[i] = alpha * filtered[i-1] + alpha * (audio_np[i] - audio_np[i-1])
-            audio_np = filtered
-        
-        # Final clipping protection
-        audio_np = np.clip(audio_np, -32767, 32767)
-        
-        return audio_np.astype(np.int16).tobytes()
-        
-    except Exception as e:
-        print(f"⚠️ Audio enhancement error: {e}")
-        return audio_data
+def create_audio_enhancer():
+    """Build the ultra-enhanced processing chain for maximum distance"""
+    return AudioEnhancer(
+        pre_emphasis=PRE_EMPHASIS,                  # Boost high frequencies (speech clarity)
+        noise_gate_threshold=NOISE_GATE_THRESHOLD,  # Aggressive noise gate
+        amplification=ENERGY_AMPLIFICATION,         # High amplification for distant speech
+        compression_scale=COMPRESSION_SCALE,        # Dynamic range compression with soft limiting
+        high_pass_alpha=HIGH_PASS_ALPHA,            # Spectral enhancement for intelligibility
+        gate_hold_samples=NOISE_GATE_HOLD,
+        chunk_size=CHUNK
+    )
 
 class UltraDistanceVoskListener:
     """Ultra-enhanced Vosk listener with advanced distant speech processing"""
@@ -242,6 +141,13 @@ class UltraDistanceVoskListener:
         self.partial_result = ""
         self.last_activity = 0
         self.wake_word_buffer = []  # Buffer for wake word analysis
+        self.enhancer = create_audio_enhancer()
+        
+        # Raw frames from the PyAudio callback, enhanced on a worker thread
+        self.raw_buffer = AudioRingBuffer(capacity=RAW_BUFFER_FRAMES, frame_bytes=CHUNK * 2)
+        self.callback_stats = CallbackStats(overflow_flag=pyaudio.paInputOverflow)
+        self.processing_thread = None
+        self.running = False
         
     def start_stream(self):
         """Start ultra-enhanced audio stream"""
@@ -255,6 +161,9 @@ class UltraDistanceVoskListener:
                 frames_per_buffer=CHUNK,
                 stream_callback=self.audio_callback
             )
+            self.running = True
+            self.processing_thread = threading.Thread(target=self.process_audio_loop, daemon=True)
+            self.processing_thread.start()
             self.stream.start_stream()
             print("🎙️ Ultra-distance audio stream active")
         except Exception as e:
@@ -262,28 +171,44 @@ class UltraDistanceVoskListener:
             raise
     
     def audio_callback(self, in_data, frame_count, time_info, status):
-        """Ultra-enhanced audio callback"""
+        """Realtime callback - only copies raw frames into the ring buffer"""
+        started = time.perf_counter()
         if self.listening:
+            self.raw_buffer.write(in_data)
+        self.callback_stats.record(started, status)
+        return (in_data, pyaudio.paContinue)
+    
+    def process_audio_loop(self):
+        """Worker thread: enhancement and voice activity detection off the audio thread"""
+        while self.running:
+            in_data = self.raw_buffer.read(timeout=0.1)
+            if in_data is None:
+                continue
+            
             # Apply ultra-enhancement
-            enhanced_audio = enhance_audio_ultra_distance(in_data)
+            enhanced_audio = self.enhancer.process(in_data)
             
             # Voice activity detection with lower threshold
-            audio_np = np.frombuffer(enhanced_audio, dtype=np.int16)
-            energy = np.sqrt(np.mean(audio_np.astype(np.float32)**2))
+            energy = self.enhancer.last_energy
             
             if energy > VOICE_ACTIVITY_THRESHOLD:
                 self.last_activity = time.time()
-                audio_queue.put(enhanced_audio)
+                audio_buffer.write(enhanced_audio)
             elif time.time() - self.last_activity < SILENCE_TIMEOUT:
-                audio_queue.put(enhanced_audio)
-        
-        return (in_data, pyaudio.paContinue)
+                audio_buffer.write(enhanced_audio)
     
     def stop_stream(self):
         """Stop audio stream"""
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+        self.running = False
+        if self.processing_thread:
+            self.processing_thread.join(timeout=1.0)
+        self.callback_stats.print_stats("Ultra-distance audio callback")
+        self.raw_buffer.print_stats("Raw callback buffer")
+        audio_buffer.print_stats("Enhanced audio buffer")
+        self.enhancer.print_stage_timings()
     
     def listen_for_wake_word(self, timeout=20):
         """Ultra-enhanced wake word detection with fuzzy matching"""
@@ -295,23 +220,22 @@ class UltraDistanceVoskListener:
         self.last_activity = time.time()
         self.wake_word_buffer = []
         
-        # Clear old audio data
-        while not audio_queue.empty():
-            try:
-                audio_queue.get_nowait()
-            except:
-                break
+        # Clear old audio data and any hypothesis left from the last session
+        audio_buffer.clear()
+        wake_rec.Reset()
         
         accumulated_text = ""
         recent_words = []  # Keep track of recent words for pattern matching
         
         while time.time() - start_time < timeout:
             try:
-                data = audio_queue.get(timeout=0.3)
+                data = audio_buffer.read(timeout=0.3)
+                if data is None:
+                    continue
                 
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    text = result.get('text', '').strip()
+                if wake_rec.AcceptWaveform(bytes(data)):
+                    result = json.loads(wake_rec.Result())
+                    text = strip_unknown(result.get('text', ''))
                     
                     if text:
                         recent_words.extend(text.split())
@@ -340,8 +264,8 @@ class UltraDistanceVoskListener:
                 
                 else:
                     # Enhanced partial result processing
-                    partial = json.loads(rec.PartialResult())
-                    partial_text = partial.get('partial', '').strip()
+                    partial = json.loads(wake_rec.PartialResult())
+                    partial_text = strip_unknown(partial.get('partial', ''))
                     
                     if partial_text and partial_text != self.partial_result:
                         self.partial_result = partial_text
@@ -354,8 +278,6 @@ class UltraDistanceVoskListener:
                             self.listening = False
                             return True
                                 
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"⚠️ Processing error: {e}")
                 continue
@@ -372,17 +294,21 @@ class UltraDistanceVoskListener:
         start_time = time.time()
         command_parts = []
         
-        while not audio_queue.empty():
-            try:
-                audio_queue.get_nowait()
-            except:
-                break
+        audio_buffer.clear()
+        rec.Reset()
         
         while time.time() - start_time < timeout:
             try:
-                data = audio_queue.get(timeout=1.0)
+                data = audio_buffer.read(timeout=1.0)
+                if data is None:
+                    if command_parts:
+                        full_command = ' '.join(command_parts)
+                        if len(full_command.split()) >= 1:
+                            self.listening = False
+                            return full_command
+                    continue
                 
-                if rec.AcceptWaveform(data):
+                if rec.AcceptWaveform(bytes(data)):
                     result = json.loads(rec.Result())
                     text = result.get('text', '').strip()
                     
@@ -403,13 +329,6 @@ class UltraDistanceVoskListener:
                         self.partial_result = partial_text
                         print(f"🎧 Hearing: {partial_text}")
                         
-            except queue.Empty:
-                if command_parts:
-                    full_command = ' '.join(command_parts)
-                    if len(full_command.split()) >= 1:
-                        self.listening = False
-                        return full_command
-                continue
             except Exception as e:
                 print(f"⚠️ Command processing error: {e}")
                 continue
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+🗣️ Myra Voice Activity Detection
+Energy / zero-crossing / spectral-flatness gate in front of the recognizer
+"""
+import json
+import math
+import time
+from collections import deque
+import numpy as np
+
+class VoiceActivityDetector:
+    """
+    Forwards only speech segments to the recognizer
+
+    A frame counts as speech when its RMS energy clears an adaptive threshold
+    (the tracked noise floor times noise_ratio, never below a small fixed
+    floor that only keeps near-digital-silence out) and its
+    spectrum looks voiced: low spectral flatness, and a zero-crossing rate
+    above mains hum but below broadband hiss. The gate opens after onset_ms
+    of consecutive speech, replays a short pre-roll so word onsets are not clipped,
+    and stays open for a hangover period after the last speech frame so
+    the recognizer still sees the trailing silence it uses for endpointing.
+    """
+
+    def __init__(self, rate=16000, energy_threshold=60.0, noise_ratio=2.5,
+                 flatness_threshold=0.5, zcr_min=0.01, zcr_max=0.35,
+                 onset_ms=100, hangover_ms=600, preroll_ms=300, noise_adapt=0.05):
+        """
+        Initialize the detector
+
+        Args:
+            rate: Sample rate in Hz
+            energy_threshold: Absolute minimum RMS (int16 scale) for speech; keep it low
+                (a quiet speaker at arm's length is ~150) and let noise_ratio do the work
+            noise_ratio: Speech must also be this many times louder than the noise floor
+            flatness_threshold: Maximum spectral flatness (0 tonal .. 1 white noise)
+            zcr_min: Minimum zero crossings per sample (rejects hum)
+            zcr_max: Maximum zero crossings per sample (rejects hiss)
+            onset_ms: Consecutive speech needed to open the gate (rejects clicks)
+            hangover_ms: Keep forwarding this long after the last speech frame
+            preroll_ms: Audio before the speech onset that is forwarded too
+            noise_adapt: Noise floor smoothing factor for non-speech frames
+        """
+        self.rate = rate
+        self.energy_threshold = energy_threshold
+        self.noise_ratio = noise_ratio
+        self.flatness_threshold = flatness_threshold
+        self.zcr_min = zcr_min
+        self.zcr_max = zcr_max
+        self.onset_ms = onset_ms
+        self.hangover_ms = hangover_ms
+        self.preroll_ms = preroll_ms
+        self.noise_adapt = noise_adapt
+
+        self.noise_floor = 0.0
+        self._frame_samples = 0
+        self._onset_frames = 1
+        self._hangover_frames = 0
+        self._preroll = deque()
+        self._float_buf = np.zeros(0, dtype=np.float32)
+
+        # Last frame's features, for tuning
+        self.last_energy = 0.0
+        self.last_zcr = 0.0
+        self.last_flatness = 0.0
+
+        self.reset()
+        self.reset_stats()
+
+    def reset(self):
+        """Close the gate and drop the pre-roll (the noise floor is kept)"""
+        self.in_speech = False
+        self.segment_ended = False
+        self._hangover_left = 0
+        self._speech_run = 0
+        self._preroll.clear()
+
+    def reset_stats(self):
+        """Zero the frame counters"""
+        self.frames_seen = 0
+        self.frames_forwarded = 0
+        self.speech_frames = 0
+        self.segments = 0
+        self.analysis_seconds = 0.0
+
+    def _configure(self, n):
+        # Onset, hangover and pre-roll are set in ms; convert once the frame size is known
+        self._frame_samples = n
+        frame_ms = n * 1000.0 / self.rate
+        self._onset_frames = max(1, math.ceil(self.onset_ms / frame_ms))
+        self._hangover_frames = max(1, math.ceil(self.hangover_ms / frame_ms))
+        # The pre-roll also holds the speech frames seen while the onset is pending
+        preroll_frames = math.ceil(self.preroll_ms / frame_ms) + self._onset_frames - 1
+        self._preroll = deque(self._preroll, maxlen=preroll_frames)
+
+    def is_speech(self, samples):
+        """Classify one frame of int16 samples and update the noise floor"""
+        n = len(samples)
+        if n < 2:
+            return False
+        if len(self._float_buf) < n:
+            self._float_buf = np.zeros(n, dtype=np.float32)
+        x = self._float_buf[:n]
+        np.copyto(x, samples, casting="unsafe")
+
+        energy = float(np.sqrt(np.dot(x, x) / n))
+        self.last_energy = energy
+
+        threshold = max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+        if energy < threshold:
+            self._update_noise_floor(energy)
+            self.last_zcr = 0.0
+            self.last_flatness = 1.0
+            return False
+
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / (n - 1)
+        self.last_zcr = zcr
+
+        power = np.abs(np.fft.rfft(x)) ** 2 + 1e-10
+        flatness = float(np.exp(np.mean(np.log(power))) / np.mean(power))
+        self.last_flatness = flatness
+
+        speech = self.zcr_min <= zcr <= self.zcr_max and flatness <= self.flatness_threshold
+        if not speech:
+            self._update_noise_floor(energy)
+        return speech
+
+    def _update_noise_floor(self, energy):
+        if self.noise_floor == 0.0:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += self.noise_adapt * (energy - self.noise_floor)
+
+    def accept(self, data):
+        """
+        Run one frame of 16-bit mono PCM through the gate
+
+        Args:
+            data: Raw int16 PCM bytes (or any buffer, e.g. a ring buffer memoryview)
+
+        Returns:
+            list: bytes frames to feed to the recognizer (empty during silence).
+            segment_ended is True when the gate closed on this frame.
+        """
+        started = time.perf_counter()
+        samples = np.frombuffer(data, dtype=np.int16)
+        if len(samples) != self._frame_samples:
+            self._configure(len(samples))
+
+        self.frames_seen += 1
+        self.segment_ended = False
+        speech = self.is_speech(samples)
+        forward = []
+
+        if speech:
+            self.speech_frames += 1
+            self._speech_run += 1
+        else:
+            self._speech_run = 0
+
+        if speech and (self.in_speech or self._speech_run >= self._onset_frames):
+            self._hangover_left = self._hangover_frames
+            if not self.in_speech:
+                self.in_speech = True
+                self.segments += 1
+                forward.extend(self._preroll)
+                self._preroll.clear()
+            forward.append(bytes(data))
+        elif self.in_speech:
+            forward.append(bytes(data))
+            self._hangover_left -= 1
+            if self._hangover_left <= 0:
+                self.in_speech = False
+                self.segment_ended = True
+        elif self._preroll.maxlen:
+            # Frames can be ring-buffer views, so the pre-roll keeps copies
+            self._preroll.append(bytes(data))
+
+        self.frames_forwarded += len(forward)
+        self.analysis_seconds += time.perf_counter() - started
+        return forward
+
+    def get_stats(self):
+        """Return frame counters and the fraction of audio sent to the recognizer"""
+        seen = self.frames_seen
+        return {
+            "frames_seen": seen,
+            "frames_forwarded": self.frames_forwarded,
+            "speech_frames": self.speech_frames,
+            "segments": self.segments,
+            "decoded_fraction": self.frames_forwarded / seen if seen else 0.0,
+            "avg_analysis_ms": self.analysis_seconds / seen * 1000 if seen else 0.0,
+            "noise_floor": self.noise_floor
+        }
+
+    def print_stats(self, label="Voice activity gate"):
+        """Print how much of the audio was actually decoded"""
+        stats = self.get_stats()
+        print(f"🗣️ {label}: decoded {stats['frames_forwarded']}/{stats['frames_seen']} frames "
+              f"({stats['decoded_fraction']:.0%}), {stats['segments']} speech segments, "
+              f"gate cost {stats['avg_analysis_ms']:.3f} ms/frame, noise floor {stats['noise_floor']:.0f}")
+
+def recognize_speech(vad, recognizer, data):
+    """
+    Feed the speech frames of one chunk to a Vosk recognizer
+
+    Yields:
+        (True, result) for each final result and (False, partial) otherwise,
+        where result/partial are the decoded Vosk JSON dicts
+    """
+    for frame in vad.accept(data):
+        if recognizer.AcceptWaveform(frame):
+            yield True, json.loads(recognizer.Result())
+        else:
+            yield False, json.loads(recognizer.PartialResult())
+
+    if vad.segment_ended:
+        # The gate closed before Vosk found an endpoint - finish the utterance now
+        yield True, json.loads(recognizer.FinalResult())
+
+def benchmark_vad(rate=16000, chunk=1024, seconds=10.0):
+    """Run the gate over synthetic silence, hum, hiss and voiced bursts"""
+    print("🗣️ Voice activity gate benchmark")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds)) / rate
+    signal = rng.standard_normal(len(t)) * 30  # Room noise
+
+    # Mains hum and a hiss burst that should stay gated
+    signal[int(1 * rate):int(2 * rate)] += 2000 * np.sin(2 * np.pi * 50 * t[:rate])
+    signal[int(3 * rate):int(4 * rate)] += rng.standard_normal(rate) * 1500
+
+    # Two voiced "utterances": harmonics of a 140 Hz fundamental
+    for start, end in ((5.0, 6.5), (8.0, 8.8)):
+        a, b = int(start * rate), int(end * rate)
+        voiced = sum(np.sin(2 * np.pi * 140 * k * t[a:b]) / k for k in range(1, 12))
+        signal[a:b] += 3000 * voiced
+
+    pcm = np.clip(signal, -32767, 32767).astype(np.int16)
+    vad = VoiceActivityDetector(rate=rate)
+    for i in range(0, len(pcm) - chunk + 1, chunk):
+        vad.accept(pcm[i:i + chunk].tobytes())
+
+    speech_seconds = 1.5 + 0.8
+    print(f"Audio: {seconds:.0f}s with {speech_seconds:.1f}s of voiced sound")
+    vad.print_stats()
+    return vad.get_stats()
+
+if __name__ == "__main__":
+    benchmark_vad()
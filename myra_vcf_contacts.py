@@ -8,56 +8,55 @@ import os
 import re
 from typing import Dict, List, Optional, Tuple
 from difflib import SequenceMatcher
+from myra_contact_index import ContactIndex
+from myra_contact_store import Contact, ContactStore
+from myra_vcf_parser import VCardReader, unescape
+from myra_contact_cache import CONTACT_CACHE_FILE, ContactCache, vcf_signature
 
 class VCFContactManager:
-    def __init__(self, vcf_file_path: str = "Contacts.vcf"):
+    def __init__(self, vcf_file_path: str = "Contacts.vcf", cache_file: Optional[str] = CONTACT_CACHE_FILE,
+                 verbose: bool = True):
         self.vcf_file_path = vcf_file_path
-        self.contacts = {}
+        self.cache = ContactCache(cache_file) if cache_file else None
+        self.verbose = verbose
+        self.signature = None
+        self.contacts = ContactStore()
+        self.index = ContactIndex([])
         self.load_contacts()
     
-    def parse_vcf_simple(self, file_path: str) -> Dict[str, Dict[str, str]]:
-        """Parse VCF file without external dependencies"""
-        contacts = {}
+    def parse_vcf_simple(self, file_path: str) -> ContactStore:
+        """Parse VCF file without external dependencies (one contact per vCard, every TEL kept)"""
+        contacts = ContactStore()
+        reader = VCardReader({"FN", "N", "TEL"})
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                current_contact = {}
+            for card in reader.read(file_path):
+                full_name = None
+                structured_name = None
+                phones = []
                 
-                for line in file:
-                    line = line.strip()
-                    
-                    if line == "BEGIN:VCARD":
-                        current_contact = {}
-                    
-                    elif line == "END:VCARD":
-                        if current_contact.get('name') and current_contact.get('phone'):
-                            contacts[current_contact['name']] = current_contact
-                    
-                    elif line.startswith('FN:'):
+                for prop in card:
+                    if prop.name == 'FN':
                         # Full Name
-                        name = line[3:].strip()
-                        current_contact['name'] = name
+                        full_name = unescape(prop.value).strip()
                     
-                    elif line.startswith('TEL'):
+                    elif prop.name == 'TEL':
                         # Phone number - extract from various formats
-                        phone = self.extract_phone_number(line)
+                        phone = self.clean_phone_number(prop.value)
                         if phone:
-                            current_contact['phone'] = phone
+                            phones.append((phone, tuple(t for t in prop.types if t.isalpha())))
                     
-                    elif line.startswith('N:'):
+                    elif prop.name == 'N':
                         # Structured name - fallback if no FN
-                        if 'name' not in current_contact:
-                            name_parts = line[2:].split(';')
-                            if len(name_parts) >= 2:
-                                # Last name, First name format
-                                last_name = name_parts[0].strip()
-                                first_name = name_parts[1].strip()
-                                if first_name and last_name:
-                                    current_contact['name'] = f"{first_name} {last_name}"
-                                elif first_name:
-                                    current_contact['name'] = first_name
-                                elif last_name:
-                                    current_contact['name'] = last_name
+                        name_parts = [unescape(part).strip() for part in prop.value.split(';')]
+                        if len(name_parts) >= 2:
+                            # Last name, First name format
+                            last_name, first_name = name_parts[0], name_parts[1]
+                            structured_name = " ".join(part for part in (first_name, last_name) if part) or None
+                
+                name = full_name or structured_name
+                if name and phones:
+                    contacts.add(name, phones)
         
         except Exception as e:
             print(f"Error parsing VCF file: {e}")
@@ -66,88 +65,78 @@ class VCFContactManager:
     
     def extract_phone_number(self, tel_line: str) -> Optional[str]:
         """Extract phone number from TEL line"""
-        try:
-            # Handle different TEL formats
-            if ':' in tel_line:
-                phone = tel_line.split(':', 1)[1].strip()
-            else:
-                return None
-            
-            # Clean up the phone number
-            phone = re.sub(r'[^\d+]', '', phone)
-            
-            # Skip very short or invalid numbers
-            if len(phone) < 7:
-                return None
-                
-            return phone
-            
-        except:
+        # Handle different TEL formats
+        if ':' not in tel_line:
             return None
+        return self.clean_phone_number(tel_line.split(':', 1)[1])
+    
+    def clean_phone_number(self, value: str) -> Optional[str]:
+        """Phone number of a TEL value ('+233 24-000-0001', 'tel:+1-555-0100' ...)"""
+        # Clean up the phone number
+        phone = re.sub(r'[^\d+]', '', value)
+        
+        # Skip very short or invalid numbers
+        if len(phone) < 7:
+            return None
+            
+        return phone
     
     def load_contacts(self):
         """Load contacts from VCF file"""
         if os.path.exists(self.vcf_file_path):
-            self.contacts = self.parse_vcf_simple(self.vcf_file_path)
-            print(f"✅ Loaded {len(self.contacts)} contacts from VCF file")
-            
-            # Display first few contacts for verification
-            if self.contacts:
-                print("📋 Sample contacts:")
-                for i, (name, info) in enumerate(list(self.contacts.items())[:5]):
-                    print(f"  {i+1}. {name}: {info.get('phone', 'No phone')}")
-                if len(self.contacts) > 5:
-                    print(f"  ... and {len(self.contacts) - 5} more contacts")
+            # Taken before parsing, so an edit made while parsing invalidates the cache
+            self.signature = vcf_signature(self.vcf_file_path)
+            cached = self.cache.load(self.vcf_file_path, self.signature) if self.cache else None
+            if cached:
+                self.contacts, self.index = cached
+                source = "contact cache"
+            else:
+                self.contacts = self.parse_vcf_simple(self.vcf_file_path)
+                self.index = ContactIndex(self.contacts.names())
+                if self.cache:
+                    self.cache.save(self.vcf_file_path, self.contacts, self.index, self.signature)
+                source = "VCF file"
+            if self.verbose:
+                print(f"✅ Loaded {len(self.contacts)} contacts from {source}")
         else:
             print(f"⚠️ VCF file not found: {self.vcf_file_path}")
     
+    def is_current(self) -> bool:
+        """True while the VCF file is unchanged since the contacts were loaded"""
+        try:
+            return self.signature == vcf_signature(self.vcf_file_path)
+        except OSError:
+            return self.signature is None
+    
+    def close(self):
+        """Drop the contacts and release the contact cache mapping"""
+        self.contacts = ContactStore()
+        self.index = ContactIndex([])
+        if self.cache:
+            self.cache.close()
+    
     def find_contact(self, search_name: str) -> List[Tuple[str, float]]:
-        """Find contacts by name with fuzzy matching"""
-        matches = []
-        search_name_lower = search_name.lower().strip()
-        
-        for contact_name in self.contacts.keys():
-            contact_name_lower = contact_name.lower()
-            
-            # Exact match
-            if search_name_lower == contact_name_lower:
-                matches.append((contact_name, 1.0))
-                continue
-            
-            # Partial match
-            if search_name_lower in contact_name_lower or contact_name_lower in search_name_lower:
-                matches.append((contact_name, 0.8))
-                continue
-            
-            # Word-based matching
-            search_words = set(search_name_lower.split())
-            contact_words = set(contact_name_lower.split())
-            
-            if search_words.intersection(contact_words):
-                similarity = len(search_words.intersection(contact_words)) / len(search_words.union(contact_words))
-                if similarity > 0.5:
-                    matches.append((contact_name, similarity))
-                    continue
-            
-            # Fuzzy string matching
-            similarity = SequenceMatcher(None, search_name_lower, contact_name_lower).ratio()
-            if similarity > 0.6:
-                matches.append((contact_name, similarity))
-        
-        # Sort by similarity score (highest first)
-        matches.sort(key=lambda x: x[1], reverse=True)
-        
-        return matches[:5]  # Return top 5 matches
+        """Find contacts by name with fuzzy matching (top 5, best first)"""
+        return [(contact.name, score) for contact, score in self.find_contacts(search_name)]
+    
+    def find_contacts(self, search_name: str, limit: int = 5) -> List[Tuple[Contact, float]]:
+        """Find contact records by name (best first); contacts sharing a name are returned separately"""
+        return [(self.contacts[contact_id], score) for contact_id, score in self.index.search_ids(search_name, limit)]
     
     def get_contact_phone(self, contact_name: str) -> Optional[str]:
-        """Get phone number for a specific contact"""
-        if contact_name in self.contacts:
-            return self.contacts[contact_name].get('phone')
-        return None
+        """Get the preferred phone number of the first contact with this name"""
+        found = self.contacts.find_by_name(contact_name)
+        return found[0].phone if found else None
+    
+    def describe_contact(self, contact: Contact, matches: List[Tuple[Contact, float]]) -> str:
+        """Spoken name of a match; a name shared with another match gets its number type and last digits"""
+        if sum(1 for other, _ in matches if other.name == contact.name) > 1:
+            return f"{contact.name}, {contact.phone_label()}"
+        return contact.name
     
     def search_and_select_contact(self, search_name: str, speak_function=None, listen_function=None) -> Optional[Tuple[str, str]]:
         """Search for contact and handle multiple matches"""
-        matches = self.find_contact(search_name)
+        matches = self.find_contacts(search_name)
         
         if not matches:
             if speak_function:
@@ -157,26 +146,24 @@ class VCFContactManager:
         # MODIFIED: With voice functions, always show choices when multiple matches exist
         # Only auto-select if there's exactly 1 match OR no voice functions
         if len(matches) == 1:
-            contact_name = matches[0][0]
-            phone = self.get_contact_phone(contact_name)
+            contact = matches[0][0]
             if speak_function:
-                speak_function(f"Found contact: {contact_name}")
-            return (contact_name, phone)
+                speak_function(f"Found contact: {contact.name}")
+            return (contact.name, contact.phone)
         
         # Force multiple selection when voice functions are present
         # This ensures Myra always asks the user to choose from multiple contacts
         if not (speak_function and listen_function):
             # No voice interface, return best match
-            contact_name = matches[0][0]
-            phone = self.get_contact_phone(contact_name)
-            return (contact_name, phone)
+            contact = matches[0][0]
+            return (contact.name, contact.phone)
         
         # Multiple matches - ALWAYS ask user to choose
         if speak_function and listen_function:
             speak_function(f"I found {len(matches)} contacts matching '{search_name}':")
             
-            for i, (name, similarity) in enumerate(matches, 1):
-                speak_function(f"Option {i}: {name}")
+            for i, (contact, similarity) in enumerate(matches, 1):
+                speak_function(f"Option {i}: {self.describe_contact(contact, matches)}")
             
             speak_function("Which contact would you like? Say the number or the full name.")
             
@@ -188,29 +175,26 @@ class VCFContactManager:
                         response_lower = response.lower().strip()
                         
                         # Check if user said a number
-                        for i, (name, _) in enumerate(matches, 1):
+                        for i, (contact, _) in enumerate(matches, 1):
                             if str(i) in response_lower or f"option {i}" in response_lower:
-                                phone = self.get_contact_phone(name)
-                                return (name, phone)
+                                return (contact.name, contact.phone)
                         
-                        # Check if user said a name
-                        for name, _ in matches:
-                            if name.lower() in response_lower:
-                                phone = self.get_contact_phone(name)
-                                return (name, phone)
+                        # Check if user said a name (longest first: "kelvin lamptey" is not "Kelvin")
+                        for contact, _ in sorted(matches, key=lambda match: len(match[0].name), reverse=True):
+                            if contact.name.lower() in response_lower:
+                                return (contact.name, contact.phone)
                         
                         # Fuzzy match the response
                         best_match = None
                         best_similarity = 0
-                        for name, _ in matches:
-                            similarity = SequenceMatcher(None, response_lower, name.lower()).ratio()
+                        for contact, _ in matches:
+                            similarity = SequenceMatcher(None, response_lower, contact.name.lower()).ratio()
                             if similarity > best_similarity and similarity > 0.6:
                                 best_similarity = similarity
-                                best_match = name
+                                best_match = contact
                         
                         if best_match:
-                            phone = self.get_contact_phone(best_match)
-                            return (best_match, phone)
+                            return (best_match.name, best_match.phone)
                 
                 except Exception as e:
                     print(f"Error in contact selection: {e}")
@@ -219,31 +203,34 @@ class VCFContactManager:
                     speak_function("I didn't understand. Please say the number or contact name again.")
             
             # Default to first match
-            contact_name = matches[0][0]
-            phone = self.get_contact_phone(contact_name)
-            speak_function(f"I'll select the first option: {contact_name}")
-            return (contact_name, phone)
+            contact = matches[0][0]
+            speak_function(f"I'll select the first option: {contact.name}")
+            return (contact.name, contact.phone)
         
         else:
             # No voice interface, return first match
-            contact_name = matches[0][0]
-            phone = self.get_contact_phone(contact_name)
-            return (contact_name, phone)
+            contact = matches[0][0]
+            return (contact.name, contact.phone)
     
     def list_all_contacts(self, limit: int = 10) -> List[str]:
         """List all contacts (for debugging/testing)"""
-        return list(self.contacts.keys())[:limit]
+        return [contact.name for contact in self.contacts.contacts[:limit]]
     
-    def get_contact_info(self, contact_name: str) -> Optional[Dict[str, str]]:
-        """Get full contact information"""
-        return self.contacts.get(contact_name)
+    def get_contact_info(self, contact_name: str) -> Optional[Dict]:
+        """Get full contact information (first contact with this name, every phone number)"""
+        found = self.contacts.find_by_name(contact_name)
+        return found[0].to_dict() if found else None
 
 # Global contact manager instance
 contact_manager = None
 
 def initialize_contact_manager(vcf_path: str = "Contacts.vcf"):
-    """Initialize the global contact manager"""
+    """Initialize the global contact manager (kept until the VCF file changes)"""
     global contact_manager
+    if contact_manager and contact_manager.vcf_file_path == vcf_path and contact_manager.is_current():
+        return contact_manager
+    if contact_manager:
+        contact_manager.close()
     contact_manager = VCFContactManager(vcf_path)
     return contact_manager
 
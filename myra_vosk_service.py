@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+🎙️ Myra Vosk Recognizer Service
+One Vosk model, one microphone stream, and per-phase recognizers
+"""
+import os
+import json
+import glob
+import time
+import threading
+import wave
+
+try:
+    import vosk
+    import pyaudio
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+from myra_audio_buffer import AudioRingBuffer
+from myra_vad import VoiceActivityDetector, recognize_speech
+
+RATE = 16000
+CHUNK = 4000  # 250 ms per frame
+
+WAKE_PHASE = "wake"
+COMMAND_PHASE = "command"
+
+DEFAULT_WAKE_PHRASES = ["myra", "hey myra", "hello myra", "hi myra", "wake up myra"]
+
+def build_wake_grammar(phrases):
+    """Build a Vosk JSON grammar from wake phrases, plus [unk] for everything else"""
+    grammar = []
+    for phrase in phrases:
+        phrase = phrase.lower().strip()
+        if phrase and phrase not in grammar:
+            grammar.append(phrase)
+    grammar.append("[unk]")
+    return json.dumps(grammar)
+
+def strip_unknown(text):
+    """Drop the [unk] tokens grammar recognizers emit for out-of-grammar speech"""
+    return " ".join(word for word in text.split() if word != "[unk]").strip()
+
+def create_wake_recognizer(model, phrases, rate=RATE):
+    """
+    Create a recognizer that can only output the wake phrases (or [unk])
+
+    Decoding against this tiny grammar is far cheaper than the full language
+    model. Words missing from the model vocabulary are skipped by Vosk with a
+    warning, so misspelled variants in the phrase list are harmless.
+    """
+    recognizer = vosk.KaldiRecognizer(model, rate, build_wake_grammar(phrases))
+    recognizer.SetWords(True)
+    return recognizer
+
+class VoskRecognizerService:
+    """
+    Long-lived offline speech recognition
+
+    Loads the model once and keeps a single input stream open for the life of
+    the process. The wake phase uses a small grammar-restricted recognizer so
+    the decoder only searches the wake phrases; the command phase uses the
+    full language model. The recognizer for a phase is Reset() before every
+    listen so no hypothesis leaks from one utterance into the next.
+    Unless use_vad is off, a VoiceActivityDetector sits in front of the
+    recognizers so silence and steady noise are never decoded.
+    """
+
+    def __init__(self, model_path="vosk-model", wake_phrases=None, device_index=None,
+                 rate=RATE, chunk=CHUNK, model=None, use_vad=True):
+        """
+        Initialize the service
+
+        Args:
+            model_path: Path to the Vosk model directory
+            wake_phrases: Phrases for the wake grammar (None uses the full model for both phases)
+            device_index: PyAudio input device (None for the default microphone)
+            rate: Sample rate in Hz
+            chunk: Frames per buffer
+            model: Already loaded vosk.Model to share instead of loading model_path
+            use_vad: Only decode speech segments (silence never reaches the recognizer)
+        """
+        if not VOSK_AVAILABLE:
+            raise ImportError("Vosk not available - install with: pip install vosk pyaudio")
+
+        self.rate = rate
+        self.chunk = chunk
+        self.device_index = device_index
+        self.model = model if model is not None else vosk.Model(model_path)
+
+        self.command_recognizer = vosk.KaldiRecognizer(self.model, rate)
+        self.command_recognizer.SetWords(True)
+
+        if wake_phrases:
+            self.wake_recognizer = create_wake_recognizer(self.model, wake_phrases, rate)
+        else:
+            self.wake_recognizer = self.command_recognizer
+
+        self.audio = pyaudio.PyAudio()
+        self.stream = None
+        self.capturing = False
+        self.buffer = AudioRingBuffer(capacity=64, frame_bytes=chunk * 2)
+        self.vad = VoiceActivityDetector(rate=rate) if use_vad else None
+        # Recognizers are not thread-safe; recognize_pcm() may run on a worker thread
+        self._decode_lock = threading.Lock()
+
+    def get_recognizer(self, phase):
+        """Return the recognizer used for a phase"""
+        return self.wake_recognizer if phase == WAKE_PHASE else self.command_recognizer
+
+    def start(self):
+        """Open the input stream (once for the life of the process)"""
+        if self.stream:
+            return
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._audio_callback
+        )
+        self.stream.start_stream()
+
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        if self.capturing:
+            self.buffer.write(in_data)
+        return (in_data, pyaudio.paContinue)
+
+    def listen(self, phase=COMMAND_PHASE, timeout=10):
+        """
+        Recognize one utterance
+
+        Args:
+            phase: WAKE_PHASE or COMMAND_PHASE
+            timeout: Seconds to wait for a result (None waits forever)
+
+        Returns:
+            str: Recognized text, or "" on timeout
+        """
+        self.start()
+        with self._decode_lock:
+            return self._listen(phase, timeout)
+
+    def _listen(self, phase, timeout):
+        rec = self.get_recognizer(phase)
+        rec.Reset()
+        if self.vad:
+            self.vad.reset()
+
+        # Only audio captured from now on belongs to this utterance
+        self.buffer.clear()
+        self.capturing = True
+        deadline = time.time() + timeout if timeout is not None else None
+
+        try:
+            while deadline is None or time.time() < deadline:
+                data = self.buffer.read(timeout=0.5)
+                if data is None:
+                    continue
+
+                for is_final, result in self._recognize(rec, data):
+                    text = strip_unknown(result.get('text', '')) if is_final else ""
+                    if text:
+                        return text
+            return ""
+        finally:
+            self.capturing = False
+
+    def recognize_pcm(self, data, phase=COMMAND_PHASE):
+        """
+        Decode an already captured utterance (16-bit mono PCM at self.rate)
+
+        Used when the same audio also goes to an online recognizer; safe to
+        call from a worker thread (decoding is serialized with listen()).
+        """
+        with self._decode_lock:
+            rec = self.get_recognizer(phase)
+            rec.Reset()
+            texts = []
+            step = self.chunk * 2
+            for offset in range(0, len(data), step):
+                if rec.AcceptWaveform(bytes(data[offset:offset + step])):
+                    texts.append(json.loads(rec.Result()).get('text', ''))
+            texts.append(json.loads(rec.FinalResult()).get('text', ''))
+        return strip_unknown(" ".join(texts))
+
+    def _recognize(self, rec, data):
+        # Yields (is_final, result); with the VAD only speech segments are decoded
+        if self.vad:
+            yield from recognize_speech(self.vad, rec, data)
+        elif rec.AcceptWaveform(bytes(data)):
+            yield True, json.loads(rec.Result())
+
+    def close(self):
+        """Stop the stream and release PyAudio"""
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        self.audio.terminate()
+        self.buffer.print_stats("Vosk service buffer")
+        if self.vad:
+            self.vad.print_stats("Vosk service voice gate")
+
+def decode_wav(recognizer, wav_path, chunk=CHUNK):
+    """
+    Run a 16 kHz mono 16-bit WAV file through a recognizer
+
+    Returns:
+        tuple: (recognized text, decode seconds, audio seconds)
+    """
+    recognizer.Reset()
+    texts = []
+    decode_seconds = 0.0
+
+    with wave.open(wav_path, 'rb') as wf:
+        audio_seconds = wf.getnframes() / wf.getframerate()
+        while True:
+            data = wf.readframes(chunk)
+            if not data:
+                break
+            start = time.perf_counter()
+            if recognizer.AcceptWaveform(data):
+                texts.append(json.loads(recognizer.Result()).get('text', ''))
+            decode_seconds += time.perf_counter() - start
+
+    start = time.perf_counter()
+    texts.append(json.loads(recognizer.FinalResult()).get('text', ''))
+    decode_seconds += time.perf_counter() - start
+
+    text = strip_unknown(" ".join(texts))
+    return text, decode_seconds, audio_seconds
+
+def benchmark_wake_recognizers(wav_paths, wake_phrases, model_path="vosk-model", detect=None):
+    """
+    Compare the grammar wake recognizer with the full language model on WAV fixtures
+
+    Args:
+        wav_paths: Recorded 16 kHz mono WAV files
+        wake_phrases: Phrases used to build the wake grammar
+        model_path: Path to the Vosk model directory
+        detect: Function text -> bool deciding whether the wake word was heard
+                (defaults to "any wake phrase appears in the text")
+
+    Returns:
+        dict: Per-recognizer decode cost (real-time factor) and detections
+    """
+    if detect is None:
+        phrases = [phrase.lower() for phrase in wake_phrases]
+        detect = lambda text: any(phrase in text.lower() for phrase in phrases)
+
+    model = vosk.Model(model_path)
+    full_recognizer = vosk.KaldiRecognizer(model, RATE)
+    recognizers = {
+        "full LM": full_recognizer,
+        "wake grammar": create_wake_recognizer(model, wake_phrases)
+    }
+
+    print("🎙️ Wake recognizer benchmark")
+    print("=" * 70)
+
+    results = {}
+    for name, recognizer in recognizers.items():
+        total_decode = 0.0
+        total_audio = 0.0
+        detections = 0
+        for wav_path in wav_paths:
+            text, decode_seconds, audio_seconds = decode_wav(recognizer, wav_path)
+            total_decode += decode_seconds
+            total_audio += audio_seconds
+            detected = detect(text)
+            detections += int(detected)
+            print(f"  [{name:12}] {wav_path}: '{text}' {'✅' if detected else '—'} "
+                  f"({decode_seconds * 1000:.0f} ms for {audio_seconds:.1f}s)")
+
+        rtf = total_decode / total_audio if total_audio else 0.0
+        results[name] = {
+            "decode_seconds": total_decode,
+            "audio_seconds": total_audio,
+            "real_time_factor": rtf,
+            "detections": detections,
+            "files": len(wav_paths)
+        }
+
+    print("-" * 70)
+    for name, result in results.items():
+        print(f"{name:12}: real-time factor {result['real_time_factor']:.3f} "
+              f"({result['decode_seconds']:.2f}s decode / {result['audio_seconds']:.1f}s audio), "
+              f"wake detected in {result['detections']}/{result['files']} files")
+    return results
+
+if __name__ == "__main__":
+    # Record fixtures with test_microphone_enhanced.py (option 2) and copy them here
+    fixture_dir = input("WAV fixture directory [wake_fixtures]: ").strip() or "wake_fixtures"
+    fixtures = sorted(glob.glob(os.path.join(fixture_dir, "*.wav")))
+    if not fixtures:
+        print(f"❌ No WAV fixtures found in {fixture_dir}/ (16 kHz mono 16-bit)")
+    else:
+        benchmark_wake_recognizers(fixtures, DEFAULT_WAKE_PHRASES)
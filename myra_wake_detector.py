@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+🔍 Myra Wake Word Detector
+One pluggable wake word detector shared by every Myra front-end
+"""
+import time
+from functools import lru_cache
+
+# Distance tables, phonetic rules and the bounded similarity check come from
+# myra_wake_matcher; the detector adds the close-microphone tables
+from myra_wake_matcher import (
+    WAKE_WORDS as DISTANCE_WAKE_WORDS, MYRA_VARIATIONS, HEY_MYRA_VARIATIONS, ALL_WAKE_PATTERNS,
+    GREETING_PHRASES, BENCHMARK_PHRASES, normalize_phonetic, is_wake_word_reference,
+    _compile_literals, _BoundedSimilarity
+)
+
+# === WAKE WORD TABLES ===
+WAKE_WORDS = ["hello myra", "hey myra", "hi myra", "myra", "okay myra"]
+
+# Common misrecognitions of "myra" (close microphone)
+WAKE_MISRECOGNITIONS = {
+    "mirror": "myra", "maria": "myra", "mira": "myra", "maya": "myra"
+}
+
+# === TUNING KNOBS ===
+FUZZY_THRESHOLD = 0.7  # Spelling similarity for one word (close microphone)
+DISTANCE_FUZZY_THRESHOLD = 0.6
+DISTANCE_PHONETIC_THRESHOLD = 0.7
+DISTANCE_PHRASE_THRESHOLD = 0.6
+
+# === STRATEGIES ===
+# Text strategies look at the whole text, word strategies at one word at a
+# time, and pair strategies at two neighbouring words. Each returns
+# (label, score) on a hit and None otherwise.
+
+class ExactStrategy:
+    """Wake phrase appears literally in the text (earliest phrase in the list wins)"""
+    name = "exact"
+    level = "text"
+
+    def __init__(self, phrases, score=1.0):
+        self.phrases = list(phrases)
+        self.score = score
+        self._regex = _compile_literals(self.phrases)
+
+    def match(self, text):
+        if self._regex.search(text):
+            for phrase in self.phrases:
+                if phrase in text:
+                    return phrase, self.score
+        return None
+
+class MisrecognitionStrategy:
+    """Known misrecognition appears in the text, reported as the word it stands for"""
+    name = "misrecognition"
+    level = "text"
+
+    def __init__(self, corrections, score=0.9):
+        """
+        Args:
+            corrections: Dict of misheard phrase -> intended wake phrase
+            score: Score reported for a hit
+        """
+        self.corrections = dict(corrections)
+        self.score = score
+        self._regex = _compile_literals(self.corrections)
+
+    def match(self, text):
+        if self._regex.search(text):
+            for heard, correct in self.corrections.items():
+                if heard in text:
+                    return f"{correct} (heard as '{heard}')", self.score
+        return None
+
+class FuzzyStrategy:
+    """One word (or, with level="text", the whole text) is spelled close enough to the wake word"""
+    name = "fuzzy"
+
+    def __init__(self, target="myra", threshold=FUZZY_THRESHOLD, level="word"):
+        self.target = target
+        self.threshold = threshold
+        self.level = level
+        self._similarity = _BoundedSimilarity(target)
+
+    def match(self, word):
+        similarity = self._similarity.ratio_at_least(word, self.threshold)
+        if similarity is not None:
+            return f"{self.target} (heard as '{word}', {similarity:.1%} match)", similarity
+        return None
+
+class PhoneticStrategy:
+    """One word sounds like the wake word once distant-speech confusions are normalized"""
+    name = "phonetic"
+    level = "word"
+
+    def __init__(self, target="myra", threshold=DISTANCE_PHONETIC_THRESHOLD):
+        self.target = target
+        self.threshold = threshold
+        self._similarity = _BoundedSimilarity(normalize_phonetic(target))
+
+    def match(self, word):
+        similarity = self._similarity.ratio_at_least(normalize_phonetic(word), self.threshold)
+        if similarity is not None:
+            return f"{self.target} (phonetic match '{word}', {similarity:.1%})", similarity
+        return None
+
+class FuzzyPhraseStrategy:
+    """Two neighbouring words are spelled close to a greeting such as 'hey myra'"""
+    name = "fuzzy_phrase"
+    level = "pair"
+
+    def __init__(self, phrases=GREETING_PHRASES, threshold=DISTANCE_PHRASE_THRESHOLD, score=0.8):
+        self.threshold = threshold
+        self.score = score
+        self._phrases = [(phrase, _BoundedSimilarity(phrase)) for phrase in phrases]
+
+    def match(self, pair):
+        for phrase, similarity in self._phrases:
+            if similarity.ratio_at_least(pair, self.threshold) is not None:
+                return f"{phrase} (heard as '{pair}')", self.score
+        return None
+
+class WakeWordDetector:
+    """
+    Runs wake word strategies in order and returns the first hit
+
+    Text strategies run first. Word strategies then run word by word, so the
+    earliest matching word wins, followed by pair strategies. Results are
+    cached per text and per word, since the recognizer reports the same
+    partial result many times in a row. Every detect() call is timed and
+    attributed to the strategy that fired, so detection latency and tuning
+    can be checked in one place.
+    """
+
+    def __init__(self, strategies, cache_size=2048):
+        """
+        Initialize the detector
+
+        Args:
+            strategies: Strategy objects, in priority order
+            cache_size: Entries kept in each LRU cache
+        """
+        self.strategies = list(strategies)
+        self._text_strategies = [s for s in self.strategies if s.level == "text"]
+        self._word_strategies = [s for s in self.strategies if s.level == "word"]
+        self._pair_strategies = [s for s in self.strategies if s.level == "pair"]
+
+        self._detect_text = lru_cache(maxsize=cache_size)(self._detect_text_uncached)
+        self._detect_word = lru_cache(maxsize=cache_size)(self._detect_word_uncached)
+        self._detect_pair = lru_cache(maxsize=cache_size)(self._detect_pair_uncached)
+
+        self.reset_stats()
+
+    def detect(self, text):
+        """
+        Check text for the wake word
+
+        Returns:
+            tuple: (detected, label, score)
+        """
+        start = time.perf_counter()
+        result = self._detect_text(text.lower().strip())
+        self.calls += 1
+        self.total_seconds += time.perf_counter() - start
+
+        detected, label, score, strategy = result
+        if detected:
+            self.hits[strategy] = self.hits.get(strategy, 0) + 1
+        return detected, label, score
+
+    __call__ = detect
+
+    def is_wake_word(self, text):
+        """Return True if the text contains the wake word"""
+        return self.detect(text)[0]
+
+    def _detect_text_uncached(self, text):
+        for strategy in self._text_strategies:
+            result = strategy.match(text)
+            if result:
+                return True, result[0], result[1], strategy.name
+
+        words = text.split()
+        if self._word_strategies:
+            for word in words:
+                result = self._detect_word(word)
+                if result:
+                    return result
+
+        if self._pair_strategies:
+            for i in range(len(words) - 1):
+                result = self._detect_pair(f"{words[i]} {words[i+1]}")
+                if result:
+                    return result
+
+        return False, "", 0.0, None
+
+    def _detect_word_uncached(self, word):
+        for strategy in self._word_strategies:
+            result = strategy.match(word)
+            if result:
+                return True, result[0], result[1], strategy.name
+        return None
+
+    def _detect_pair_uncached(self, pair):
+        for strategy in self._pair_strategies:
+            result = strategy.match(pair)
+            if result:
+                return True, result[0], result[1], strategy.name
+        return None
+
+    def get_phrases(self):
+        """Literal phrases the detector accepts (e.g. for a Vosk wake grammar)"""
+        phrases = []
+        for strategy in self._text_strategies:
+            if isinstance(strategy, ExactStrategy):
+                phrases.extend(strategy.phrases)
+            elif isinstance(strategy, MisrecognitionStrategy):
+                phrases.extend(strategy.corrections)
+        return phrases
+
+    def clear_cache(self):
+        """Drop cached results (e.g. after changing thresholds)"""
+        self._detect_text.cache_clear()
+        self._detect_word.cache_clear()
+        self._detect_pair.cache_clear()
+
+    def reset_stats(self):
+        """Zero the call, latency and per-strategy hit counters"""
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.hits = {}
+
+    def get_stats(self):
+        """Return detection counters, average latency and cache hit rate"""
+        cache = self._detect_text.cache_info()
+        lookups = cache.hits + cache.misses
+        return {
+            "calls": self.calls,
+            "avg_us": self.total_seconds / self.calls * 1e6 if self.calls else 0.0,
+            "hits": dict(self.hits),
+            "cache_hit_rate": cache.hits / lookups if lookups else 0.0
+        }
+
+    def print_stats(self, label="Wake word detector"):
+        """Print detection latency and which strategies fired"""
+        stats = self.get_stats()
+        hits = ", ".join(f"{name} {count}" for name, count in stats["hits"].items()) or "none"
+        print(f"🔍 {label}: {stats['calls']} checks, avg {stats['avg_us']:.1f} µs, "
+              f"cache hit rate {stats['cache_hit_rate']:.0%}, detections: {hits}")
+
+def create_wake_detector(wake_words=WAKE_WORDS, misrecognitions=WAKE_MISRECOGNITIONS,
+                         fuzzy_threshold=None, fuzzy_level="text", target="myra"):
+    """
+    Detector for a close microphone: exact phrases and known misrecognitions
+
+    Fuzzy spelling is off by default, since a close microphone rarely
+    garbles the wake word and every fuzzy hit on ordinary speech wakes Myra.
+    Pass fuzzy_threshold to add it (myra_fast_enhanced compares the whole
+    heard text against the wake word at FUZZY_THRESHOLD).
+    """
+    strategies = [ExactStrategy(wake_words), MisrecognitionStrategy(misrecognitions)]
+    if fuzzy_threshold is not None:
+        strategies.append(FuzzyStrategy(target, fuzzy_threshold, fuzzy_level))
+    return WakeWordDetector(strategies)
+
+def create_distance_detector(wake_words=DISTANCE_WAKE_WORDS, variations=ALL_WAKE_PATTERNS,
+                             target="myra"):
+    """Detector for distant speech: adds phonetic matching and fuzzy greetings"""
+    return WakeWordDetector([
+        ExactStrategy(wake_words),
+        MisrecognitionStrategy({variation: target for variation in variations}),
+        FuzzyStrategy(target, DISTANCE_FUZZY_THRESHOLD),
+        PhoneticStrategy(target, DISTANCE_PHONETIC_THRESHOLD),
+        FuzzyPhraseStrategy(GREETING_PHRASES, DISTANCE_PHRASE_THRESHOLD),
+    ])
+
+class WakeTokenStream:
+    """
+    Incremental wake phrase matcher for a stream of recognizer results
+
+    Only words that are new since the previous call are examined. Partial
+    results are diffed against the previous partial, so the words the
+    recognizer already reported are skipped and only appended (or revised)
+    words are checked. A final result is diffed against the last partial of
+    the same utterance and then committed to a small sliding window, which
+    lets multi-word phrases like "hey myra" span two results. Phrases match
+    whole words, and a phrase is only checked when its last word arrives.
+    """
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases: Wake phrases in priority order (e.g. "myra", "hey myra")
+        """
+        self.phrases = [phrase.lower().split() for phrase in phrases if phrase.strip()]
+        self.max_words = max(len(words) for words in self.phrases)
+
+        # Last word -> [phrase words], so a new word only checks phrases it can complete
+        self._by_last_word = {}
+        for words in self.phrases:
+            self._by_last_word.setdefault(words[-1], []).append(words)
+
+        self.words_scanned = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the window and the current partial (e.g. at the start of a wake session)"""
+        self._committed = []      # Last max_words - 1 words of earlier final results
+        self._partial_text = ""
+        self._partial_raw = []    # Words of the current partial as reported
+        self._partial = []        # Same words, lowercased
+
+    def feed_partial(self, text):
+        """
+        Consume a partial result for the current utterance
+
+        Returns:
+            str: The wake phrase that was completed, or None
+        """
+        previous = self._partial_text
+        if text == previous:
+            return None
+        if previous and text.startswith(previous):
+            # Usual case: the partial only grew. Re-check the last word only if it was extended
+            tail = text[len(previous):]
+            keep = len(self._partial_raw) - (0 if tail[:1].isspace() else 1)
+            new_raw = self._partial_raw[keep:keep + 1] if keep < len(self._partial_raw) else []
+            if new_raw:
+                new_raw = (new_raw[0] + tail).split()
+            else:
+                new_raw = tail.split()
+        else:
+            words = text.split()
+            keep = self._common_prefix(self._partial_raw, words)
+            new_raw = words[keep:]
+
+        self._partial_text = text
+        return self._consume(keep, new_raw)
+
+    def feed_final(self, text):
+        """
+        Consume a final result, then commit its words to the sliding window
+
+        Returns:
+            str: The wake phrase that was completed, or None
+        """
+        words = text.split()
+        keep = self._common_prefix(self._partial_raw, words)
+        match = self._consume(keep, words[keep:])
+
+        context = self.max_words - 1
+        self._committed = (self._committed + self._partial)[-context:] if context else []
+        self._partial_text = ""
+        self._partial_raw = []
+        self._partial = []
+        return match
+
+    @staticmethod
+    def _common_prefix(old, new):
+        keep = 0
+        for a, b in zip(old, new):
+            if a != b:
+                break
+            keep += 1
+        return keep
+
+    def _consume(self, keep, new_raw):
+        # Drop revised words, then check each new word as a possible phrase ending
+        del self._partial_raw[keep:]
+        del self._partial[keep:]
+        match = None
+        for raw in new_raw:
+            word = raw.lower()
+            self._partial_raw.append(raw)
+            self._partial.append(word)
+            self.words_scanned += 1
+            if match is None and word in self._by_last_word:
+                match = self._match_ending_here(self._by_last_word[word])
+        return match
+
+    def _match_ending_here(self, candidates):
+        # Preceding words: current partial first, then the committed window
+        best = None
+        for words in candidates:
+            n = len(words)
+            recent = self._partial[-n:]
+            if len(recent) < n:
+                recent = self._committed[len(recent) - n:] + recent
+            if recent == words:
+                if best is None or self.phrases.index(words) < self.phrases.index(best):
+                    best = words
+        return " ".join(best) if best else None
+
+# Compiled once at import and shared by every front-end
+wake_detector = create_wake_detector()
+
+def check_wake_word(text):
+    """Return True if text contains the wake word (shared default detector)"""
+    return wake_detector.is_wake_word(text)
+
+def benchmark_wake_detector(phrases=BENCHMARK_PHRASES, iterations=200):
+    """Report checks/sec of both presets (cold and warm cache) and the original loops"""
+    print("🔍 Wake word detector benchmark")
+    print("=" * 60)
+
+    distance = create_distance_detector()
+    close = create_wake_detector()
+    mismatches = [p for p in phrases if distance.detect(p) != is_wake_word_reference(p)]
+
+    def rate(fn, before=None):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if before:
+                before()
+            for phrase in phrases:
+                fn(phrase)
+        return iterations * len(phrases) / (time.perf_counter() - start)
+
+    reference_rate = rate(is_wake_word_reference)
+    results = {"reference_per_sec": reference_rate, "mismatches": len(mismatches)}
+    print(f"Original distance loops : {reference_rate:12,.0f} checks/sec")
+
+    for name, detector in (("distance", distance), ("close", close)):
+        cold_rate = rate(detector.detect, before=detector.clear_cache)
+        warm_rate = rate(detector.detect)
+        results[f"{name}_cold_per_sec"] = cold_rate
+        results[f"{name}_warm_per_sec"] = warm_rate
+        print(f"{name.capitalize():8} (cold cache) : {cold_rate:12,.0f} checks/sec "
+              f"({cold_rate / reference_rate:.1f}x)")
+        print(f"{name.capitalize():8} (warm cache) : {warm_rate:12,.0f} checks/sec "
+              f"({warm_rate / reference_rate:.1f}x)")
+
+    print(f"Distance preset mismatches vs original: {len(mismatches)}")
+    for phrase in mismatches:
+        print(f"   ❌ '{phrase}': {distance.detect(phrase)} != {is_wake_word_reference(phrase)}")
+
+    print()
+    close.print_stats("Close-microphone detector")
+    distance.print_stats("Distance detector")
+    return results
+
+def benchmark_token_stream(utterance_words=40, utterances=50):
+    """Compare re-scanning accumulated text with the incremental token stream"""
+    print()
+    print("🔍 Wake token stream benchmark")
+    print("=" * 60)
+
+    filler = "please open the browser and tell me what the weather is like today".split()
+    words = [filler[i % len(filler)] for i in range(utterance_words)]
+    partials = [" ".join(words[:i]) for i in range(1, len(words) + 1)]
+
+    def rescan():
+        accumulated_text = ""
+        for _ in range(utterances):
+            for partial_text in partials:
+                for wake_word in DISTANCE_WAKE_WORDS:
+                    if wake_word in partial_text.lower():
+                        return wake_word
+            accumulated_text += " " + partials[-1]
+            full_text = accumulated_text.lower().strip()
+            for wake_word in DISTANCE_WAKE_WORDS:
+                if wake_word in full_text:
+                    return wake_word
+        return None
+
+    stream = WakeTokenStream(DISTANCE_WAKE_WORDS)
+
+    def incremental():
+        stream.reset()
+        for _ in range(utterances):
+            for partial_text in partials:
+                if stream.feed_partial(partial_text):
+                    return True
+            if stream.feed_final(partials[-1]):
+                return True
+        return None
+
+    results = {}
+    for name, fn in (("Re-scan", rescan), ("Incremental", incremental)):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        updates = utterances * (len(partials) + 1)
+        results[name] = elapsed / updates * 1e6
+        print(f"{name:12}: {results[name]:8.2f} µs per recognizer update "
+              f"({utterance_words}-word utterances)")
+    print(f"Words scanned by the stream: {stream.words_scanned} "
+          f"(partials contained {utterances * sum(len(p.split()) for p in partials)})")
+    return results
+
+if __name__ == "__main__":
+    benchmark_wake_detector()
+    benchmark_token_stream()
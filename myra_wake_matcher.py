@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🔍 Myra Wake Word Matcher
+Distant-speech wake word tables and similarity helpers for myra_wake_detector
+"""
+import re
+import time
+import difflib
+from collections import Counter
+
+WAKE_WORDS = ["myra", "hey myra", "hello myra", "hi myra", "wake up myra"]
+
+# Common misheard variations of "myra" at distance
+MYRA_VARIATIONS = [
+    "myra", "mira", "moira", "maya", "maria", "mya", "mira",
+    "murh", "murph", "mur", "my", "mir", "more", "mar",
+    "europe", "euro", "your", "you", "yura", "yara",
+    "ira", "era", "ara", "ora", "ura", "ira",
+    "mya", "nya", "rya", "lya", "dya",
+    "mara", "mora", "mura", "mira", "mera"
+]
+
+HEY_MYRA_VARIATIONS = [
+    "hey myra", "hey mira", "hey maria", "hey maya", "hey moira",
+    "hey murph", "hey europe", "hey your", "hey you",
+    "a myra", "a mira", "hey my", "hey mir", "hey mar",
+    "hey more", "hey mur", "hey er", "hey are"
+]
+
+ALL_WAKE_PATTERNS = MYRA_VARIATIONS + HEY_MYRA_VARIATIONS
+
+GREETING_PHRASES = ["hey myra", "hello myra", "hi myra"]
+
+# Applied in order, so later rules see the output of earlier ones
+PHONETIC_RULES = [
+    ('ph', 'f'),
+    ('europe', 'myra'),  # Direct mapping for common mishearing
+    ('murph', 'myra'),   # Direct mapping
+    ('mur', 'myr'),
+    ('eur', 'myr'),
+    ('ur', 'yr'),
+]
+
+def normalize_phonetic(word):
+    """Map common distant-speech consonant confusions onto one spelling"""
+    word = word.lower()
+    for old, new in PHONETIC_RULES:
+        word = word.replace(old, new)
+    # Remove ending consonants that get lost at distance
+    if word.endswith(('h', 'p', 'k', 't')):
+        word = word[:-1]
+    return word
+
+def _compile_literals(patterns):
+    # Longest first so the alternation never stops at a shorter prefix
+    unique = sorted(set(patterns), key=len, reverse=True)
+    return re.compile("|".join(re.escape(pattern) for pattern in unique))
+
+class _BoundedSimilarity:
+    """
+    SequenceMatcher ratio against one fixed target, with cheap upper bounds
+
+    ratio() is 2 * matches / (len(a) + len(b)), and matches can never exceed
+    the shorter length or the shared character counts. Candidates whose bound
+    is already below the threshold are rejected without running the matcher.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.target_counts = Counter(target)
+        self._matcher = difflib.SequenceMatcher(None, "", target)
+
+    def ratio_at_least(self, text, threshold):
+        """Return the ratio if it can reach threshold, otherwise None"""
+        total = len(text) + len(self.target)
+        if not total:
+            return None
+        if 2.0 * min(len(text), len(self.target)) / total < threshold:
+            return None
+
+        counts = self.target_counts
+        common = sum(min(n, counts[ch]) for ch, n in Counter(text).items())
+        if 2.0 * common / total < threshold:
+            return None
+
+        self._matcher.set_seq1(text)
+        ratio = self._matcher.ratio()
+        return ratio if ratio >= threshold else None
+
+def is_wake_word_reference(text, wake_words=WAKE_WORDS, variations=ALL_WAKE_PATTERNS):
+    """Original nested-loop matcher, kept for benchmarking and verification"""
+    def calculate_similarity(text1, text2):
+        return difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+
+    text = text.lower().strip()
+
+    for wake_word in wake_words:
+        if wake_word in text:
+            return True, wake_word, 1.0
+
+    for variation in variations:
+        if variation in text:
+            return True, f"myra (heard as '{variation}')", 0.9
+
+    words = text.split()
+    for word in words:
+        similarity = calculate_similarity(word, "myra")
+        if similarity >= 0.6:
+            return True, f"myra (heard as '{word}', {similarity:.1%} match)", similarity
+
+        phonetic_sim = calculate_similarity(normalize_phonetic(word), normalize_phonetic("myra"))
+        if phonetic_sim >= 0.7:
+            return True, f"myra (phonetic match '{word}', {phonetic_sim:.1%})", phonetic_sim
+
+    if len(words) >= 2:
+        for i in range(len(words) - 1):
+            phrase = f"{words[i]} {words[i+1]}"
+            for wake_phrase in GREETING_PHRASES:
+                if calculate_similarity(phrase, wake_phrase) >= 0.6:
+                    return True, f"{wake_phrase} (heard as '{phrase}')", 0.8
+
+    return False, "", 0.0
+
+BENCHMARK_PHRASES = [
+    "what is the weather like today", "open the calculator", "the",
+    "turn up the volume please", "hey europe", "a mirror", "i said hi mayor",
+    "tell me a joke", "send a message to kelvin", "take a screenshot",
+    "what time is it", "murray", "hey", "play some music", "shut down the computer",
+    "hello there", "open notepad", "search for python tutorials", "hi", "my right",
+]
+
+def benchmark_wake_matcher(phrases=BENCHMARK_PHRASES, iterations=200):
+    """Report matches/sec of the distance detector (cold and warm cache) and the original loops"""
+    # Imported here: myra_wake_detector imports its tables from this module
+    from myra_wake_detector import create_distance_detector
+
+    print("🔍 Wake word matcher benchmark")
+    print("=" * 60)
+
+    matcher = create_distance_detector()
+    mismatches = [p for p in phrases if matcher.detect(p) != is_wake_word_reference(p)]
+
+    def rate(fn, before=None):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if before:
+                before()
+            for phrase in phrases:
+                fn(phrase)
+        return iterations * len(phrases) / (time.perf_counter() - start)
+
+    reference_rate = rate(is_wake_word_reference)
+    cold_rate = rate(matcher.detect, before=matcher.clear_cache)
+    warm_rate = rate(matcher.detect)
+
+    print(f"Original loops : {reference_rate:12,.0f} matches/sec")
+    print(f"Compiled (cold): {cold_rate:12,.0f} matches/sec ({cold_rate / reference_rate:.1f}x)")
+    print(f"Compiled (warm): {warm_rate:12,.0f} matches/sec ({warm_rate / reference_rate:.1f}x)")
+    print(f"Result mismatches vs original: {len(mismatches)}")
+    for phrase in mismatches:
+        print(f"   ❌ '{phrase}': {matcher.detect(phrase)} != {is_wake_word_reference(phrase)}")
+
+    return {
+        "reference_per_sec": reference_rate,
+        "cold_per_sec": cold_rate,
+        "warm_per_sec": warm_rate,
+        "mismatches": len(mismatches)
+    }
+
+if __name__ == "__main__":
+    benchmark_wake_matcher()
@@ -16,6 +16,8 @@ from datetime import datetime
 import threading
 import fnmatch
 import random
+from myra_wake_detector import wake_detector
+from myra_model_registry import get_model_resolver
 
 # === Setup ===
 recognizer = sr.Recognizer()
@@ -41,9 +43,6 @@ engine.setProperty('volume', 0.9)
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
-# Wake words that will activate Myra
-WAKE_WORDS = ["hello myra", "hey myra", "hi myra", "myra", "okay myra"]
-
 # Configure recognizer for better sensitivity (lower threshold = more sensitive)
 recognizer.energy_threshold = 100  # Much lower for better sensitivity
 recognizer.dynamic_energy_threshold = True
@@ -54,73 +53,15 @@ recognizer.pause_threshold = 0.5  # Shorter pause before considering speech ende
 # Global flag to control listening state
 listening_active = False
 
-def get_available_models():
-    """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags")
-        if response.status_code == 200:
-            models = response.json()
-            return [model['name'] for model in models.get('models', [])]
-        return []
-    except:
-        return []
-
-def select_model():
-    """Automatically select the best available model"""
-    models = get_available_models()
-    if not models:
-        print("❌ No Ollama models found. Please install one first:")
-        print("  ollama pull llama3.2:1b")
-        return None
-    
-    preferred_models = [
-        'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
-        'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
-    ]
-    
-    for preferred in preferred_models:
-        if preferred in models:
-            print(f"✅ Using model: {preferred}")
-            return preferred
-    
-    selected = models[0]
-    print(f"✅ Using model: {selected}")
-    return selected
-
-MODEL_NAME = select_model()
+# Resolved in the background; the last known model is loaded from disk instantly
+model_resolver = get_model_resolver()
 
 def check_wake_word(command):
     """Check if wake word is detected with fuzzy matching"""
-    command_lower = command.lower()
-    
-    # Direct matches
-    if any(wake_word in command_lower for wake_word in WAKE_WORDS):
-        return True
-        
-    # Handle common misrecognitions
-    misrecognitions = {
-        "mirror": "myra",
-        "maria": "myra", 
-        "mira": "myra",
-        "maya": "myra",
-        "hello maria": "hello myra",
-        "hey maria": "hey myra",
-        "hi maria": "hi myra",
-        "hello mirror": "hello myra",
-        "hey mirror": "hey myra",
-        "hi mirror": "hi myra",
-        "hello mira": "hello myra",
-        "hey mira": "hey myra",
-        "hi mira": "hi myra"
-    }
-    
-    # Check for misrecognitions
-    for misrecognition, correct in misrecognitions.items():
-        if misrecognition in command_lower:
-            print(f"🔧 Corrected '{misrecognition}' to '{correct}'")
-            return True
-            
-    return False
+    detected, label, score = wake_detector.detect(command)
+    if detected and score < 1.0:
+        print(f"🔧 Corrected to {label}")
+    return detected
 
 def speak(text):
     """Text to speech function"""
@@ -501,12 +442,13 @@ def control_system(command):
 
 def ask_ollama(prompt):
     """Get AI response from Ollama"""
-    if not MODEL_NAME:
+    model = model_resolver.get(wait=2.0)
+    if not model:
         return "Sorry, no AI model is available."
     
     try:
         payload = {
-            "model": MODEL_NAME,
+            "model": model,
             "prompt": prompt,
             "stream": True
         }
@@ -613,7 +555,7 @@ def activate_myra():
 
 def main():
     """Main function"""
-    if not MODEL_NAME:
+    if not model_resolver.get(wait=model_resolver.timeout + 1):
         print("❌ No AI models available. Please install one first.")
         return
     
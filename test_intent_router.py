@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+System command routing scenario
+
+Every transcribed command of COMMAND_CORPUS goes through an IntentRouter
+built from the control_system trigger table and must reach the intent it
+is listed with. Run with pytest or directly.
+"""
+
+from myra_intent_router import IntentRouter, SYSTEM_INTENTS, COMMAND_CORPUS
+
+def system_router():
+    """IntentRouter over SYSTEM_INTENTS whose handlers return the intent name"""
+    router = IntentRouter()
+    for name, phrases, priority, exclude in SYSTEM_INTENTS:
+        router.register(name, phrases, lambda command, name=name: name, priority, exclude)
+    return router
+
+def test_corpus_routes_to_its_intents():
+    """Each corpus command reaches its intent (or none)"""
+    router = system_router()
+    for command, expected in COMMAND_CORPUS:
+        assert router.route(command) == expected, command
+
+def test_sleep_now_suspends_the_pc():
+    """'sleep now' asks for the PC to sleep; 'go to sleep' is left to Myra's main loop"""
+    router = system_router()
+    assert router.match("put the computer to sleep now") == "sleep"
+    assert router.match("sleep now") == "sleep"
+    assert router.match("go to sleep") is None
+
+if __name__ == "__main__":
+    test_corpus_routes_to_its_intents()
+    test_sleep_now_suspends_the_pc()
+    print("✅ Intent routing scenario passed")
@@ -2,109 +2,252 @@
 """
 Test Myra handling multiple Kelvin contacts
 Exact scenario: User says "Myra, send a message to Kelvin"
+
+Runs unattended: a small phone book is written to a temporary VCF and the
+user's spoken answers are scripted. Run with pytest or directly.
 """
 
+import os
+import random
+import tempfile
+
 from myra_vcf_contacts import VCFContactManager
-from whatsapp_messenger import send_whatsapp_message
-
-def check_kelvin_contacts():
-    """First, let's see what Kelvin contacts exist"""
-    print("🔍 CHECKING FOR KELVIN CONTACTS")
-    print("=" * 50)
-    
-    manager = VCFContactManager()
-    matches = manager.find_contact("Kelvin")
-    
-    print(f"Found {len(matches)} contacts matching 'Kelvin':")
-    for i, (name, similarity) in enumerate(matches, 1):
-        phone = manager.get_contact_phone(name)
-        print(f"  {i}. {name} - {phone} (similarity: {similarity:.2f})")
-    
-    return matches
-
-def simulate_myra_kelvin_scenario():
-    """
-    Simulate the exact scenario:
-    User: "Myra, send a message to Kelvin" 
-    """
-    print("\n\n🤖 MYRA KELVIN SCENARIO SIMULATION")
-    print("=" * 60)
-    print("👤 User: 'Myra, send a message to Kelvin'")
-    print()
-    
-    def myra_speaks(text):
-        print(f"🤖 Myra: {text}")
-    
-    def myra_listens():
-        response = input("🎤 You respond: ")
-        print(f"🤖 Myra heard: '{response}'")
-        return response
-    
-    print("🔍 Myra is processing your request...")
-    print()
-    
-    # This is exactly what Myra would do
-    result = send_whatsapp_message(
-        contact_name="Kelvin",
-        message_text=None,  # Will ask for message
-        speak_function=myra_speaks,
-        listen_function=myra_listens
-    )
-    
-    print("\n" + "="*60)
-    if result['success']:
-        print("🎉 SUCCESS! Myra completed the workflow!")
-        print(f"📱 Selected contact: {result['contact_name']}")
-        print(f"📞 Phone: {result['phone']}")
-        print(f"💬 Message: '{result['message']}'")
-        print(f"🔗 WhatsApp URL generated: {result['whatsapp_url'][:80]}...")
-        print("\n✅ WhatsApp will open with the message ready to send!")
-    else:
-        print(f"❌ Workflow failed: {result['error']}")
-        print(f"🔧 Failed at step: {result.get('step', 'unknown')}")
-
-def show_expected_flow():
-    """Show what should happen"""
-    print("\n\n📋 EXPECTED WORKFLOW")
-    print("=" * 50)
-    print("1️⃣ User: 'Myra, send a message to Kelvin'")
-    print("2️⃣ Myra: 'Searching for Kelvin in your contacts...'")
-    print("3️⃣ Myra: 'I found X contacts matching Kelvin:'")
-    print("   'Option 1: Kelvin Johnson'")
-    print("   'Option 2: Kelvin Smith'") 
-    print("   'Option 3: Kelvin Doe'")
-    print("   'Which contact would you like? Say the number or full name.'")
-    print("4️⃣ User: 'Number 1' or 'Kelvin Johnson'")
-    print("5️⃣ Myra: 'Found contact: Kelvin Johnson. What message would you like to send?'")
-    print("6️⃣ User: 'Hey Kelvin, how are you?'")
-    print("7️⃣ Myra: 'Sending message to Kelvin Johnson: Hey Kelvin, how are you?'")
-    print("8️⃣ Myra: 'WhatsApp opened! Message ready to send to Kelvin Johnson.'")
-    print("9️⃣ WhatsApp opens with message pre-filled → User clicks SEND")
+from myra_contact_index import ContactIndex, synthetic_names
+
+KELVIN_VCF = """BEGIN:VCARD
+VERSION:2.1
+N:;Miss Ofori;;;
+FN:Miss Ofori
+TEL;CELL;PREF:+233595311335
+TEL;TYPE=WORK,VOICE:0302000001
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:;Kelvin;;;
+FN:Kelvin
+TEL;CELL:+233240000001
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:LAMPTEY;KELVIN;;;
+FN:Kelvin Lamptey
+TEL;CELL:+233240000002
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:Kelvin;Dela;;;
+FN:Dela Kelvin
+TEL;CELL:+233240000003
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:Mensah;Kelvin;;;
+FN:Kelvin Mensah Work
+TEL;WORK:+233240000004
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:Owusu;Kevin;;;
+FN:Kevin Owusu
+TEL;CELL:+233240000005
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:Asante;Grace;;;
+FN:Grace Asante
+TEL;CELL:+233240000006
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:Owusu;Cynthia;;;
+FN:Cynthia Owusu
+TEL;CELL:+233240000007
+END:VCARD
+BEGIN:VCARD
+VERSION:2.1
+N:;Kelvin;;;
+FN:Kelvin
+TEL;HOME:0302000008
+TEL;CELL;PREF:+233240000008
+END:VCARD
+"""
+
+# Phone exports: QUOTED-PRINTABLE names with soft line breaks, folded 3.0 lines, base64 photos
+ENCODED_VCF = """BEGIN:VCARD\r
+VERSION:2.1\r
+N;CHARSET=UTF-8;ENCODING=QUOTED-PRINTABLE:Bo=C3=A4tang;Akosua;;;\r
+FN;CHARSET=UTF-8;ENCODING=QUOTED-PRINTABLE:Akosua Bo=C3=A4=\r
+tang=F0=9F=8C=B8\r
+TEL;CELL;PREF:+233240000010\r
+PHOTO;ENCODING=BASE64;JPEG:/9j/4AAQSkZJRgABAQAAAQABAAD/4gHYSUNDX1BST0ZJTEUAAQEAAAHI\r
+ AAAAAAQwAABtbnRyUkdCIFhZWiAH4AABAAEAAAAAAABhY3NwAAAAAAAAAAAAAAAAAAAAAAAAAAAA\r
+ AAAAAAAAAAAAAAAAAQAA9tYAAQAAAADTLQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\r
+\r
+END:VCARD\r
+BEGIN:VCARD\r
+VERSION:3.0\r
+FN:Yaw Darko\\, Jr.\r
+TEL;TYPE=WORK,VOICE:+233 30-200-0011\r
+TEL;TYPE=CELL:\r
+ +233240000011\r
+END:VCARD\r
+"""
+
+KELVINS = ["Kelvin", "Kelvin Lamptey", "Dela Kelvin", "Kelvin Mensah Work"]
+
+# What speech recognition hands over -> the contact the user meant
+SOUND_ALIKES = [
+    ("calvin", "Kelvin"),
+    ("calvin lamptey", "Kelvin Lamptey"),
+    ("delah calvin", "Dela Kelvin"),
+    ("ofori", "Miss Ofori"),
+    ("a fori", "Miss Ofori"),
+    ("sintia", "Cynthia Owusu"),
+]
+
+# Short names that sound close to others (from a real phone book)
+LOOKALIKE_VCF = "".join(f"BEGIN:VCARD\nVERSION:2.1\nFN:{name}\nTEL;CELL:+23324100{i:04d}\nEND:VCARD\n"
+                        for i, name in enumerate(["Nora", "Nana Ama Nhyira", "Pat", "Pete", "Gifty", "Gvtu",
+                                                  "Akosua", "Okasha", "Pro. Ken", "Power 2", "Sir Peprah"]))
+
+def load_phone_book(vcf_text=KELVIN_VCF):
+    """VCFContactManager over a temporary copy of vcf_text (no contact cache)"""
+    handle, path = tempfile.mkstemp(suffix=".vcf")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            f.write(vcf_text)
+        return VCFContactManager(path, cache_file=None)
+    finally:
+        os.remove(path)
+
+def scripted(answers):
+    """speak/listen functions for a scripted dialogue; returns (speak, listen, what Myra said)"""
+    said = []
+    replies = iter(answers)
+    return said.append, lambda: next(replies, None), said
+
+def test_kelvin_contacts_found():
+    """'Kelvin' finds every Kelvin, the exact one first"""
+    manager = load_phone_book()
+    names = [name for name, _ in manager.find_contact("Kelvin")]
+    assert names[0] == "Kelvin"
+    assert set(KELVINS) <= set(names)
+
+def test_myra_asks_which_kelvin():
+    """Several Kelvins -> Myra lists them and takes the number the user says"""
+    manager = load_phone_book()
+    speak, listen, said = scripted(["number 2"])
+    name, phone = manager.search_and_select_contact("Kelvin", speak, listen)
+
+    options = [line for line in said if line.startswith("Option")]
+    assert len(options) >= len(KELVINS)
+    second = manager.find_contacts("Kelvin")[1][0]
+    assert (name, phone) == (second.name, second.phone)
+
+def test_sound_alike_names():
+    """Mis-heard spellings still reach the right contact"""
+    manager = load_phone_book()
+    for heard, expected in SOUND_ALIKES:
+        names = [name for name, _ in manager.find_contact(heard)]
+        assert expected in names, f"'{heard}' should find {expected}, got {names}"
+
+def test_sound_alike_offers_every_kelvin():
+    """'calvin' still offers every Kelvin to choose from"""
+    manager = load_phone_book()
+    names = [name for name, _ in manager.find_contact("calvin")]
+    assert set(KELVINS) <= set(names), names
+
+def test_exact_names_stay_exact():
+    """A name said in full, or a short one, doesn't bring in names that merely sound close"""
+    manager = load_phone_book(LOOKALIKE_VCF)
+    for name in ["Nora", "Gifty", "Akosua"]:
+        assert [found for found, _ in manager.find_contact(name)] == [name]
+    assert "Pete" not in [name for name, _ in manager.find_contact("pat")]
+    assert [name for name, _ in manager.find_contact("pro. k")] == ["Pro. Ken"]
+
+def test_encoded_names_and_photos():
+    """Encoded and folded names come out readable; photos don't get in the way"""
+    manager = load_phone_book(ENCODED_VCF)
+    assert manager.list_all_contacts() == ["Akosua Boätang🌸", "Yaw Darko, Jr."]
+    assert manager.get_contact_phone("Akosua Boätang🌸") == "+233240000010"
+    info = manager.get_contact_info("Yaw Darko, Jr.")
+    assert info["phones"] == [{"number": "+233302000011", "types": ["WORK", "VOICE"]},
+                              {"number": "+233240000011", "types": ["CELL"]}]
+
+def test_cached_phone_book():
+    """After a restart the contact cache answers like the VCF did, until the VCF changes"""
+    with tempfile.TemporaryDirectory() as folder:
+        vcf_path = os.path.join(folder, "Contacts.vcf")
+        cache_file = os.path.join(folder, "contacts.cache")
+        with open(vcf_path, "w", encoding="utf-8") as f:
+            f.write(KELVIN_VCF)
+
+        parsed = VCFContactManager(vcf_path, cache_file=cache_file)
+        cached = VCFContactManager(vcf_path, cache_file=cache_file)
+        assert (parsed.cache.saves, cached.cache.hits) == (1, 1)
+        for heard in ["Kelvin", "Kel", "calvin", "a fori", "sintia"]:
+            assert [(contact.name, contact.phones, score) for contact, score in cached.find_contacts(heard)] == \
+                   [(contact.name, contact.phones, score) for contact, score in parsed.find_contacts(heard)]
+        assert cached.index.complete("kel") == parsed.index.complete("kel")
+        assert cached.get_contact_info("Miss Ofori") == parsed.get_contact_info("Miss Ofori")
+        parsed.close()
+        cached.close()
+
+        with open(vcf_path, "a", encoding="utf-8") as f:
+            f.write("BEGIN:VCARD\nVERSION:2.1\nFN:Kelvin Addo\nTEL;CELL:+233240000012\nEND:VCARD\n")
+        updated = VCFContactManager(vcf_path, cache_file=cache_file)
+        assert updated.cache.misses == 1
+        assert updated.get_contact_phone("Kelvin Addo") == "+233240000012"
+        updated.close()
+
+        # A cache cut short (e.g. by a crash mid-copy) is a miss, not a crash
+        with open(cache_file, "r+b") as f:
+            f.truncate(os.path.getsize(cache_file) // 3)
+        recovered = VCFContactManager(vcf_path, cache_file=cache_file)
+        assert (recovered.cache.misses, recovered.cache.saves) == (1, 1)
+        assert recovered.get_contact_phone("Kelvin Addo") == "+233240000012"
+        expected = recovered.find_contact("calvin")
+        recovered.close()
+
+        # So is one of the right length with damaged bytes
+        size = os.path.getsize(cache_file)
+        rng = random.Random(25)
+        with open(cache_file, "r+b") as f:
+            for offset in rng.sample(range(size // 2, size), 8):
+                f.seek(offset)
+                f.write(bytes([rng.randrange(256)]))
+        assert os.path.getsize(cache_file) == size
+        damaged = VCFContactManager(vcf_path, cache_file=cache_file)
+        assert (damaged.cache.hits, damaged.cache.misses) == (0, 1)
+        assert damaged.get_contact_phone("Kelvin Addo") == "+233240000012"
+        assert damaged.find_contact("calvin") == expected
+        damaged.close()
+
+def test_sound_alike_lookup_uses_the_index():
+    """In a phone book of about 10,000 contacts a sound-alike lookup scores a small share of the names"""
+    # Synthetic names without real Calvins/Oforis, so the expected contact is the best match
+    filler = [name for name in synthetic_names(10000)
+              if not any(word in name.lower() for word in ("calvin", "kelvin", "ofori"))]
+    index = ContactIndex(KELVINS + ["Miss Ofori", "Cynthia Owusu"] + filler)
+    for heard, expected in SOUND_ALIKES:
+        scored, fuzzy = index.candidates_scored, index.fuzzy_scored
+        assert expected in [name for name, _ in index.search(heard)]
+        # A linear scan scores every name; timing is left to python myra_contact_index.py
+        assert index.candidates_scored - scored < len(index) // 5, heard
+        assert index.fuzzy_scored - fuzzy < 100, heard
+    assert index.search(SOUND_ALIKES[0][0])[0] == index.search_linear(SOUND_ALIKES[0][0])[0]
 
 if __name__ == "__main__":
     print("🎯 TESTING KELVIN SCENARIO")
     print("=" * 60)
-    print("This tests exactly what you described:")
-    print("User says: 'Myra, send a message to Kelvin'")
-    print("Multiple Kelvins exist → Myra handles the selection")
-    print()
-    
-    # First check what Kelvin contacts exist
-    kelvin_matches = check_kelvin_contacts()
-    
-    if len(kelvin_matches) == 0:
-        print("\n❌ No Kelvin contacts found in your database.")
-        print("💡 You can add a Kelvin contact to test, or try another name like 'John' or 'Rev'")
-    elif len(kelvin_matches) == 1:
-        print(f"\n✅ Only one Kelvin found: {kelvin_matches[0][0]}")
-        print("💡 Myra would go straight to asking for the message")
-        print("\n🎮 Let's test the workflow:")
-        simulate_myra_kelvin_scenario()
-    else:
-        print(f"\n✅ Perfect! Found {len(kelvin_matches)} Kelvin contacts")
-        print("💡 Myra will ask you to choose which one")
-        print("\n🎮 Let's test the multiple contact selection:")
-        simulate_myra_kelvin_scenario()
-    
-    # Show what the expected flow should be
-    show_expected_flow()
+    failures = 0
+    for check in (test_kelvin_contacts_found, test_myra_asks_which_kelvin,
+                  test_sound_alike_names, test_sound_alike_offers_every_kelvin, test_exact_names_stay_exact,
+                  test_encoded_names_and_photos, test_cached_phone_book, test_sound_alike_lookup_uses_the_index):
+        try:
+            check()
+            print(f"✅ {check.__doc__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {check.__doc__}: {e}")
+    raise SystemExit(1 if failures else 0)
@@ -1,84 +1,66 @@
 #!/usr/bin/env python3
 """
 Force the multiple Kelvin selection scenario
+
+Searching for 'Kel' instead of 'Kelvin' has no exact match, so Myra must
+offer every Kelvin and honour the choice the user speaks. Runs unattended
+with scripted answers; run with pytest or directly.
 """
 
-from whatsapp_messenger import send_whatsapp_message
+from test_kelvin_scenario import KELVINS, load_phone_book, scripted
 
-def test_multiple_kelvin_selection():
-    """
-    Test what happens when we search in a way that forces multiple selection
-    """
-    print("🧪 FORCING MULTIPLE KELVIN SELECTION")
-    print("=" * 60)
-    print("Let's see what happens when we search for 'Kel' instead of exact 'Kelvin'")
-    print("This should trigger the multiple selection dialog")
-    print()
-    
-    def myra_speaks(text):
-        print(f"🤖 Myra: {text}")
-    
-    def myra_listens():
-        response = input("🎤 You say: ")
-        print(f"🤖 Myra heard: '{response}'")
-        return response
-    
-    # Search for "Kel" to get multiple Kelvin matches
-    contact_search = "Kel"
-    
-    print(f"👤 User: 'Myra, send WhatsApp to {contact_search}'")
-    print("🔍 This should show multiple Kelvin options...")
-    print()
-    
-    result = send_whatsapp_message(
-        contact_name=contact_search,
-        message_text=None,
-        speak_function=myra_speaks,
-        listen_function=myra_listens
-    )
-    
-    print("\n" + "="*60)
-    if result['success']:
-        print("🎉 SUCCESS! Multiple selection workflow worked!")
-        print(f"📱 Final selected contact: {result['contact_name']}")
-        print(f"💬 Message: '{result['message']}'")
-        print(f"🔗 WhatsApp URL: {result['whatsapp_url'][:80]}...")
-    else:
-        print(f"❌ Failed: {result['error']}")
+def test_partial_name_offers_every_kelvin():
+    """'Kel' offers every Kelvin"""
+    manager = load_phone_book()
+    names = [name for name, _ in manager.find_contact("Kel")]
+    assert set(KELVINS) <= set(names)
+
+def test_choice_by_full_name():
+    """Saying a full name picks that contact, not a shorter name inside it"""
+    manager = load_phone_book()
+    speak, listen, said = scripted(["kelvin lamptey"])
+    name, phone = manager.search_and_select_contact("Kel", speak, listen)
+    assert name == "Kelvin Lamptey"
+    assert phone == manager.get_contact_phone("Kelvin Lamptey")
+
+def test_unclear_answers_fall_back_to_first_option():
+    """Three unclear answers -> Myra picks the first option and says so"""
+    manager = load_phone_book()
+    speak, listen, said = scripted(["", "mumble", "hmm"])
+    name, _ = manager.search_and_select_contact("Kel", speak, listen)
+    assert name == manager.find_contact("Kel")[0][0]
+    assert said[-1] == f"I'll select the first option: {name}"
+
+def test_contacts_sharing_a_name_are_kept():
+    """Two vCards named Kelvin stay two contacts, each with every number"""
+    manager = load_phone_book()
+    kelvins = manager.contacts.find_by_name("Kelvin")
+    assert len(kelvins) == 2
+    assert kelvins[1].phones == (("0302000008", ("HOME",)), ("+233240000008", ("CELL", "PREF")))
+    assert kelvins[1].phone == "+233240000008"
+    info = manager.get_contact_info("Miss Ofori")
+    assert [phone["types"] for phone in info["phones"]] == [["CELL", "PREF"], ["WORK", "VOICE"]]
 
-def show_all_kelvin_matches():
-    """Show all the Kelvin contacts found"""
-    from myra_vcf_contacts import VCFContactManager
-    
-    print("\n📋 ALL KELVIN-RELATED CONTACTS:")
-    print("=" * 50)
-    
-    manager = VCFContactManager()
-    kelvin_matches = manager.find_contact("Kelvin")
-    
-    print("🔍 Searching for 'Kelvin' (exact):")
-    for i, (name, similarity) in enumerate(kelvin_matches, 1):
-        phone = manager.get_contact_phone(name)
-        print(f"  {i}. {name} - {phone} (similarity: {similarity:.2f})")
-    
-    print(f"\n🔍 Searching for 'Kel' (partial):")
-    kel_matches = manager.find_contact("Kel")
-    for i, (name, similarity) in enumerate(kel_matches, 1):
-        phone = manager.get_contact_phone(name)
-        print(f"  {i}. {name} - {phone} (similarity: {similarity:.2f})")
+def test_shared_name_options_are_told_apart():
+    """Both Kelvins are offered with their number type and last digits, and either can be picked"""
+    manager = load_phone_book()
+    speak, listen, said = scripted(["option 2"])
+    name, phone = manager.search_and_select_contact("Kelvin", speak, listen)
+    assert "Option 1: Kelvin, mobile ending in 0001" in said
+    assert "Option 2: Kelvin, mobile ending in 0008" in said
+    assert (name, phone) == ("Kelvin", "+233240000008")
 
 if __name__ == "__main__":
     print("🎯 MULTIPLE KELVIN SELECTION TEST")
     print("=" * 60)
-    
-    # First show what contacts exist
-    show_all_kelvin_matches()
-    
-    print(f"\n💡 EXPLANATION:")
-    print("When you said 'send to Kelvin', the system found an EXACT match")
-    print("('Kelvin' with 1.00 similarity) so it selected it automatically.")
-    print("To trigger multiple selection, we need a less exact search...")
-    print()
-    
-    # Test the multiple selection
-    test_multiple_kelvin_selection()
+    failures = 0
+    for check in (test_partial_name_offers_every_kelvin, test_choice_by_full_name,
+                  test_unclear_answers_fall_back_to_first_option, test_contacts_sharing_a_name_are_kept,
+                  test_shared_name_options_are_told_apart):
+        try:
+            check()
+            print(f"✅ {check.__doc__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {check.__doc__}: {e}")
+    raise SystemExit(1 if failures else 0)
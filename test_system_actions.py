@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Volume and brightness command scenario
+
+With MYRA_SYSTEM_BACKEND=stub the system actions are recorded instead of
+performed, so the commands can be checked on any machine. The
+control_system check imports myra_hybrid and needs its dependencies
+(speech_recognition, psutil, ...). Run with pytest or directly.
+"""
+
+import os
+
+import pytest
+
+from myra_shell_host import (SystemBackend, StubBackend, BACKENDS, VK_VOLUME_UP,
+                             create_backend)
+
+def test_stub_backend_is_chosen_by_name():
+    """MYRA_SYSTEM_BACKEND=stub gives the recording backend; an unknown name lists the valid ones"""
+    assert isinstance(create_backend("stub"), StubBackend)
+    with pytest.raises(ValueError) as error:
+        create_backend("pulseaudio")
+    for name in BACKENDS:
+        assert name in str(error.value)
+
+def test_backends_implement_every_action():
+    """A backend missing an action cannot be created"""
+    class VolumeOnly(SystemBackend):
+        def _press_key(self, key, count):
+            pass
+
+    with pytest.raises(TypeError):
+        VolumeOnly()
+
+def test_volume_and_brightness_commands():
+    """'volume up' is one batched key action and 'increase brightness' one brightness action"""
+    os.environ["MYRA_SYSTEM_BACKEND"] = "stub"
+    myra_hybrid = pytest.importorskip("myra_hybrid")
+    actions = myra_hybrid.system_actions
+    assert isinstance(actions, StubBackend)
+
+    actions.actions.clear()
+    myra_hybrid.control_system("volume up")
+    assert actions.actions == [("key", VK_VOLUME_UP, myra_hybrid.VOLUME_STEPS)]
+
+    actions.actions.clear()
+    myra_hybrid.control_system("increase brightness")
+    assert actions.actions == [("brightness", 100, 1)]
+
+if __name__ == "__main__":
+    test_stub_backend_is_chosen_by_name()
+    test_backends_implement_every_action()
+    test_volume_and_brightness_commands()
+    print("✅ System action scenario passed")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Wake word false-positive scenario
+
+The close-microphone front-ends (hybrid, offline, GUI, wake word) wake on
+exact phrases and known misrecognitions only; myra_fast_enhanced also
+accepts a whole utterance spelled close to "myra". Ordinary speech that
+merely contains a myra-like word must not wake either. Run with pytest or
+directly.
+"""
+
+from myra_wake_detector import (WAKE_WORDS, WAKE_MISRECOGNITIONS, FUZZY_THRESHOLD,
+                                wake_detector, create_wake_detector)
+
+WAKE_PHRASES = ["myra", "hey myra", "Hello Myra", "okay myra what time is it",
+                "hey maria", "mirror", "hi mira", "maya"]
+
+# Everyday speech with words a per-word fuzzy match at 0.7 would take for "myra"
+ORDINARY_SPEECH = ["the myna bird sings", "mara said hi", "call myrna", "a mya concert",
+                   "i said hi mayor", "open the calculator", "what's the weather",
+                   "turn up the volume", "my right hand", "more rain tomorrow"]
+
+def original_check(command):
+    """The check_wake_word loops the close-microphone front-ends used before the detector"""
+    command_lower = command.lower()
+    if any(wake_word in command_lower for wake_word in WAKE_WORDS):
+        return True
+    return any(misrecognition in command_lower for misrecognition in WAKE_MISRECOGNITIONS)
+
+def test_close_microphone_wakes_like_before():
+    """The shared detector accepts exactly what the original loops accepted"""
+    for text in WAKE_PHRASES + ORDINARY_SPEECH:
+        assert wake_detector.is_wake_word(text) == original_check(text), text
+
+def test_ordinary_speech_does_not_wake():
+    """Neither preset wakes on sentences that only contain a myra-like word"""
+    fast_enhanced = create_wake_detector(fuzzy_threshold=FUZZY_THRESHOLD)
+    for text in ORDINARY_SPEECH:
+        assert not wake_detector.is_wake_word(text), text
+        assert not fast_enhanced.is_wake_word(text), text
+
+def test_fast_enhanced_accepts_a_misspelled_name():
+    """myra_fast_enhanced still wakes when the whole utterance is close to 'myra'"""
+    fast_enhanced = create_wake_detector(fuzzy_threshold=FUZZY_THRESHOLD)
+    assert fast_enhanced.is_wake_word("mayra")
+    assert not wake_detector.is_wake_word("mayra")
+    for text in WAKE_PHRASES:
+        assert fast_enhanced.is_wake_word(text), text
+
+if __name__ == "__main__":
+    test_close_microphone_wakes_like_before()
+    test_ordinary_speech_does_not_wake()
+    test_fast_enhanced_accepts_a_misspelled_name()
+    print("✅ Wake word scenario passed")
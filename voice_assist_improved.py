@@ -13,6 +13,8 @@ from pathlib import Path
 import re
 import shutil
 from datetime import datetime
+from myra_model_registry import get_model_resolver
+from myra_intent_router import IntentRouter, SLEEP_EXCLUDES, contains_phrase
 
 # === Setup ===
 recognizer = sr.Recognizer()
@@ -39,42 +41,8 @@ engine.setProperty('volume', 0.9)  # 90% volume
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
-def get_available_models():
-    """Get list of available Ollama models"""
-    try:
-        response = requests.get("http://localhost:11434/api/tags")
-        if response.status_code == 200:
-            models = response.json()
-            return [model['name'] for model in models.get('models', [])]
-        return []
-    except:
-        return []
-
-def select_model():
-    """Automatically select the best available model"""
-    models = get_available_models()
-    if not models:
-        print("❌ No Ollama models found. Please install one first:")
-        print("  ollama pull llama3.2:1b")
-        return None
-    
-    # Priority order: prefer llama models, then anything else
-    preferred_models = [
-        'llama3.2:3b', 'llama3.2:1b', 'llama3.1:8b', 'llama3.1:7b',
-        'mistral:7b', 'mistral:latest', 'gemma:7b', 'codellama:7b'
-    ]
-    
-    for preferred in preferred_models:
-        if preferred in models:
-            print(f"✅ Using model: {preferred}")
-            return preferred
-    
-    # If no preferred model, use the first available
-    selected = models[0]
-    print(f"✅ Using model: {selected}")
-    return selected
-
-MODEL_NAME = select_model()
+# Resolved in the background; the last known model is loaded from disk instantly
+model_resolver = get_model_resolver()
 
 # === Speak ===
 def speak(text):
@@ -153,259 +121,276 @@ def adjust_brightness(action):
     except Exception as e:
         return "Sorry, I couldn't adjust the brightness. This might require administrator privileges."
 
-def control_system(command):
-    """Handle system control commands"""
-    command_lower = command.lower()
-    
-    # Shutdown commands
-    if any(x in command_lower for x in ["shutdown", "turn off", "power off"]):
-        speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        # Give user a chance to cancel
-        speak("Shutting down now.")
-        try:
-            os.system("shutdown /s /t 5")
-            return "Computer is shutting down."
-        except Exception as e:
-            return "Sorry, I couldn't shut down the computer."
-    
-    # Restart commands
-    elif any(x in command_lower for x in ["restart", "reboot"]):
-        speak("Restarting the computer in 10 seconds. Say cancel to stop.")
-        time.sleep(3)
-        speak("Restarting now.")
-        try:
-            os.system("shutdown /r /t 5")
-            return "Computer is restarting."
-        except Exception as e:
-            return "Sorry, I couldn't restart the computer."
-    
-    # Lock screen commands
-    elif any(x in command_lower for x in ["lock", "lock screen", "lock computer"]):
-        try:
-            os.system("rundll32.exe user32.dll, LockWorkStation")
-            return "Screen locked."
-        except Exception as e:
-            return "Sorry, I couldn't lock the screen."
-    
-    # Sleep/hibernate commands
-    elif any(x in command_lower for x in ["sleep", "hibernate"]):
-        try:
-            os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            return "Computer is going to sleep."
-        except Exception as e:
-            return "Sorry, I couldn't put the computer to sleep."
-    
-    # Brightness controls
-    elif any(x in command_lower for x in ["brightness", "screen brightness"]):
-        return adjust_brightness(command_lower)
+# === System Commands ===
+# Every trigger phrase is compiled into one matcher. Specific intents outrank the
+# generic verbs, so "open calculator" starts the app instead of a web search,
+# "play music ..." reaches YouTube and "cancel the shutdown" aborts it.
+system_router = IntentRouter()
+
+@system_router.intent("shutdown", ["shutdown", "turn off", "power off"])
+def shutdown_computer(command_lower):
+    speak("Shutting down the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    # Give user a chance to cancel
+    speak("Shutting down now.")
+    try:
+        os.system("shutdown /s /t 5")
+        return "Computer is shutting down."
+    except Exception as e:
+        return "Sorry, I couldn't shut down the computer."
+
+@system_router.intent("restart", ["restart", "reboot"])
+def restart_computer(command_lower):
+    speak("Restarting the computer in 10 seconds. Say cancel to stop.")
+    time.sleep(3)
+    speak("Restarting now.")
+    try:
+        os.system("shutdown /r /t 5")
+        return "Computer is restarting."
+    except Exception as e:
+        return "Sorry, I couldn't restart the computer."
+
+@system_router.intent("lock", ["lock", "lock screen", "lock computer"])
+def lock_computer(command_lower):
+    try:
+        os.system("rundll32.exe user32.dll, LockWorkStation")
+        return "Screen locked."
+    except Exception as e:
+        return "Sorry, I couldn't lock the screen."
+
+@system_router.intent("sleep", ["sleep", "hibernate"], exclude=SLEEP_EXCLUDES)
+def sleep_computer(command_lower):
+    try:
+        os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
+        return "Computer is going to sleep."
+    except Exception as e:
+        return "Sorry, I couldn't put the computer to sleep."
+
+@system_router.intent("brightness", ["brightness", "screen brightness"], priority=1)
+def brightness_command(command_lower):
+    return adjust_brightness(command_lower)
+
+# Volume controls (enhanced with dynamic word recognition)
+@system_router.intent("volume", ["volume", "sound", "audio"], priority=1)
+def volume_command(command_lower):
+    # Volume increase words
+    volume_up_words = ["up", "increase", "higher", "raise", "boost", "more", "louder", "turn up"]
+    # Volume decrease words  
+    volume_down_words = ["down", "decrease", "lower", "reduce", "less", "quieter", "turn down", "softer"]
+    # Mute words
+    mute_words = ["mute", "silence", "quiet", "off", "shut up"]
     
-    # Volume controls (enhanced with dynamic word recognition)
-    elif "volume" in command_lower or "sound" in command_lower or "audio" in command_lower:
-        # Volume increase words
-        volume_up_words = ["up", "increase", "higher", "raise", "boost", "more", "louder", "turn up"]
-        # Volume decrease words  
-        volume_down_words = ["down", "decrease", "lower", "reduce", "less", "quieter", "turn down", "softer"]
-        # Mute words
-        mute_words = ["mute", "silence", "quiet", "off", "shut up"]
-        
-        try:
-            if any(word in command_lower for word in mute_words):
+    try:
+        if contains_phrase(command_lower, mute_words):
+            subprocess.run(["powershell", "-Command", 
+                          "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_MUTE}')"], 
+                          check=True)
+            return "Audio muted."
+        elif contains_phrase(command_lower, volume_up_words):
+            for _ in range(5):  # Increase volume 5 times
                 subprocess.run(["powershell", "-Command", 
-                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_MUTE}')"], 
+                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_UP}')"], 
                               check=True)
-                return "Audio muted."
-            elif any(word in command_lower for word in volume_up_words):
-                for _ in range(5):  # Increase volume 5 times
-                    subprocess.run(["powershell", "-Command", 
-                                  "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_UP}')"], 
-                                  check=True)
-                return "Volume increased."
-            elif any(word in command_lower for word in volume_down_words):
-                for _ in range(5):  # Decrease volume 5 times
-                    subprocess.run(["powershell", "-Command", 
-                                  "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_DOWN}')"], 
-                                  check=True)
-                return "Volume decreased."
-            else:
-                return "Would you like me to turn the volume up, down, or mute it?"
-        except:
-            return "Sorry, I couldn't adjust the volume."
-    
-    # Open applications dynamically
-    elif "open" in command_lower or "launch" in command_lower or "run" in command_lower:
-        app_name = command_lower.replace("open ", "").replace("launch ", "").replace("run ", "")
-        try:
-            if app_name:
-                path = shutil.which(app_name)
-                if path:
-                    os.startfile(path)
-                    return f"{app_name.title()} opened."
-                else:
-                    webbrowser.open(f"https://www.google.com/search?q={app_name}")
-                    return f"I couldn't find {app_name.title()}. Opened search in your browser."
-            else:
-                return "Please specify an application or service to open."
-        except Exception as e:
-            return f"Sorry, I couldn't open {app_name.title()}. {str(e)}"
-    
-    # Closing applications
-    elif "close" in command_lower or "shut down" in command_lower:
-        app_name = command_lower.replace("close ", "").replace("shut down ", "")
-        try:
-            if app_name:
-                for proc in psutil.process_iter(['name']):
-                    if re.search(app_name, proc.info['name'], re.IGNORECASE):
-                        proc.kill()
-                        return f"Closed {proc.info['name']}."
-                return f"No open {app_name.title()} application found to close."
-            else:
-                return "Please specify an application to close."
-        except Exception as e:
-            return f"Sorry, I couldn't close {app_name.title()}. {str(e)}"
+            return "Volume increased."
+        elif contains_phrase(command_lower, volume_down_words):
+            for _ in range(5):  # Decrease volume 5 times
+                subprocess.run(["powershell", "-Command", 
+                              "Add-Type -AssemblyName System.Windows.Forms; [System.Windows.Forms.SendKeys]::SendWait('{VOLUME_DOWN}')"], 
+                              check=True)
+            return "Volume decreased."
+        else:
+            return "Would you like me to turn the volume up, down, or mute it?"
+    except:
+        return "Sorry, I couldn't adjust the volume."
 
-    # Playing music and videos
-    elif "play" in command_lower:
-        media_path = command_lower.replace("play ", "")
-        try:
-            media_files = list(Path('.').rglob(f"**/{media_path}*.mp3")) + list(Path('.').rglob(f"**/{media_path}*.mp4"))
-            if media_files:
-                os.startfile(media_files[0])
-                return f"Playing {media_files[0].name}."
-            else:
-                return f"No media file found for {media_path}."
-        except Exception as e:
-            return f"Sorry, I couldn't play {media_path}. {str(e)}"
-
-    # Advanced App Management
-    elif any(x in command_lower for x in ["calculator", "notepad", "word", "excel", "powerpoint", "chrome", "firefox", "edge"]):
-        app_mapping = {
-            "calculator": "calc", "notepad": "notepad", "word": "winword", 
-            "excel": "excel", "powerpoint": "powerpnt", 
-            "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
-        }
-        for app_word, app_cmd in app_mapping.items():
-            if app_word in command_lower:
-                try:
-                    if "close" in command_lower:
-                        os.system(f"taskkill /f /im {app_cmd}.exe")
-                        return f"{app_word.title()} closed."
-                    else:
-                        os.system(app_cmd)
-                        return f"{app_word.title()} opened."
-                except:
-                    return f"Sorry, I couldn't handle {app_word.title()}."
-    
-    # Playing music from YouTube or local files
-    elif "play music" in command_lower or "play song" in command_lower:
-        song = command_lower.replace("play music ", "").replace("play song ", "").replace("play ", "")
-        try:
-            if song:
-                # Search YouTube for the song
-                search_url = f"https://www.youtube.com/results?search_query={song.replace(' ', '+')}"
-                webbrowser.open(search_url)
-                return f"Opening YouTube to play {song}."
+# Open applications dynamically
+@system_router.intent("open", ["open", "launch", "run"])
+def open_application(command_lower):
+    app_name = command_lower.replace("open ", "").replace("launch ", "").replace("run ", "")
+    try:
+        if app_name:
+            path = shutil.which(app_name)
+            if path:
+                os.startfile(path)
+                return f"{app_name.title()} opened."
             else:
-                # Open default music app
-                os.system("start mswindowsstore://pdp/?ProductId=9WZDNCRFJ3PT")  # Windows Media Player
-                return "Opening music player."
-        except:
-            return "Sorry, I couldn't play music."
-    
-    # Web browsing
-    elif "search" in command_lower or "google" in command_lower:
-        query = command_lower.replace("search ", "").replace("google ", "")
-        if query:
-            webbrowser.open(f"https://www.google.com/search?q={query.replace(' ', '+')}")
-            return f"Searching for {query} in your browser."
+                webbrowser.open(f"https://www.google.com/search?q={app_name}")
+                return f"I couldn't find {app_name.title()}. Opened search in your browser."
         else:
-            webbrowser.open("https://www.google.com")
-            return "Opening Google."
-    
-    # File management
-    elif "create file" in command_lower or "new file" in command_lower:
-        filename = command_lower.replace("create file ", "").replace("new file ", "")
-        try:
-            if filename:
-                with open(filename, 'w') as f:
-                    f.write(f"# File created by Myra on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                return f"Created file {filename}."
-            else:
-                return "Please specify a filename."
-        except:
-            return "Sorry, I couldn't create the file."
-    
-    # Email handling (opens default mail app)
-    elif "email" in command_lower or "mail" in command_lower:
-        if "open" in command_lower:
+            return "Please specify an application or service to open."
+    except Exception as e:
+        return f"Sorry, I couldn't open {app_name.title()}. {str(e)}"
+
+# Closing applications
+@system_router.intent("close", ["close", "shut down"])
+def close_application(command_lower):
+    app_name = command_lower.replace("close ", "").replace("shut down ", "")
+    try:
+        if app_name:
+            for proc in psutil.process_iter(['name']):
+                if re.search(app_name, proc.info['name'], re.IGNORECASE):
+                    proc.kill()
+                    return f"Closed {proc.info['name']}."
+            return f"No open {app_name.title()} application found to close."
+        else:
+            return "Please specify an application to close."
+    except Exception as e:
+        return f"Sorry, I couldn't close {app_name.title()}. {str(e)}"
+
+# Playing music and videos
+@system_router.intent("play", ["play"])
+def play_media(command_lower):
+    media_path = command_lower.replace("play ", "")
+    try:
+        media_files = list(Path('.').rglob(f"**/{media_path}*.mp3")) + list(Path('.').rglob(f"**/{media_path}*.mp4"))
+        if media_files:
+            os.startfile(media_files[0])
+            return f"Playing {media_files[0].name}."
+        else:
+            return f"No media file found for {media_path}."
+    except Exception as e:
+        return f"Sorry, I couldn't play {media_path}. {str(e)}"
+
+# Advanced App Management
+APP_COMMANDS = {
+    "calculator": "calc", "notepad": "notepad", "word": "winword", 
+    "excel": "excel", "powerpoint": "powerpnt", 
+    "chrome": "chrome", "firefox": "firefox", "edge": "msedge"
+}
+
+@system_router.intent("app", list(APP_COMMANDS), priority=1)
+def app_command(command_lower):
+    for app_word, app_cmd in APP_COMMANDS.items():
+        if contains_phrase(command_lower, [app_word]):
             try:
-                os.system("start mailto:")
-                return "Opening email client."
+                if contains_phrase(command_lower, ["close"]):
+                    os.system(f"taskkill /f /im {app_cmd}.exe")
+                    return f"{app_word.title()} closed."
+                else:
+                    os.system(app_cmd)
+                    return f"{app_word.title()} opened."
             except:
-                return "Sorry, I couldn't open the email client."
-    
-    # Screenshot
-    elif "screenshot" in command_lower or "capture screen" in command_lower:
-        try:
-            screenshot = pyautogui.screenshot()
-            filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            screenshot.save(filename)
-            return f"Screenshot saved as {filename}."
-        except:
-            return "Sorry, I couldn't take a screenshot."
-    
-    # System information
-    elif "system info" in command_lower or "pc info" in command_lower:
-        try:
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('C:\\\\')
-            return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
-        except:
-            return "Sorry, I couldn't get system information."
-    
-    # Time and date
-    elif "time" in command_lower or "date" in command_lower:
-        now = datetime.now()
-        if "time" in command_lower:
-            return f"The current time is {now.strftime('%I:%M %p')}."
+                return f"Sorry, I couldn't handle {app_word.title()}."
+
+# Playing music from YouTube or local files
+@system_router.intent("music", ["play music", "play song"], priority=1)
+def play_music(command_lower):
+    song = command_lower.replace("play music ", "").replace("play song ", "").replace("play ", "")
+    try:
+        if song:
+            # Search YouTube for the song
+            search_url = f"https://www.youtube.com/results?search_query={song.replace(' ', '+')}"
+            webbrowser.open(search_url)
+            return f"Opening YouTube to play {song}."
         else:
-            return f"Today is {now.strftime('%A, %B %d, %Y')}."
-    
-    # Weather (opens weather website)
-    elif "weather" in command_lower:
-        try:
-            webbrowser.open("https://weather.com")
-            return "Opening weather information."
-        except:
-            return "Sorry, I couldn't open weather information."
-    
-    # News
-    elif "news" in command_lower:
-        try:
-            webbrowser.open("https://news.google.com")
-            return "Opening latest news."
-        except:
-            return "Sorry, I couldn't open news."
-    
-    # Cancel shutdown/restart
-    elif "cancel" in command_lower:
+            # Open default music app
+            os.system("start mswindowsstore://pdp/?ProductId=9WZDNCRFJ3PT")  # Windows Media Player
+            return "Opening music player."
+    except:
+        return "Sorry, I couldn't play music."
+
+# Web browsing
+@system_router.intent("search", ["search", "google"])
+def web_search(command_lower):
+    query = command_lower.replace("search ", "").replace("google ", "")
+    if query:
+        webbrowser.open(f"https://www.google.com/search?q={query.replace(' ', '+')}")
+        return f"Searching for {query} in your browser."
+    else:
+        webbrowser.open("https://www.google.com")
+        return "Opening Google."
+
+# File management
+@system_router.intent("create_file", ["create file", "new file"], priority=1)
+def create_file(command_lower):
+    filename = command_lower.replace("create file ", "").replace("new file ", "")
+    try:
+        if filename:
+            with open(filename, 'w') as f:
+                f.write(f"# File created by Myra on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            return f"Created file {filename}."
+        else:
+            return "Please specify a filename."
+    except:
+        return "Sorry, I couldn't create the file."
+
+# Email handling (opens default mail app)
+@system_router.intent("email", ["email", "mail"], priority=1)
+def open_email(command_lower):
+    if contains_phrase(command_lower, ["open"]):
         try:
-            os.system("shutdown /a")
-            return "Shutdown cancelled."
+            os.system("start mailto:")
+            return "Opening email client."
         except:
-            return "No shutdown to cancel."
-    
-    return None  # Return None if no system command was found
+            return "Sorry, I couldn't open the email client."
+
+@system_router.intent("screenshot", ["screenshot", "capture screen"])
+def take_screenshot(command_lower):
+    try:
+        screenshot = pyautogui.screenshot()
+        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        screenshot.save(filename)
+        return f"Screenshot saved as {filename}."
+    except:
+        return "Sorry, I couldn't take a screenshot."
+
+@system_router.intent("system_info", ["system info", "pc info"])
+def system_info(command_lower):
+    try:
+        cpu_usage = psutil.cpu_percent(interval=1)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('C:\\\\')
+        return f"CPU usage: {cpu_usage}%, Memory usage: {memory.percent}%, Disk usage: {disk.percent}%."
+    except:
+        return "Sorry, I couldn't get system information."
+
+@system_router.intent("time", ["time", "date"])
+def time_and_date(command_lower):
+    now = datetime.now()
+    if contains_phrase(command_lower, ["time"]):
+        return f"The current time is {now.strftime('%I:%M %p')}."
+    else:
+        return f"Today is {now.strftime('%A, %B %d, %Y')}."
+
+# Weather (opens weather website)
+@system_router.intent("weather", ["weather"])
+def open_weather(command_lower):
+    try:
+        webbrowser.open("https://weather.com")
+        return "Opening weather information."
+    except:
+        return "Sorry, I couldn't open weather information."
+
+@system_router.intent("news", ["news"])
+def open_news(command_lower):
+    try:
+        webbrowser.open("https://news.google.com")
+        return "Opening latest news."
+    except:
+        return "Sorry, I couldn't open news."
+
+# Cancel shutdown/restart
+@system_router.intent("cancel", ["cancel"], priority=2)
+def cancel_shutdown(command_lower):
+    try:
+        os.system("shutdown /a")
+        return "Shutdown cancelled."
+    except:
+        return "No shutdown to cancel."
+
+def control_system(command):
+    """Handle system control commands"""
+    return system_router.route(command.lower())  # None if no system command was found
 
 # === Call Ollama ===
 def ask_ollama(prompt):
-    if not MODEL_NAME:
+    model = model_resolver.get(wait=2.0)
+    if not model:
         return "Sorry, no AI model is available."
     
     try:
         payload = {
-            "model": MODEL_NAME,
+            "model": model,
             "prompt": prompt,
             "stream": True
         }
@@ -445,7 +430,7 @@ def ask_ollama(prompt):
 
 # === Main loop ===
 def main():
-    if not MODEL_NAME:
+    if not model_resolver.get(wait=model_resolver.timeout + 1):
         print("❌ No AI models available. Please install one first.")
         return
     